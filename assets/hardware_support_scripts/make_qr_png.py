@@ -20,59 +20,84 @@ base_dir = os.path.dirname(os.path.abspath(__file__))
 font_path = os.path.join(base_dir, font_filename)
 output_path = os.path.join(base_dir, output_filename)
 
-# ==== QR Setup ====
-qr = qrcode.QRCode(
-    version=1,
-    error_correction=qrcode.constants.ERROR_CORRECT_H,
-    box_size=10,
-    border=0,
-)
-qr.add_data(qr_data)
-qr.make(fit=True)
-qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-
-# Target output size
-image_size = 600
-qr_margin = 20
-qr_target_size = image_size - 2 * qr_margin
-qr_img = qr_img.resize((qr_target_size, qr_target_size), Image.NEAREST)
-
-# Create canvas and paste QR
-canvas = Image.new("RGB", (image_size, image_size), "white")
-canvas.paste(qr_img, (qr_margin, qr_margin))
-
-# ==== Icon Drawing ====
-draw = ImageDraw.Draw(canvas)
-font = ImageFont.truetype(font_path, icon_font_size)
-center = (image_size // 2, image_size // 2)
-
-# # Draw black border (larger square)
-draw.rectangle(
-    (center[0] - icon_length - icon_border, center[1] - icon_length - icon_border,
-     center[0] + icon_length + icon_border, center[1] + icon_length + icon_border),
-    fill="black"
-)
-
-# Draw white inner square (background for icon)
-draw.rectangle(
-    (center[0] - icon_length, center[1] - icon_length,
-     center[0] + icon_length, center[1] + icon_length),
-    fill="white"
-)
-
-# Calculate letter position
-bbox = draw.textbbox((0, 0), letter, font=font)
-text_pos = (
-    center[0] - (bbox[2] + bbox[0]) // 2,
-    center[1] - (bbox[3] + bbox[1]) // 2
-)
-
-# Center letter on top
-draw.text(text_pos, letter, font=font, fill="black")
 
-# ==== Save ====
-canvas.save(output_path)
-print(f"QR code saved to: {output_path}")
+def make_qr_png(qr_data, letter, font_path=font_path, image_size=600, qr_margin=20,
+                icon_font_size=icon_font_size, icon_border=icon_border, icon_length=icon_length):
+    """
+    Renders a tile QR code with a bordered letter icon in the middle.
+
+    Parameters:
+        qr_data (str): QR payload, e.g. "id_001".
+        letter (str): Icon letter drawn over the centre of the code (ERROR_CORRECT_H tolerates it).
+        font_path (str): TrueType font for the letter; Pillow's default font is used if it is missing.
+        image_size (int): Output edge length in pixels, icon sizes are given for 600.
+
+    Returns:
+        PIL.Image.Image: RGB image of the tile print.
+    """
+    # ==== QR Setup ====
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=10,
+        border=0,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+    qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+
+    # Target output size
+    scale = image_size / 600
+    qr_margin = round(qr_margin * scale)
+    qr_target_size = image_size - 2 * qr_margin
+    qr_img = qr_img.resize((qr_target_size, qr_target_size), Image.NEAREST)
+
+    # Create canvas and paste QR
+    canvas = Image.new("RGB", (image_size, image_size), "white")
+    canvas.paste(qr_img, (qr_margin, qr_margin))
+
+    # ==== Icon Drawing ====
+    draw = ImageDraw.Draw(canvas)
+    font_size = max(1, round(icon_font_size * scale))
+    if os.path.exists(font_path):
+        font = ImageFont.truetype(font_path, font_size)
+    else:
+        font = ImageFont.load_default(size=font_size)
+    center = (image_size // 2, image_size // 2)
+    icon_length = round(icon_length * scale)
+    icon_border = max(1, round(icon_border * scale))
+
+    # # Draw black border (larger square)
+    draw.rectangle(
+        (center[0] - icon_length - icon_border, center[1] - icon_length - icon_border,
+         center[0] + icon_length + icon_border, center[1] + icon_length + icon_border),
+        fill="black"
+    )
+
+    # Draw white inner square (background for icon)
+    draw.rectangle(
+        (center[0] - icon_length, center[1] - icon_length,
+         center[0] + icon_length, center[1] + icon_length),
+        fill="white"
+    )
+
+    # Calculate letter position
+    bbox = draw.textbbox((0, 0), letter, font=font)
+    text_pos = (
+        center[0] - (bbox[2] + bbox[0]) // 2,
+        center[1] - (bbox[3] + bbox[1]) // 2
+    )
+
+    # Center letter on top
+    draw.text(text_pos, letter, font=font, fill="black")
+    return canvas
+
+
+if __name__ == "__main__":
+    # ==== Save ====
+    canvas = make_qr_png(qr_data, letter)
+    canvas.save(output_path)
+    print(f"QR code saved to: {output_path}")
 
 
 """
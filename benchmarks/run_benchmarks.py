@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_board import make_board
+from core.board_index import hex_distance
+from core.board_model import BoardModel
+from core.board_scanner import scan_image, xray_board
+
+"""
+Benchmark suite: scan, model and render stages on synthetic boards with known ground truth.
+
+Each scenario renders a board of N tiles (benchmarks.synthetic_board), then times
+scan_image, BoardModel construction, assign_zones, xray_board and an offscreen
+BoardView.render_board + paint, and scores the scan against the ground truth.
+Results are written as JSON (one file per run, named by commit and time) so runs
+from different commits can be compared with --baseline.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 12 96 384 --repeat 5 --baseline benchmarks/results/<earlier>.json
+"""
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# name → make_board keyword arguments (and scan_image's rectify flag)
+VARIANTS = {
+    "clean": {"rotate": False},
+    "rotated_noisy": {"rotate": True, "noise": 8.0},
+    "blurred": {"rotate": True, "blur": 5},
+    "perspective": {"rotate": True, "perspective": 0.15, "rectify": True},
+}
+
+# Enough of main.COLOR_MAP for BoardView (importing main pulls in the whole GUI)
+COLOR_MAP = {"red": "#FF6B6B", "blue": "#4D96FF", "green": "#55D187"}
+
+
+def time_stage(func, repeat, setup=None, warmup=True):
+    """
+    Runs func `repeat` times (after optional setup, untimed) and returns its last result and timings.
+    With warmup, one extra untimed run first absorbs import and first-call costs.
+    """
+    timings = []
+    result = None
+    if warmup:
+        if setup:
+            setup()
+        func()
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, {"min": min(timings), "median": statistics.median(timings), "runs": len(timings)}
+
+
+def score_scan(board, truth):
+    """
+    Compares a scanned board with the synthetic ground truth.
+
+    Returns:
+        dict: recall / false positives of the decoded IDs, rotation accuracy, and precision / recall
+            of the neighbour pairs BoardModel found against the true hex adjacency.
+    """
+    found = {tile.qr_id for tile in board.tiles}
+    hits = found & set(truth)
+    rotation_ok = sum(board.get_tile_by_id(qr_id).attributes.get("rotation") == truth[qr_id]["rotation"]
+                      for qr_id in hits)
+
+    true_pairs = {frozenset((a, b)) for a in hits for b in hits
+                  if a < b and hex_distance(truth[a]["axial"], truth[b]["axial"]) == 1}
+    found_pairs = {frozenset((a, b)) for a, neighbors in board.adjacency_map.items() for b in neighbors
+                   if a in hits and b in hits}
+    matched = len(true_pairs & found_pairs)
+
+    return {
+        "recall": len(hits) / len(truth) if truth else 1.0,
+        "false_positives": len(found - set(truth)),
+        "rotation_accuracy": rotation_ok / len(hits) if hits else 0.0,
+        "adjacency_precision": matched / len(found_pairs) if found_pairs else 1.0,
+        "adjacency_recall": matched / len(true_pairs) if true_pairs else 1.0,
+    }
+
+
+def reset_zones(board):
+    for tile in board.object_tiles.values():
+        tile.assigned_to = None
+    for anchor in board.anchor_tiles.values():
+        anchor.children.clear()
+
+
+def render_stages(board, tile_metadata, repeat):
+    """
+    Times BoardView.render_board (scene item creation) and painting the scene offscreen.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QImage, QPainter
+    from gui.board_view import BoardView
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    view = BoardView(board, tile_metadata, COLOR_MAP)
+    view.resize(1280, 960)
+
+    _, render_timing = time_stage(view.render_board, repeat, setup=view.clear_tiles)
+
+    scene = view.scene()
+    image = QImage(1280, 960, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def paint():
+        painter = QPainter(image)
+        scene.render(painter)
+        painter.end()
+
+    _, paint_timing = time_stage(paint, repeat)
+    view.deleteLater()
+    app.processEvents()
+    return {"render_board": render_timing, "paint": paint_timing}
+
+
+def run_scenario(tile_count, variant, repeat, detection, render=True, seed=0):
+    options = dict(VARIANTS[variant])
+    rectify = options.pop("rectify", False)
+
+    start = time.perf_counter()
+    img, tile_metadata, truth = make_board(tile_count, seed=seed, **options)
+    generate_time = time.perf_counter() - start
+
+    stages = {}
+    (_, tiles, hex_width), stages["scan_image"] = time_stage(
+        lambda: scan_image(img, tile_metadata=tile_metadata, detection=detection, rectify=rectify), repeat,
+        warmup=False)
+    board, stages["board_model"] = time_stage(lambda: BoardModel(tiles, hex_width), repeat)
+    _, stages["assign_zones"] = time_stage(board.assign_zones, repeat, setup=lambda: reset_zones(board))
+    _, stages["xray_board"] = time_stage(lambda: xray_board(img, board.tiles), repeat)
+    if render and board.tiles:
+        stages.update(render_stages(board, tile_metadata, repeat))
+
+    return {
+        "tiles": tile_count,
+        "variant": variant,
+        "image_size": [img.shape[1], img.shape[0]],
+        "generate_seconds": generate_time,
+        "stages": stages,
+        "accuracy": score_scan(board, truth),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline):
+    """Prints the median change of every stage against a baseline run, matched by scenario."""
+    previous = {(s["tiles"], s["variant"]): s for s in baseline["scenarios"]}
+    print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+    for scenario in results["scenarios"]:
+        before = previous.get((scenario["tiles"], scenario["variant"]))
+        if before is None:
+            continue
+        for stage, timing in scenario["stages"].items():
+            old = before["stages"].get(stage)
+            if old and old["median"] > 0:
+                change = (timing["median"] - old["median"]) / old["median"] * 100
+                print(f"  {scenario['tiles']:>5} {scenario['variant']:<14} {stage:<13} {change:+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scan, model and render stages on synthetic boards.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12, 48, 192], help="Tile counts")
+    parser.add_argument("--variants", nargs="+", choices=sorted(VARIANTS), default=sorted(VARIANTS))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (min and median are kept)")
+    parser.add_argument("--detection", default="balanced", help="Detection preset for scan_image")
+    parser.add_argument("--no-render", action="store_true", help="Skip the offscreen Qt render stages")
+    parser.add_argument("-o", "--output", default=None,
+                        help=f"Result file (default: {DEFAULT_OUTPUT_DIR}/<commit>-<time>.json)")
+    parser.add_argument("--baseline", default=None, help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    cv2.setRNGSeed(0)
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+        },
+        "settings": {"repeat": args.repeat, "detection": args.detection},
+        "scenarios": [],
+    }
+
+    for tile_count in args.sizes:
+        for variant in args.variants:
+            scenario = run_scenario(tile_count, variant, args.repeat, args.detection, render=not args.no_render)
+            results["scenarios"].append(scenario)
+            stages = "  ".join(f"{name} {timing['median'] * 1000:.1f}ms" for name, timing in scenario["stages"].items())
+            accuracy = scenario["accuracy"]
+            print(f"{tile_count:>5} {variant:<14} recall {accuracy['recall']:.2f}  "
+                  f"adjacency {accuracy['adjacency_recall']:.2f}  {stages}")
+
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"{results['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import os
+import sys
+import math
+import cv2
+import numpy as np
+
+from core.board_index import hex_range, hex_distance
+from core.geometry import QR_TO_HEX_CENTER, QR_TO_HEX_WIDTH, SQRT3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "assets", "hardware_support_scripts"))
+from make_qr_png import make_qr_png  # noqa: E402
+
+"""
+Synthetic board photos with known ground truth.
+
+Tiles are printed with the same renderer as the physical tiles (make_qr_png), placed on a
+hex lattice using the scanner's QR-to-hex ratios, rotated in 60° steps, and the whole photo can
+be degraded with sensor noise, blur and a perspective tilt.
+"""
+
+# The 600 px print's 100 px icon box hides too much of a version 1 code for OpenCV to decode
+# reliably, so synthetic tiles use a proportionally smaller icon.
+ICON_LENGTH = 60
+ICON_FONT_SIZE = 126
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def spiral_cells(count):
+    """The first `count` axial cells of a hex spiral around (0, 0), so boards stay compact."""
+    cells = []
+    radius = 0
+    while len(cells) < count:
+        cells.extend(sorted((c for c in hex_range((0, 0), radius) if hex_distance(c, (0, 0)) == radius),
+                            key=lambda c: math.atan2(c[1] + c[0] / 2, c[0])))
+        radius += 1
+    return cells[:count]
+
+
+def render_tile(qr_id, letter, qr_px):
+    """Grayscale tile print with the QR occupying qr_px pixels, plus a white quiet zone."""
+    image_size = int(round(qr_px * 600 / 560))  # make_qr_png leaves a 20 px margin per 600 px
+    print_img = make_qr_png(qr_id, letter, image_size=image_size,
+                            icon_length=ICON_LENGTH, icon_font_size=ICON_FONT_SIZE)
+    gray = cv2.cvtColor(np.array(print_img), cv2.COLOR_RGB2GRAY)
+    pad = qr_px // 4
+    return cv2.copyMakeBorder(gray, pad, pad, pad, pad, cv2.BORDER_CONSTANT, value=255)
+
+
+def make_board(tile_count, qr_px=120, rotate=True, noise=0.0, blur=0, perspective=0.0,
+               anchor_every=7, seed=0):
+    """
+    Renders a synthetic board photo.
+
+    Parameters:
+        tile_count (int): Number of hex tiles.
+        qr_px (int): QR side in pixels (before perspective).
+        rotate (bool): Rotate each tile by a random multiple of 60°.
+        noise (float): Standard deviation of Gaussian sensor noise, in grey levels.
+        blur (int): Gaussian blur kernel size (0 disables, even values are rounded up).
+        perspective (float): Top-edge squeeze as a fraction of the width (0 is a top-down shot).
+        anchor_every (int): Every n-th tile is an anchor.
+        seed (int): Random seed for rotations, anchors and noise.
+
+    Returns:
+        tuple[np.ndarray, dict, dict]: BGR image, tile_metadata (as in tile_definitions.json) and
+            ground truth {qr_id: {"axial": (q, r), "rotation": degrees, "tile_type": str}}.
+    """
+    rng = np.random.default_rng(seed)
+    cells = spiral_cells(tile_count)
+    size = qr_px * QR_TO_HEX_WIDTH / SQRT3
+
+    centers = np.array([(size * 1.5 * q, size * SQRT3 * (r + q / 2)) for q, r in cells])
+    margin = qr_px * QR_TO_HEX_WIDTH
+    origin = -centers.min(axis=0) + margin
+    centers += origin
+    width, height = (centers.max(axis=0) + margin).astype(int)
+    canvas = np.full((height, width), 255, np.uint8)
+
+    tile_metadata, truth = {}, {}
+    for i, ((q, r), center) in enumerate(zip(cells, centers)):
+        qr_id = f"id_{i:03d}"
+        tile_type = "anchor" if anchor_every and i % anchor_every == 0 else "object"
+        letter = LETTERS[i % len(LETTERS)]
+        rotation = int(rng.integers(0, 6)) * 60 if rotate else 0
+
+        tile_metadata[qr_id] = {"icon": letter, "tile_type": tile_type}
+        truth[qr_id] = {"axial": (q, r), "rotation": rotation, "tile_type": tile_type}
+
+        # QR centre sits QR_TO_HEX_CENTER sides below the hex centre, in the tile's own frame
+        phi = math.radians(rotation)
+        offset = np.array([-math.sin(phi), math.cos(phi)]) * QR_TO_HEX_CENTER * qr_px
+        qr_center = center + offset
+
+        tile = render_tile(qr_id, letter, qr_px)
+        n = tile.shape[0]
+        matrix = cv2.getRotationMatrix2D((n / 2, n / 2), -rotation, 1.0)
+        matrix[:, 2] += qr_center - n / 2
+        x0, y0 = np.floor(qr_center - n).astype(int).clip(0)
+        x1, y1 = np.minimum(np.ceil(qr_center + n).astype(int), (width, height))
+        matrix[:, 2] -= (x0, y0)
+        patch = cv2.warpAffine(tile, matrix, (x1 - x0, y1 - y0), borderValue=255)
+        region = canvas[y0:y1, x0:x1]
+        np.minimum(region, patch, out=region)
+
+    img = cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+
+    if perspective:
+        src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        dst = src + np.float32([[perspective * width, 0], [-perspective * width, 0], [0, 0], [0, 0]])
+        img = cv2.warpPerspective(img, cv2.getPerspectiveTransform(src, dst), (width, height),
+                                  borderValue=(255, 255, 255))
+    if blur:
+        kernel = blur | 1
+        img = cv2.GaussianBlur(img, (kernel, kernel), 0)
+    if noise:
+        img = np.clip(img + rng.normal(0, noise, img.shape), 0, 255).astype(np.uint8)
+
+    return img, tile_metadata, truth
@@ -0,0 +1,77 @@
+import cv2
+import json
+
+
+def merge_tile_metadata(definitions, attributes):
+    """
+    Combines static tile definitions with user-defined attributes.
+
+    Parameters:
+    - definitions (dict): Tile metadata from the scanner or definition file, keyed by QR ID (e.g., {"id_001": {"icon": "A"}}).
+    - attributes (dict):   User-saved attribute data keyed by QR ID or icon (e.g., {"id_001": {"nickname": "Solar"}, "A": {...}}).
+
+    Returns:
+    - dict: Merged tile data keyed by QR ID, where user attributes override static definitions if any keys conflict.
+    """
+    merged = {}
+
+    for qr_id, attrs in definitions.items():
+        saved_attrs = attributes.get(qr_id, {})
+        merged[qr_id] = {**attrs, **saved_attrs}  # saved overrides scanned
+
+    return merged
+
+def adopt_tile_data(tile_data, scanned_data, added_tiles=()):
+    """
+    Folds the tile data loaded for a rescan into the tile data already in use, so edits made
+    since the last scan are kept and every tile on the board shares the dicts the GUI edits.
+
+    Tiles that stay on the board already point at tile_data entries (apply_delta only copies
+    rotation/og_corners into them). Tiles added by the rescan were created from scanned_data, so
+    they are re-pointed at the matching tile_data entry.
+
+    Parameters:
+    - tile_data (dict): Tile data in use (attribute editor, sidebar, board view); updated in place.
+    - scanned_data (dict): Tile data loaded for the rescan; only entries new to tile_data are taken.
+    - added_tiles (list[Tile]): Tiles the rescan adds to the board (delta added list).
+
+    Returns:
+    - dict: tile_data.
+    """
+    for qr_id, attrs in scanned_data.items():
+        tile_data.setdefault(qr_id, attrs)
+
+    for tile in added_tiles:
+        current = tile_data.get(tile.qr_id)
+        if current is None:
+            continue
+        # Also for tiles already sharing it: a TileView's attributes is a new mapping on every access
+        attributes = tile.attributes
+        for key in ("rotation", "og_corners"):
+            if key in attributes:
+                current[key] = attributes[key]
+        tile.attributes = current
+
+    return tile_data
+
+def load_tile_data(tile_metadata_path, tile_attributes_path):
+    """
+    Loads tile definitions and saved attributes and merges them (see merge_tile_metadata).
+    """
+    with open(tile_metadata_path) as f:
+        tile_metadata = json.load(f)
+
+    with open(tile_attributes_path) as f:
+        tile_attributes = json.load(f)
+
+    return merge_tile_metadata(tile_metadata, tile_attributes)
+
+def load_assets(img_path, tile_metadata_path, tile_attributes_path):
+    # Scanned image of physical board
+    img = cv2.imread(img_path)
+    if img is None:
+        raise FileNotFoundError(f"Image not found or couldn't be read: {img_path}")
+
+    merged_tile_data = load_tile_data(tile_metadata_path, tile_attributes_path)
+
+    return img, merged_tile_data
@@ -0,0 +1,249 @@
+"""
+Headless batch scanner.
+
+Runs load_assets → scan_image → BoardModel over a directory or glob of board
+photos in a process pool and writes one JSON board snapshot per image plus a
+summary with per-image timings. Never imports PyQt6.
+
+Usage:
+    python -m core.batch_scan assets/tile_imgs -o scans/
+    python -m core.batch_scan "sessions/*/IMG_*.jpg" -o scans/ --workers 4
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.asset_loader import load_assets
+from core.board_scanner import scan_image
+from core.qr_detection import DETECTION_PRESETS
+from core.board_model import BoardModel
+from core.board_snapshot import board_to_json, scan_metadata
+from core.scan_cache import ScanCache, DEFAULT_CACHE_DIR
+from core.profiling import PROFILER, span
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff"}
+DEFAULT_TILE_METADATA_PATH = "assets/tile_definitions.json"
+DEFAULT_TILE_ATTRIBUTES_PATH = "assets/tile_attributes.json"
+
+
+def collect_image_paths(sources):
+    """
+    Expands directories and glob patterns into a sorted, de-duplicated list of image paths.
+
+    Parameters:
+        sources (list[str]): Directories, glob patterns or plain file paths.
+
+    Returns:
+        list[str]: Image paths with a supported extension.
+    """
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            candidates = [os.path.join(source, name) for name in os.listdir(source)]
+        else:
+            candidates = glob.glob(source, recursive=True)
+
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                paths.add(os.path.normpath(path))
+
+    return sorted(paths)
+
+
+def scan_file(img_path, tile_metadata_path, tile_attributes_path, detection=None, rectify=False, cache_dir=None,
+              profile_origin=None):
+    """
+    Scans a single photo into a board snapshot. Runs inside a worker process.
+
+    Parameters:
+        cache_dir (str, optional): Scan cache directory shared by all workers (None disables caching).
+        profile_origin (int, optional): The batch's perf_counter_ns() start. When given, the scan is
+            profiled (core.profiling) and its Chrome trace events are returned under "trace".
+
+    Returns:
+        dict: {"image", "ok", "timings", "cache_hit", "tile_count", "board" | "error", "trace"}
+    """
+    timings = {}
+    result = {"image": img_path, "ok": False, "timings": timings}
+    if profile_origin is not None:
+        PROFILER.reset()
+        PROFILER.enable()
+
+    try:
+        start = time.perf_counter()
+        with span("load_assets", image=img_path):
+            img, tile_data = load_assets(img_path, tile_metadata_path, tile_attributes_path)
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache = ScanCache(cache_dir) if cache_dir else None
+        _, tiles, hex_width = scan_image(img, tile_metadata=tile_data, detection=detection, rectify=rectify,
+                                         cache=cache)
+        timings["scan"] = time.perf_counter() - start
+        result["cache_hit"] = bool(cache and cache.hits)
+
+        start = time.perf_counter()
+        board = BoardModel(tiles, hex_width=hex_width)
+        timings["board"] = time.perf_counter() - start
+
+        result["board"] = board_to_json(board, scan=scan_metadata(image_path=img_path, img=img,
+                                                                  detection=detection, rectify=rectify))
+        result["tile_count"] = len(tiles)
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    timings["total"] = sum(timings.values())
+    if profile_origin is not None:
+        result["trace"] = PROFILER.trace_events(origin_ns=profile_origin)
+        PROFILER.disable()
+    return result
+
+
+def snapshot_names(img_paths):
+    """
+    Maps each image path to a unique snapshot file name. Images sharing a base name
+    (e.g. IMG_0001.jpg from two session folders) are prefixed with as many parent folders
+    as it takes to tell them apart (a/x/IMG.jpg → a_x_IMG, b/x/IMG.jpg → b_x_IMG). Names that
+    still clash (the same file listed twice, or IMG.jpg next to IMG.png) get a numeric suffix.
+    """
+    parts = {}
+    for path in img_paths:
+        stem_path = os.path.splitext(os.path.abspath(path))[0]
+        parts[path] = tuple(part for part in os.path.normpath(stem_path).split(os.sep) if part)
+    stem_paths = set(parts.values())
+    depth = dict.fromkeys(stem_paths, 1)
+
+    while True:
+        stems = {stem_path: "_".join(stem_path[-depth[stem_path]:]) for stem_path in stem_paths}
+        stem_counts = Counter(stems.values())
+        clashing = [stem_path for stem_path in stem_paths
+                    if stem_counts[stems[stem_path]] > 1 and depth[stem_path] < len(stem_path)]
+        if not clashing:
+            break
+        for stem_path in clashing:
+            depth[stem_path] += 1
+
+    names, used = {}, set()
+    for path in img_paths:
+        if path in names:
+            continue
+        stem, suffix = stems[parts[path]], 1
+        while stem in used:
+            suffix += 1
+            stem = f"{stems[parts[path]]}_{suffix}"
+        used.add(stem)
+        names[path] = f"{stem}.board.json"
+    return names
+
+
+def run_batch(img_paths, output_dir, tile_metadata_path=DEFAULT_TILE_METADATA_PATH,
+              tile_attributes_path=DEFAULT_TILE_ATTRIBUTES_PATH, max_workers=None, detection=None, rectify=False,
+              cache_dir=DEFAULT_CACHE_DIR, profile_path=None):
+    """
+    Scans every image in a process pool, writing snapshots as results arrive.
+
+    Parameters:
+        img_paths (list[str]): Images to scan.
+        output_dir (str): Directory for the per-image snapshots and summary.json.
+        max_workers (int, optional): Pool size, defaults to os.cpu_count().
+        detection (str, optional): Detection preset passed to scan_image.
+        rectify (bool): Rectify oblique shots before detection (see scan_image).
+        cache_dir (str, optional): Scan cache directory; None disables the cache.
+        profile_path (str, optional): Profile every scan and write one Chrome trace of all workers here.
+
+    Returns:
+        dict: The summary written to summary.json.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    batch_start = time.perf_counter()
+    names = snapshot_names(img_paths)
+    images = []
+    trace = []
+    profile_origin = time.perf_counter_ns() if profile_path else None
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(scan_file, path, tile_metadata_path, tile_attributes_path, detection, rectify,
+                        cache_dir, profile_origin): path
+            for path in img_paths
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            trace.extend(result.pop("trace", ()))
+            entry = {
+                "image": result["image"],
+                "ok": result["ok"],
+                "timings": result["timings"],
+                "cache_hit": result.get("cache_hit", False),
+            }
+
+            if result["ok"]:
+                out_path = os.path.join(output_dir, names[result["image"]])
+                with open(out_path, "w") as f:
+                    json.dump(result["board"], f, indent=2)
+                entry["snapshot"] = out_path
+                entry["tile_count"] = result["tile_count"]
+            else:
+                entry["error"] = result["error"]
+
+            images.append(entry)
+            status = f"{entry.get('tile_count', 0)} tiles" if entry["ok"] else entry["error"]
+            if entry["cache_hit"]:
+                status += ", cached"
+            print(f"[{len(images)}/{len(img_paths)}] {entry['image']}: {status} ({entry['timings']['total']:.2f}s)")
+
+    images.sort(key=lambda e: e["image"])
+    summary = {
+        "image_count": len(images),
+        "failed": sum(1 for e in images if not e["ok"]),
+        "cache_hits": sum(1 for e in images if e["cache_hit"]),
+        "wall_time": time.perf_counter() - batch_start,
+        "images": images,
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    if profile_path:
+        with open(profile_path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scan board photos into JSON board snapshots without the GUI.")
+    parser.add_argument("sources", nargs="+", help="Image files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="scans", help="Output directory (default: scans)")
+    parser.add_argument("--tile-metadata", default=DEFAULT_TILE_METADATA_PATH)
+    parser.add_argument("--tile-attributes", default=DEFAULT_TILE_ATTRIBUTES_PATH)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--detection", choices=sorted(DETECTION_PRESETS), default="balanced",
+                        help="QR detection speed/recall preset (default: balanced)")
+    parser.add_argument("--rectify", action="store_true",
+                        help="Warp oblique photos to a top-down view before detection")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Scan result cache, reused across runs (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode, ignoring the scan cache")
+    parser.add_argument("--profile", metavar="TRACE_JSON", default=None,
+                        help="Write a Chrome trace (chrome://tracing, ui.perfetto.dev) of every pipeline stage")
+    args = parser.parse_args(argv)
+
+    img_paths = collect_image_paths(args.sources)
+    if not img_paths:
+        print("No images found.", file=sys.stderr)
+        return 1
+
+    summary = run_batch(img_paths, args.output, args.tile_metadata, args.tile_attributes, args.workers,
+                        args.detection, args.rectify, None if args.no_cache else args.cache_dir, args.profile)
+    print(f"Scanned {summary['image_count']} images in {summary['wall_time']:.2f}s ({summary['failed']} failed)")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+from core.geometry import axial_round
+
+"""
+Spatial index for a board: id → tile, id → axial cell and axial cell → id, kept in sync under
+add / remove / move so lookups stay O(1) however many tiles are on the board.
+
+Also answers hex-grid queries (range, ring, line) in axial coordinates, walking cells when the
+query area is small and scanning tiles when it covers most of the board.
+"""
+
+# Same as zone_shapes.json "hex" (ZONE_OFFSETS); hex_ring walks the sides in this order
+HEX_DIRECTIONS = [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)]
+
+
+def hex_distance(a, b) -> int:
+    dq, dr = a[0] - b[0], a[1] - b[1]
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+def hex_range(center, radius):
+    """Yields every cell within `radius` steps of center (including center)."""
+    q, r = center
+    for dq in range(-radius, radius + 1):
+        for dr in range(max(-radius, -dq - radius), min(radius, -dq + radius) + 1):
+            yield q + dq, r + dr
+
+
+def hex_ring(center, radius):
+    """Yields the cells exactly `radius` steps from center, walking once around the ring."""
+    if radius == 0:
+        yield tuple(center)
+        return
+    # Start `radius` steps out in direction 4, then walk each of the six sides
+    q, r = center[0] + HEX_DIRECTIONS[4][0] * radius, center[1] + HEX_DIRECTIONS[4][1] * radius
+    for dq, dr in HEX_DIRECTIONS:
+        for _ in range(radius):
+            yield q, r
+            q, r = q + dq, r + dr
+
+
+def hex_line(a, b):
+    """
+    Cells on the straight line from a to b (inclusive), one per step.
+    """
+    n = hex_distance(a, b)
+    if n == 0:
+        return [tuple(a)]
+    # Nudge off exact cell edges so ties round consistently
+    steps = [i / n for i in range(n + 1)]
+    qs = [a[0] + (b[0] - a[0]) * t + 1e-6 for t in steps]
+    rs = [a[1] + (b[1] - a[1]) * t + 1e-6 for t in steps]
+    return [tuple(cell) for cell in axial_round(qs, rs).tolist()]
+
+
+class BoardIndex:
+    """
+    Parameters:
+        offsets (list): Axial offsets of the neighbouring cells (BoardModel passes zone_shapes.json "hex").
+
+    Attributes:
+        tiles (dict): qr_id → Tile.
+        cells (dict): qr_id → axial (q, r).
+        occupants (dict): axial (q, r) → qr_id. If two tiles share a cell, the last one placed wins.
+    """
+
+    def __init__(self, offsets=HEX_DIRECTIONS):
+        self.offsets = [tuple(offset) for offset in offsets]
+        self.tiles = {}
+        self.cells = {}
+        self.occupants = {}
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __contains__(self, qr_id):
+        return qr_id in self.tiles
+
+    def clear(self):
+        self.tiles.clear()
+        self.cells.clear()
+        self.occupants.clear()
+
+    def add(self, tile, cell):
+        self.tiles[tile.qr_id] = tile
+        self.place(tile.qr_id, cell)
+
+    def place(self, qr_id, cell):
+        """Puts an indexed tile in a cell, vacating its previous one."""
+        old_cell = self.cells.get(qr_id)
+        if old_cell is not None and self.occupants.get(old_cell) == qr_id:
+            del self.occupants[old_cell]
+        self.cells[qr_id] = cell
+        self.occupants[cell] = qr_id
+
+    def vacate(self, qr_id):
+        """
+        Frees the tile's cell but keeps the tile indexed, e.g. before it is placed again.
+
+        Returns:
+            tuple | None: The cell it occupied.
+        """
+        cell = self.cells.get(qr_id)
+        if cell is not None and self.occupants.get(cell) == qr_id:
+            del self.occupants[cell]
+        return cell
+
+    def remove(self, qr_id):
+        """
+        Returns:
+            tuple[Tile, tuple] | tuple[None, None]: The removed tile and the cell it occupied.
+        """
+        tile = self.tiles.pop(qr_id, None)
+        cell = self.cells.pop(qr_id, None)
+        if cell is not None and self.occupants.get(cell) == qr_id:
+            del self.occupants[cell]
+        return tile, cell
+
+    def get(self, qr_id):
+        return self.tiles.get(qr_id)
+
+    def cell_of(self, qr_id):
+        return self.cells.get(qr_id)
+
+    def at(self, cell):
+        """Tile ID in the cell, or None."""
+        return self.occupants.get(tuple(cell))
+
+    def neighbors(self, cell):
+        """IDs of tiles in the cells around `cell`, in offsets order."""
+        q, r = cell
+        return [qr_id for qr_id in (self.occupants.get((q + dq, r + dr)) for dq, dr in self.offsets) if qr_id]
+
+    def within(self, cell, radius):
+        """
+        IDs of tiles within `radius` hex steps of cell, nearest first.
+        """
+        if 3 * radius * (radius + 1) + 1 <= len(self.cells):
+            found = [qr_id for qr_id in map(self.occupants.get, hex_range(cell, radius)) if qr_id]
+        else:
+            found = [qr_id for qr_id, c in self.cells.items()
+                     if hex_distance(c, cell) <= radius and self.occupants.get(c) == qr_id]
+        return sorted(found, key=lambda qr_id: hex_distance(self.cells[qr_id], cell))
+
+    def ring(self, cell, radius):
+        """IDs of tiles exactly `radius` hex steps from cell, in ring order."""
+        return [qr_id for qr_id in map(self.occupants.get, hex_ring(cell, radius)) if qr_id]
+
+    def line(self, a, b):
+        """IDs of tiles on the hex line from cell a to cell b, in order."""
+        return [qr_id for qr_id in map(self.occupants.get, hex_line(a, b)) if qr_id]
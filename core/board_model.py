@@ -1,69 +1,76 @@
 import json
 import os
-from core.tile_model import Tile, ObjectTile, AnchorTile
+import numpy as np
+from dataclasses import dataclass, field
+from core.tile_model import Tile, ObjectTile, AnchorTile, assigned_anchor_ids, create_tile
+from core.geometry import centroids_to_axial, fit_similarity, as_corner_array, rotation_angles
+from core.lattice import fit_hex_lattice
+from core.board_index import BoardIndex
+from core.tile_store import TileStore
+from core.profiling import span, profiled
+from core.zone_assignment import ZoneConfig, zone_reach, resolve_zones
+from core.zone_relations import ZoneRelations
 
 zone_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "zone_shapes.json")
 with open(zone_path) as f:
     zone_shapes = json.load(f)
 
 ZONE_OFFSETS = zone_shapes["hex"]
-
-
-def analyze_cross_zone_neighbors(anchor_tiles, object_tiles, adjacency_map):
-    # Build reverse mapping from tile ID → zone (anchor) ID
-    tile_to_zone = {}
-    for anchor_id, anchor_tile in anchor_tiles.items():
-        for child_id in anchor_tile.children:
-            tile_to_zone[child_id] = anchor_id
-
-    cross_zone_relations = []
-
-    for tile_id, neighbors in adjacency_map.items():
-        tile_zone = tile_to_zone.get(tile_id)
-
-        for neighbor_id in neighbors:
-            if neighbor_id not in object_tiles:
-                continue  # skip if neighbor is an anchor or missing
-
-            neighbor_zone = tile_to_zone.get(neighbor_id)
-
-            if tile_zone and neighbor_zone:
-                if tile_zone != neighbor_zone:
-                    cross_zone_relations.append({
-                        "tile_id": tile_id,
-                        "neighbor_id": neighbor_id,
-                        "tile_zone": tile_zone,
-                        "neighbor_zone": neighbor_zone,
-                        "type": "cross-zone"
-                    })
-            elif tile_zone and not neighbor_zone:
-                cross_zone_relations.append({
-                    "tile_id": tile_id,
-                    "neighbor_id": neighbor_id,
-                    "tile_zone": tile_zone,
-                    "neighbor_zone": None,
-                    "type": "unassigned-neighbor"
-                })
-            elif not tile_zone and neighbor_zone:
-                cross_zone_relations.append({
-                    "tile_id": tile_id,
-                    "neighbor_id": neighbor_id,
-                    "tile_zone": None,
-                    "neighbor_zone": neighbor_zone,
-                    "type": "unassigned-neighbor"
-                })
-
-    return cross_zone_relations
-
+ZONE_CONFIG = ZoneConfig.from_shapes(zone_shapes)
+
+# Registering a rescan against the board (BoardModel.register_scan); distances in hex spacings
+REGISTRATION_MIN_TILES = 3     # shared tiles needed to fit the photo-to-board transform
+REGISTRATION_INLIER = 0.5      # shared tiles further off than this moved on the physical board
+REGISTRATION_TOLERANCE = 0.25  # median misfit of the remaining tiles above this → rebuild instead
+REGISTRATION_ROUNDS = 5
+
+
+@dataclass
+class BoardChangeSet:
+    """
+    Result of BoardModel.apply_delta, listing only what changed so views can repaint selectively.
+
+    Attributes:
+        added (list[str]): IDs of tiles added to the board.
+        moved (list[str]): IDs of tiles whose position or rotation was updated.
+        removed (list[str]): IDs of tiles removed from the board.
+        reassigned (list[str]): IDs of object tiles whose anchor changed, and anchors whose children changed.
+        adjacency_changed (list[str]): IDs of tiles whose neighbour list changed.
+        relocated (list[str]): IDs of tiles that landed on an occupied cell and were put in the
+            closest free neighbouring cell instead (also listed as added or moved).
+        rebuilt (bool): A collision could not be resolved locally, so axial cells, adjacency and
+            zones were rebuilt for the whole board; the lists above still name every tile that changed.
+    """
+    added: list[str] = field(default_factory=list)
+    moved: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    reassigned: list[str] = field(default_factory=list)
+    adjacency_changed: list[str] = field(default_factory=list)
+    relocated: list[str] = field(default_factory=list)
+    rebuilt: bool = False
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.moved or self.removed or self.reassigned or self.adjacency_changed)
+
+    def touched(self) -> set[str]:
+        """All tile IDs that appear anywhere in the change set."""
+        return set(self.added) | set(self.moved) | set(self.removed) | set(self.reassigned) | set(self.adjacency_changed)
 
 
 class BoardModel:
-    def __init__(self, tiles: list[Tile], hex_width: float):
-        self.tiles = tiles
-        self.hex_width = hex_width
-        self.object_tiles = {t.qr_id: t for t in tiles if isinstance(t, ObjectTile)}
-        self.anchor_tiles = {t.qr_id: t for t in tiles if isinstance(t, AnchorTile)}
-        self.axial_map = {}
+    def __init__(self, tiles: list[Tile], hex_width: float, fit_lattice: bool = True,
+                 zone_config: ZoneConfig = None):
+        """
+        Parameters:
+            tiles (list[Tile] | TileStore): Scanned tiles, or a columnar TileStore for very large
+                boards (tiles are then views over the store and its axial/zone columns are kept up to date).
+            hex_width (float): Expected centre-to-centre spacing, from the QR size.
+            fit_lattice (bool): Fit one hex lattice to all centroids (core.lattice) instead of
+                rounding each centroid against the image origin with hex_width.
+            zone_config (ZoneConfig, optional): Zone radii and overlap policy; defaults to the
+                "zones" section of zone_shapes.json.
+        """
+        self._init_tiles(tiles, hex_width, fit_lattice, zone_config)
 
         # if __debug__: 
         #     for tile in self.tiles:
@@ -103,6 +110,59 @@ class BoardModel:
 
         self.assign_zones() # assign anchors to children, children to anchors
 
+    def _init_tiles(self, tiles, hex_width, fit_lattice, zone_config):
+        self.store = tiles if isinstance(tiles, TileStore) else None
+        self.tiles = tiles.tiles() if self.store is not None else tiles
+        self.hex_width = hex_width
+        self.fit_lattice = fit_lattice
+        self.lattice = None
+        self.object_tiles = {t.qr_id: t for t in self.tiles if isinstance(t, ObjectTile)}
+        self.anchor_tiles = {t.qr_id: t for t in self.tiles if isinstance(t, AnchorTile)}
+        self.index = BoardIndex(ZONE_OFFSETS)  # id → tile, id → axial, axial → id
+        self.zone_config = zone_config or ZONE_CONFIG
+        self.zone_reach = {}  # object ID → {anchor ID: distance}, see core.zone_assignment
+        self._relations = None  # ZoneRelations, built on first use
+
+    @classmethod
+    def restore(cls, tiles, hex_width, axial, adjacency_map, zone_reach, lattice=None, fit_lattice=True,
+                zone_config=None):
+        """
+        Rebuilds a saved board (core.board_snapshot) as it was, without refitting the lattice,
+        rebuilding adjacency or regrowing zones.
+
+        Parameters:
+            tiles (list[Tile] | TileStore): The saved tiles, in board order.
+            axial (array-like): (N, 2) axial cell of each tile, aligned with tiles.
+            adjacency_map (dict): Tile ID → neighbour IDs.
+            zone_reach (dict): Object ID → {anchor ID: distance}, as kept in BoardModel.zone_reach.
+            lattice (LatticeFit, optional): The saved lattice fit, so later scans land on the same grid.
+            zone_config (ZoneConfig, optional): The zone settings the reach was computed with.
+
+        Returns:
+            BoardModel
+        """
+        board = cls.__new__(cls)
+        board._init_tiles(tiles, hex_width, fit_lattice, zone_config)
+        board.lattice = lattice
+        axial = np.asarray(axial, dtype=np.int64).reshape(-1, 2)
+        for tile, cell in zip(board.tiles, map(tuple, axial.tolist())):
+            board.index.add(tile, cell)
+        if board.store is not None:
+            board.store.axial[board.store.live_rows()] = axial
+        board.adjacency_map = adjacency_map
+        board.zone_reach = zone_reach
+        board._update_memberships(board._zone_candidates())
+        return board
+
+    @property
+    def axial_map(self):
+        """qr_id → axial (q, r); a live view of the index, do not mutate directly."""
+        return self.index.cells
+
+    @property
+    def axial_to_id(self):
+        """axial (q, r) → qr_id; a live view of the index, do not mutate directly."""
+        return self.index.occupants
 
     def hex_round(q, r):
         """
@@ -161,6 +221,16 @@ class BoardModel:
         
         return self.axial_round(q, r)
 
+    def pixel_to_axial(self, centroid):
+        """
+        Axial cell of a pixel position on this board: uses the fitted lattice when there is one,
+        so later scans (apply_delta, diff_tiles) land on the same grid as the full build.
+        """
+        if self.lattice is None:
+            return self.centroid_to_axial(centroid, self.hex_width)
+        return tuple(self.lattice.pixel_to_axial([centroid])[0].tolist())
+
+    @profiled()
     def build_adjacency_map(self):
         """
         Constructs a spatial adjacency map for tiles based on their centroid positions.
@@ -173,61 +243,458 @@ class BoardModel:
         Returns:
             dict: Mapping of tile IDs to lists of adjacent tile IDs.
         """
-        self.axial_map = {}
-        for tile in self.tiles:
-            self.axial_map[tile.qr_id] = self.centroid_to_axial(tile.centroid, self.hex_width)
+        self.index.clear()
+        self.lattice = None
+        if self.tiles:
+            if self.store is not None:
+                rows = self.store.live_rows()
+                centroids = self.store.centroids[rows]
+            else:
+                centroids = [tile.centroid for tile in self.tiles]
+            if self.fit_lattice:
+                with span("fit_hex_lattice", tiles=len(centroids)):
+                    self.lattice = fit_hex_lattice(centroids, spacing_hint=self.hex_width)
+                axial = self.lattice.axial
+            else:
+                axial = centroids_to_axial(centroids, self.hex_width)
+            for tile, coords in zip(self.tiles, map(tuple, axial.tolist())):
+                self.index.add(tile, coords)
+            if self.store is not None:
+                self.store.axial[rows] = axial
 
         # print(ZONE_OFFSETS)
 
         adjacency_map = {}
-        axial_to_id = {coords: qr_id for qr_id, coords in self.axial_map.items()}
 
-        for qr_id, (q, r) in self.axial_map.items():
-            neighbors = []
-            for dq, dr in ZONE_OFFSETS:
-                neighbor_coords = (q + dq, r + dr)
-                neighbor_id = axial_to_id.get(neighbor_coords)
-                if neighbor_id:
-                    neighbors.append(neighbor_id)
-            adjacency_map[qr_id] = neighbors
+        for qr_id in self.axial_map:
+            adjacency_map[qr_id] = self.neighbors_at(self.axial_map[qr_id])
 
 
         return adjacency_map
 
+    def neighbors_at(self, coords):
+        """
+        Returns the IDs of tiles occupying the six hex cells around axial coords (q, r).
+        """
+        return self.index.neighbors(coords)
+
+    def diff_tiles(self, tiles: list[Tile]):
+        """
+        Compares a fresh scan against the board. The new photo is usually taken from a slightly
+        different position, so the scan is first mapped into the board's pixel frame with
+        register_scan; positions and corners in the result are in the board frame.
 
-    def assign_zones(self):
-        # print("should assign zones")
-        anchors = {tile.qr_id: tile for tile in self.tiles if isinstance(tile, AnchorTile)}
-        objects = {tile.qr_id: tile for tile in self.tiles if isinstance(tile, ObjectTile)}
+        Parameters:
+            tiles (list[Tile]): Tiles from a new scan of the same board. They are not modified.
 
-        for anchor_id, anchor_tile in anchors.items():
-            neighbors = self.adjacency_map.get(anchor_id, [])
-            for neighbor_id in neighbors:
-                if neighbor_id in objects:
-                    obj_tile = objects[neighbor_id]
-                    if obj_tile.assigned_to is None:  # Prevent double assignment
-                        obj_tile.assigned_to = anchor_id
-                        anchor_tile.add_child(obj_tile)
-                        # print("anchor", anchor_tile, " child: ", obj_tile)
+        Returns:
+            tuple[list[Tile], list[Tile], list[str], list[Tile]] | None: (added, moved, removed,
+                updated) ready for apply_delta. A tile counts as moved when its axial cell or
+                rotation changed; every other tile on both scans is listed in updated, to refresh
+                its centroid and corners. None if the scan could not be registered against the
+                board: build a new BoardModel from the tiles instead.
+        """
+        registration = self.register_scan(tiles)
+        if registration is None:
+            return None
+        matrix, offset = registration
+
+        scanned = {tile.qr_id: self._to_board_frame(tile, matrix, offset) for tile in tiles}
+        added, moved, updated = [], [], []
+        for qr_id, tile in scanned.items():
+            current = self.get_tile_by_id(qr_id)
+            if current is None:
+                added.append(tile)
+            elif (self.pixel_to_axial(tile.centroid) != self.axial_map.get(qr_id)
+                  or tile.attributes.get("rotation") != current.attributes.get("rotation")):
+                moved.append(tile)
+            else:
+                updated.append(tile)
+        removed = [tile.qr_id for tile in self.tiles if tile.qr_id not in scanned]
+        return added, moved, removed, updated
+
+    def register_scan(self, tiles):
+        """
+        Similarity transform from a rescan's pixel frame into the board's, fitted to the tiles
+        both scans share. Shared tiles that moved on the physical board are dropped as outliers
+        (trimmed to the better-fitting half while more than half disagree, then to those within
+        REGISTRATION_INLIER spacings).
+
+        Parameters:
+            tiles (list[Tile]): Tiles from a new scan of the board.
 
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: (matrix, offset) as from geometry.fit_similarity,
+                or None when fewer than REGISTRATION_MIN_TILES shared tiles, or under half of them,
+                agree on one transform, or their median misfit exceeds REGISTRATION_TOLERANCE.
+        """
+        shared = [tile for tile in tiles if tile.qr_id in self.axial_map]
+        if len(shared) < REGISTRATION_MIN_TILES:
+            return None
+        src = np.array([tile.centroid for tile in shared], dtype=np.float64)
+        dst = np.array([self.get_tile_by_id(tile.qr_id).centroid for tile in shared], dtype=np.float64)
+
+        inliers = np.ones(len(shared), dtype=bool)
+        for _ in range(REGISTRATION_ROUNDS):
+            matrix, offset = fit_similarity(src[inliers], dst[inliers])
+            error = np.linalg.norm(src @ matrix.T + offset - dst, axis=1) / self.spacing
+            keep = error <= max(float(np.median(error)), REGISTRATION_INLIER)
+            if keep.sum() < REGISTRATION_MIN_TILES or (keep == inliers).all():
+                break
+            inliers = keep
+
+        inliers = error <= REGISTRATION_INLIER
+        if (inliers.sum() < max(REGISTRATION_MIN_TILES, len(shared) / 2)
+                or np.median(error[inliers]) > REGISTRATION_TOLERANCE):
+            return None
+        return matrix, offset
+
+    @staticmethod
+    def _to_board_frame(tile, matrix, offset):
+        """A copy of a scanned tile with its centroid, og_corners and rotation mapped by register_scan's transform."""
+        centroid = np.asarray(tile.centroid, dtype=np.float64) @ matrix.T + offset
+        attributes = dict(tile.attributes)
+        if "og_corners" in attributes:
+            corners = as_corner_array(attributes["og_corners"]) @ matrix.T + offset
+            attributes["og_corners"] = corners[0].tolist()
+            attributes["rotation"] = int(rotation_angles(corners)[1][0])
+        return create_tile(tile.qr_id, tuple(centroid.tolist()), attributes)
+
+    @profiled()
+    def apply_delta(self, added=(), moved=(), removed=(), updated=()) -> BoardChangeSet:
+        """
+        Updates the board in place for a small set of changes, touching only the affected
+        hex neighbourhoods instead of rebuilding the axial index, adjacency and zones.
+
+        A tile that lands on an occupied cell is resolved like lattice.resolve_collisions: the
+        better-fitting tile keeps the cell, the other takes the closest free neighbouring cell
+        (changes.relocated). If there is none, the whole board is rebuilt (changes.rebuilt).
+
+        Parameters:
+            added (list[Tile]): New tiles.
+            moved (list[Tile]): Tiles already on the board with a new centroid (and optionally
+                rotation/og_corners). The existing Tile objects are updated so views keep their references.
+            removed (list[str | Tile]): Tiles (or their IDs) to take off the board.
+            updated (list[Tile]): Tiles that keep their cell and rotation but have a new centroid
+                and og_corners (diff_tiles lists every unmoved tile of a rescan here). Not reported
+                in the change set, since nothing on the board changes for them.
+
+        Returns:
+            BoardChangeSet: What changed, for views to repaint selectively.
+        """
+        changes = BoardChangeSet()
+        dirty_cells = set()
+        dirty_zones = set()  # anchors whose zone has to be regrown
+        old_members = {}  # anchor ID → objects in its zone before the change
+
+        # --- Removals ---
+        removed_ids = {t.qr_id if isinstance(t, Tile) else t for t in removed}
+        removed_ids &= set(self.axial_map)
+        for qr_id in removed_ids:
+            tile = self.get_tile_by_id(qr_id)
+            if isinstance(tile, AnchorTile):
+                old_members[qr_id] = set(tile.children)
+                dirty_zones.add(qr_id)
+                changes.reassigned.extend(old_members[qr_id])
+            else:
+                for anchor_id in assigned_anchor_ids(tile):
+                    anchor = self.anchor_tiles.get(anchor_id)
+                    if anchor is not None:
+                        anchor.children.discard(qr_id)
+                        changes.reassigned.append(anchor_id)
+                dirty_zones.update(self.zone_reach.pop(qr_id, ()))
+
+            tile, cell = self.index.remove(qr_id)
+            if self.store is not None:
+                self.store.remove(qr_id)
+            dirty_cells.add(cell)
+            self.adjacency_map.pop(qr_id, None)
+            if isinstance(tile, AnchorTile):
+                del self.anchor_tiles[qr_id]
+            else:
+                self.object_tiles.pop(qr_id, None)
+            changes.removed.append(qr_id)
+        if removed_ids:
+            self.tiles = [t for t in self.tiles if t.qr_id not in removed_ids]
+
+        for new_tile in updated:
+            self._update_position(new_tile)
+
+        # --- Moves: vacate every old cell first, so tiles can trade places without colliding ---
+        moved_tiles = []
+        for new_tile in moved:
+            tile = self._update_position(new_tile)
+            if tile is None:
+                continue
+            dirty_cells.add(self.index.vacate(tile.qr_id))
+            moved_tiles.append(tile)
+            changes.moved.append(tile.qr_id)
+
+        # --- Additions ---
+        added_tiles, added_ids = [], set()
+        for tile in added:
+            if tile.qr_id in self.axial_map or tile.qr_id in added_ids:
+                continue
+            added_ids.add(tile.qr_id)
+            if self.store is not None:
+                tile = self.store.add_tile(tile)
+            self.tiles.append(tile)
+            if isinstance(tile, AnchorTile):
+                self.anchor_tiles[tile.qr_id] = tile
+            else:
+                self.object_tiles[tile.qr_id] = tile
+            added_tiles.append(tile)
+            changes.added.append(tile.qr_id)
+
+        for tile in moved_tiles + added_tiles:
+            if not self._place_tile(tile, changes, dirty_cells):
+                return self._rebuild(changes, removed_ids)
+
+        # --- Adjacency for the dirty cells and their neighbours ---
+        affected = set(changes.added) | set(changes.moved)
+        for q, r in dirty_cells:
+            for dq, dr in [(0, 0)] + ZONE_OFFSETS:
+                qr_id = self.axial_to_id.get((q + dq, r + dr))
+                if qr_id:
+                    affected.add(qr_id)
+
+        for qr_id in affected:
+            neighbors = self.neighbors_at(self.axial_map[qr_id])
+            if self.adjacency_map.get(qr_id) != neighbors:
+                self.adjacency_map[qr_id] = neighbors
+                changes.adjacency_changed.append(qr_id)
+
+        # --- Zones: regrow only the zones whose BFS passed through a tile with new neighbours ---
+        for qr_id in changes.adjacency_changed:
+            if qr_id in self.anchor_tiles:
+                dirty_zones.add(qr_id)
+            else:
+                dirty_zones.update(self.zone_reach.get(qr_id, ()))
+        if dirty_zones:
+            changes.reassigned.extend(self._regrow_zones(dirty_zones, old_members))
+        changes.reassigned = list(dict.fromkeys(r for r in changes.reassigned if r not in removed_ids))
+
+        if self._relations is not None:
+            self._relations.update(self, changes.touched())
+        return changes
+
+    def _update_position(self, new_tile):
+        """Copies centroid, rotation and og_corners from a scanned tile into the board's tile of that ID, if any."""
+        tile = self.get_tile_by_id(new_tile.qr_id)
+        if tile is not None:
+            tile.centroid = new_tile.centroid
+            for key in ("rotation", "og_corners"):
+                if key in new_tile.attributes:
+                    tile.attributes[key] = new_tile.attributes[key]
+        return tile
+
+    def _place_tile(self, tile, changes, dirty_cells):
+        """
+        Puts a tile added or moved by apply_delta in the cell under its centroid. If another tile
+        holds that cell, the one whose centroid fits the cell better keeps it and the other moves
+        to the closest free neighbouring cell within one spacing, as lattice.resolve_collisions
+        does for a full build.
+
+        Returns:
+            bool: False if no free cell was close enough (the board has to be rebuilt).
+        """
+        cell = self.pixel_to_axial(tile.centroid)
+        occupant_id = self.axial_to_id.get(cell)
+        if occupant_id is not None and occupant_id != tile.qr_id:
+            occupant = self.get_tile_by_id(occupant_id)
+            if self._cell_error(tile.centroid, cell) < self._cell_error(occupant.centroid, cell):
+                self._set_cell(tile, cell, dirty_cells)
+                tile = occupant  # the occupant gives way instead
+                if tile.qr_id not in changes.moved and tile.qr_id not in changes.added:
+                    changes.moved.append(tile.qr_id)
+            cell = self._free_neighbor_cell(tile.centroid, cell)
+            if cell is None:
+                return False
+            changes.relocated.append(tile.qr_id)
+        self._set_cell(tile, cell, dirty_cells)
+        return True
+
+    def _set_cell(self, tile, cell, dirty_cells):
+        dirty_cells.add(cell)
+        self.index.add(tile, cell)  # indexes added tiles; for the others only the cell changes
+        self._store_axial(tile.qr_id, cell)
+
+    def axial_to_pixel(self, cell):
+        """Pixel position of an axial cell's centre on this board (inverse of pixel_to_axial)."""
+        if self.lattice is None:
+            size = self.hex_width / (3**0.5)
+            q, r = cell
+            return np.array([1.5 * size * q, 3**0.5 * size * (r + q / 2)])
+        return self.lattice.axial_to_pixel([cell])[0]
+
+    @property
+    def spacing(self):
+        """Centre-to-centre hex spacing in pixels: the fitted lattice's, else hex_width."""
+        return self.lattice.spacing if self.lattice is not None else self.hex_width
+
+    def _cell_error(self, centroid, cell):
+        """Distance from a centroid to a cell's centre, in hex spacings."""
+        return float(np.linalg.norm(self.axial_to_pixel(cell) - np.asarray(centroid, dtype=np.float64))) / self.spacing
+
+    def _free_neighbor_cell(self, centroid, cell):
+        """Closest empty cell around `cell` within one spacing of centroid, or None."""
+        q, r = cell
+        best, best_error = None, 1.0
+        for dq, dr in ZONE_OFFSETS:
+            candidate = (q + dq, r + dr)
+            if candidate in self.axial_to_id:
+                continue
+            error = self._cell_error(centroid, candidate)
+            if error <= best_error:
+                best, best_error = candidate, error
+        return best
+
+    def _rebuild(self, changes, removed_ids):
+        """
+        apply_delta's fallback when a collision cannot be resolved locally: refits the lattice and
+        rebuilds the index, adjacency and zones for the whole board, like the constructor, then
+        completes changes with every tile whose cell, neighbours or zones differ from before.
+        """
+        old_cells = dict(self.axial_map)
+        old_adjacency = self.adjacency_map
+        old_zones = {qr_id: assigned_anchor_ids(tile) for qr_id, tile in self.object_tiles.items()}
+
+        self.adjacency_map = self.build_adjacency_map()
+        self.assign_zones()
+
+        changes.rebuilt = True
+        listed = set(changes.added) | set(changes.moved)
+        changes.moved.extend(qr_id for qr_id, cell in self.axial_map.items()
+                             if qr_id not in listed and old_cells.get(qr_id) != cell)
+        changes.adjacency_changed = [qr_id for qr_id, neighbors in self.adjacency_map.items()
+                                     if old_adjacency.get(qr_id) != neighbors]
+        for qr_id, tile in self.object_tiles.items():
+            zones = assigned_anchor_ids(tile)
+            before = old_zones.get(qr_id, ())
+            if zones != before:
+                changes.reassigned.append(qr_id)
+                changes.reassigned.extend(set(zones) ^ set(before))
+        changes.reassigned = list(dict.fromkeys(r for r in changes.reassigned if r not in removed_ids))
+        return changes
+
+    def _store_axial(self, qr_id, cell):
+        if self.store is not None:
+            self.store.axial[self.store.row_of[qr_id]] = cell
+
+    def _regrow_zones(self, anchor_ids, old_members):
+        """
+        Recomputes the zones of the given anchors after a delta. With overlap "all" zones are
+        independent, so only these anchors grow again; with "nearest" a zone can also give up
+        or take over tiles of its neighbours, so every zone is regrown.
+
+        Parameters:
+            anchor_ids (set[str]): Anchors whose zone may have changed (including removed ones).
+            old_members (dict): Anchor ID → former zone of anchors already removed from the board.
+
+        Returns:
+            list[str]: Object and anchor IDs whose assignment changed.
+        """
+        if not self.zone_config.independent:
+            self.zone_reach = zone_reach(self.adjacency_map, self.anchor_tiles, self.object_tiles, self.zone_config)
+            candidates = self._zone_candidates()
+            for members in old_members.values():
+                candidates.update(members & self.object_tiles.keys())
+            return self._update_memberships(candidates)
+
+        candidates = set()
+        for anchor_id in anchor_ids:
+            anchor = self.anchor_tiles.get(anchor_id)
+            members = old_members.get(anchor_id, ()) if anchor is None else anchor.children
+            for qr_id in members:
+                reach = self.zone_reach.get(qr_id)
+                if reach is not None:
+                    reach.pop(anchor_id, None)
+                candidates.add(qr_id)
+
+        live = [anchor_id for anchor_id in anchor_ids if anchor_id in self.anchor_tiles]
+        for qr_id, reach in zone_reach(self.adjacency_map, live, self.object_tiles, self.zone_config).items():
+            self.zone_reach.setdefault(qr_id, {}).update(reach)
+            candidates.add(qr_id)
+        return self._update_memberships(candidates & self.object_tiles.keys())
+
+    def _update_memberships(self, object_ids):
+        """
+        Writes each object's zones from zone_reach into assigned_to (None, one anchor ID, or a
+        list of anchor IDs closest first) and the anchors' children.
+
+        Returns:
+            list[str]: Object and anchor IDs whose assignment changed.
+        """
+        anchor_order = {aid: i for i, aid in enumerate(self.anchor_tiles)}
+        # A TileStore derives children from the zone column written through assigned_to
+        update_children = self.store is None
+        changed = []
+        for qr_id in object_ids:
+            obj_tile = self.object_tiles[qr_id]
+            new_zones = resolve_zones(self.zone_reach.get(qr_id), self.zone_config.overlap, anchor_order)
+            old_zones = assigned_anchor_ids(obj_tile)
+            if new_zones == old_zones:
+                continue
+
+            for anchor_id in old_zones:
+                if anchor_id not in new_zones and anchor_id in self.anchor_tiles:
+                    if update_children:
+                        self.anchor_tiles[anchor_id].children.discard(qr_id)
+                    changed.append(anchor_id)
+            for anchor_id in new_zones:
+                if anchor_id not in old_zones:
+                    if update_children:
+                        self.anchor_tiles[anchor_id].children.add(qr_id)
+                    changed.append(anchor_id)
+            obj_tile.assigned_to = (None if not new_zones else
+                                    new_zones[0] if len(new_zones) == 1 else list(new_zones))
+            changed.append(qr_id)
+        return changed
+
+    @profiled()
+    def assign_zones(self):
+        """
+        Assigns every object tile to the zone(s) that reach it (core.zone_assignment), in one
+        multi-source BFS from all anchors over the adjacency map.
+
+        Returns:
+            tuple: (object_tiles, anchor_tiles, hex_width).
+        """
+        self.zone_reach = zone_reach(self.adjacency_map, self.anchor_tiles, self.object_tiles, self.zone_config)
+        self._update_memberships(self._zone_candidates())
+        self._relations = None
         return self.object_tiles, self.anchor_tiles, self.hex_width
 
+    def _zone_candidates(self):
+        """Objects that are in a zone now or were before: the only ones a full reassignment can change."""
+        candidates = set(self.zone_reach)
+        for anchor in self.anchor_tiles.values():
+            candidates.update(anchor.children)
+        return candidates & self.object_tiles.keys()
+
     def get_unassigned_neighbors_of_children(self, anchor_tile):
-        tile_lookup = {tile.qr_id: tile for tile in self.tiles}
         potential_siblings = set()
 
         for child_id in anchor_tile.children:
             neighbors = self.adjacency_map.get(child_id, [])
             for neighbor_id in neighbors:
-                if neighbor_id not in anchor_tile.children:
-                    neighbor_tile = tile_lookup.get(neighbor_id)
-                    if isinstance(neighbor_tile, ObjectTile):
-                        potential_siblings.add(neighbor_id)
+                if neighbor_id not in anchor_tile.children and neighbor_id in self.object_tiles:
+                    potential_siblings.add(neighbor_id)
 
         return list(potential_siblings)
 
+    @property
+    def relations(self) -> ZoneRelations:
+        """Cross-zone edge table (core.zone_relations), built on first use and kept current by apply_delta."""
+        if self._relations is None:
+            with span("zone_relations", tiles=len(self.object_tiles)):
+                self._relations = ZoneRelations.from_board(self)
+        return self._relations
+
     def analyze_cross_zone_neighbors(self):
         """
+        Every cross-zone and unassigned-neighbour edge between object tiles, once per edge.
+
         Returns:
         [
             {
@@ -240,11 +707,44 @@ class BoardModel:
             ...
         ]
         """
-        return self.anchor_tiles, self.object_tiles, self.adjacency_map
+        return self.relations.to_dicts()
 
 
     def get_tile_by_id(self, tile_id):
-        return next((t for t in self.tiles if t.qr_id == tile_id), None)
+        return self.index.get(tile_id)
+
+    def tile_at(self, coords):
+        """Tile occupying axial (q, r), or None."""
+        return self.index.get(self.index.at(coords))
+
+    def _cell(self, tile_or_coords):
+        if isinstance(tile_or_coords, Tile):
+            return self.index.cell_of(tile_or_coords.qr_id)
+        if isinstance(tile_or_coords, str):
+            return self.index.cell_of(tile_or_coords)
+        return tuple(tile_or_coords)
+
+    def tiles_within(self, center, radius: int) -> list[Tile]:
+        """
+        Tiles within `radius` hex steps of center, nearest first (center included).
+
+        Parameters:
+            center (str | Tile | tuple[int, int]): Tile, tile ID or axial coordinates.
+        """
+        cell = self._cell(center)
+        return [] if cell is None else [self.index.get(qr_id) for qr_id in self.index.within(cell, radius)]
+
+    def tiles_in_ring(self, center, radius: int) -> list[Tile]:
+        """Tiles exactly `radius` hex steps from center, walking around the ring."""
+        cell = self._cell(center)
+        return [] if cell is None else [self.index.get(qr_id) for qr_id in self.index.ring(cell, radius)]
+
+    def tiles_on_line(self, start, end) -> list[Tile]:
+        """Tiles on the straight hex line from start to end (both included), in order."""
+        a, b = self._cell(start), self._cell(end)
+        if a is None or b is None:
+            return []
+        return [self.index.get(qr_id) for qr_id in self.index.line(a, b)]
 
     def get_anchors_of_tile(self, tile):
         """
@@ -266,6 +766,23 @@ class BoardModel:
         return []
 
 
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable snapshot of the board.
+
+        Returns:
+            dict: tiles (via Tile.to_dict), hex_width, axial_map, adjacency_map,
+                  zones (anchor ID → sorted child IDs) and the lattice fit report (or None).
+        """
+        return {
+            "hex_width": self.hex_width,
+            "lattice": self.lattice.report() if self.lattice else None,
+            "tiles": [tile.to_dict() for tile in self.tiles],
+            "axial_map": {tid: list(coords) for tid, coords in self.axial_map.items()},
+            "adjacency_map": self.adjacency_map,
+            "zones": {aid: sorted(anchor.children) for aid, anchor in self.anchor_tiles.items()},
+        }
+
     def print_adjacency_map(self):
         # print("\nAdjacency Map:")
         if not self.adjacency_map:
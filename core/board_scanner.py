@@ -1,188 +1,169 @@
 import cv2
-import math
 import numpy as np
 from core.tile_model import create_tile
-from PyQt6.QtGui import QPixmap, QImage
+from core.tile_store import TileStore
+from core.qr_detection import detect_qr_codes, get_detection_settings
+from core.rectification import rectify_board, warp_image
+from core.geometry import regulate_tiles, QR_TO_HEX_WIDTH
 from core.overlays import draw_tile_overlay
+from core.profiling import span, count, profiled
 
 """
 Scans image only.
 See "scan_qr_test.py for scanning with active camera
 """
 
-def dist(p1, p2):
-    """Use the Euclidean distance between adjacent pairs"""
-    return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-
-
-def calculate_square_side(corners):
-    # print("Corners raw:", corners)
-    # print("Shape:", np.array(corners).shape)
-    
-    """Estimates average side length of a quadrilateral by averaging the lengths of all four edges."""
-    cx = sum(x for x, _ in corners) / 4
-    cy = sum(y for _, y in corners) / 4
-
-    # Sort corners around centroid
-    corners = list(corners)  # Ensure it's a list, not a NumPy array
-    corners.sort(key=lambda c: math.atan2(c[1] - cy, c[0] - cx))
-
-    sides = [dist(corners[i], corners[(i + 1) % 4]) for i in range(4)]
-    
-    return sum(sides) / 4  # average in case of distortion
-
-
-def rotate_point(p, origin, angle_rad):
+def detect_board(img, detection=None, rectify=False):
     """
-    Rotates a point p around a given origin by angle_rad radians.
-    """
-    ox, oy = origin
-    px, py = p
-    cos_a = math.cos(angle_rad)
-    sin_a = math.sin(angle_rad)
-    qx = ox + cos_a * (px - ox) - sin_a * (py - oy)
-    qy = oy + sin_a * (px - ox) + cos_a * (py - oy)
-    return [qx, qy]
-
-def get_rotation_angle(corners):
-    """
-    Computes the rotation angle (in radians and degrees) of a square QR code,
-    snapping to the nearest multiple of 60 degrees.
+    Runs detection and tile geometry, without tile metadata. This is the part scan_image caches.
+
+    Returns:
+        tuple[np.ndarray, dict]: the image detection ran on (rectified if asked), and the scan record:
+            {"hex_width", "codes": [{"qr_id", "og_corners", "rotation", "centroid"}],
+             "homography", "size"} (homography and size are None when not rectified).
     """
-    tl, tr = np.array(corners[0]), np.array(corners[1])
-    dx, dy = tr - tl
-    angle_rads = math.atan2(dy, dx)
-    rot_deg = (math.degrees(angle_rads) + 360) % 360
+    record = {"hex_width": 0, "codes": [], "homography": None, "size": None}
+
+    quads = None
+    if rectify:
+        # Candidate quads found while estimating the homography are searched again after warping
+        with span("rectify_board"):
+            rectification = rectify_board(img, detection)
+        img, quads = rectification.image, rectification.quads
+        if rectification.source != "identity":
+            record["homography"] = rectification.homography.tolist()
+            record["size"] = [img.shape[1], img.shape[0]]
 
-    # Snap to nearest multiple of 60
-    snapped_deg = round(rot_deg / 60) * 60 % 360
+    # Pre-process the image before decoding
+    with span("cvtColor"):
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    return -angle_rads, snapped_deg  # Negated angle_rads to restore upright orientation
+    # Candidates on a downscaled level, decoded as full-resolution tiles
+    with span("detect_qr_codes"):
+        detections = detect_qr_codes(gray, detection, quads=quads)
+    count("qr_codes_decoded", len(detections))
 
-def normalize_square(corners):
-    """
-    Returns 4 corners rotated around centre of square so they are visually upright
-    """
-    angle_rad, rot_deg = get_rotation_angle(corners)
-    qr_origin = np.mean(corners, axis=0)  # rotate around visual center
-    qr_size = calculate_square_side(corners)
+    if detections:
+        # All tile geometry in one vectorized pass
+        corner_array = np.stack([corners for _, corners in detections])
+        with span("regulate_tiles", tiles=len(detections)):
+            rot_degs, hex_centers, qr_sizes = regulate_tiles(corner_array)
+        qr_size = float(qr_sizes[0])
 
-    return qr_size, angle_rad, rot_deg, qr_origin
+        # change if the ratio if the QR OR physical hex tile changes, disproportionate to eachother
+        record["hex_width"] = qr_size * QR_TO_HEX_WIDTH
 
-def rotate_offset(offset_vector, angle_rad):
-    """
-    Get offset vector of the 
-    """
-    rot_matrix = np.array([
-        [math.cos(angle_rad), -math.sin(angle_rad)],
-        [math.sin(angle_rad),  math.cos(angle_rad)]
-    ])
-    offset_vector = np.array(offset_vector).reshape((2,))  # Ensure it's a flat 1D array
-    return rot_matrix @ offset_vector  # Matrix-vector multiplication
+        for (data, _), corners, tile_rot_deg, hex_center in zip(
+                detections, corner_array.tolist(), rot_degs.tolist(), hex_centers.tolist()):
+            record["codes"].append({"qr_id": data, "og_corners": corners, "rotation": tile_rot_deg,
+                                    "centroid": hex_center})
 
+    return img, record
 
 
-def regulate_tile(corners):
+@profiled()
+def tiles_from_record(record, tile_metadata=None):
     """
-    Rotates a QR tile upright and calculates:
-    - its rotation angle
-    - the center of its containing hex tile (based on fixed offset)
-    - the QR corners repositioned as if rotated around the hex tile center
-
-    Arguments:
-        data: The decoded QR data (optional)
-        corners: List or array of 4 QR corners (each a [x, y] point)
-
-    Returns:
-        tile_rot_deg (float): Rotation angle in degrees
-        hex_center (np.ndarray): New hex tile center position (2D)
-        repositioned_corners (list of np.ndarray): QR corners repositioned around hex center
+    Builds Tile objects from a scan record (see detect_board), attaching the current metadata.
     """
-    # Ensure corners is a list of [x, y] pairs
-    corners = np.squeeze(np.array(corners)).tolist()
-
-    qr_size, angle_rad, tile_rot_deg, qr_origin = normalize_square(corners)
-
-    offset = [0, -qr_size * 0.66]
-    rotated_offset = rotate_offset(offset, -angle_rad)
+    tiles = []
+    for code in record["codes"]:
+        attributes = tile_metadata.get(code["qr_id"], {}) if tile_metadata else {}
+        tile = create_tile(qr_id=code["qr_id"], centroid=tuple(code["centroid"]), attributes=attributes)
+        tile.attributes["rotation"] = code["rotation"]
+        tile.attributes["og_corners"] = code["og_corners"]
+        tiles.append(tile)
+    return tiles
 
-    hex_center = np.array(qr_origin) + rotated_offset
 
-    return tile_rot_deg, tuple(hex_center)
-    
-def scan_image(img, tile_metadata=None):
+def scan_image(img, tile_metadata=None, detection=None, rectify=False, cache=None):
     """
     Scans an image for QR codes and returns Tile objects with metadata and layout geometry.
 
     Parameters:
-        path (str): Path to the image file.
-        icon_lookup (dict, optional): A dictionary mapping QR IDs to metadata (e.g., icon).
+        img (np.ndarray): BGR photo of the board.
+        tile_metadata (dict, optional): A dictionary mapping QR IDs to metadata (e.g., icon).
+        detection (str | DetectionSettings, optional): Detection preset ("fast", "balanced", "thorough")
+            or settings for the multi-scale tiled detector. Defaults to "balanced".
+        rectify (bool): Warp oblique shots to a fronto-parallel view first (core.rectification),
+            so the QR-to-hex ratios hold. Detection and tile geometry then run on the warped image.
+        cache (ScanCache, optional): On-disk cache of scan records (core.scan_cache). On a hit,
+            decoding is skipped entirely.
 
     Returns:
-        img (np.ndarray): The original image.
+        img (np.ndarray): The original image, or the rectified image when rectify is set.
         tiles (List[Tile]): List of Tile objects with detected positions and metadata.
-        hex_diag (float): Estimated hexagon height based on QR size.
         hex_width (float): Estimated hexagon width based on QR size.
     """
-    detector = cv2.QRCodeDetector()
-    detector.setEpsX(0.1)
-    detector.setEpsY(0.1)
-
-    # Pre-process the image before decoding
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-    # Use the thresholded image for detection
-    ok, decoded, points, _ = detector.detectAndDecodeMulti(gray)
-
-    qr_size = None
-
-    tiles = []
-    if ok:
-        for data, corners in zip(decoded, points):
-            if data.strip() == "":
-                continue
-            # print("Tile:", data)
-                    # --- Normalize corner structure ---
-
-            corners = np.squeeze(corners)
-            if corners.shape != (4, 2):
-                # print(f"Skipping malformed corners for {data}: shape={corners.shape}")
-                continue
-            corners = corners.tolist()  # Now guaranteed to be List[List[x, y]]
+    img, record = scan_record(img, detection, rectify, cache)
+    return img, tiles_from_record(record, tile_metadata), record["hex_width"]
 
-            if qr_size is None:
-                qr_size = calculate_square_side(corners)
 
-            corners = np.squeeze(np.array(corners)).tolist()
-            
-            tile_rot_deg, hex_center = regulate_tile(corners)
-            centroid = tuple(float(x) for x in hex_center)
-
-            attributes = tile_metadata.get(data, {}) if tile_metadata else {}
-            tile = create_tile(qr_id=data, centroid=centroid, attributes=attributes)
-            tile.attributes["rotation"] = tile_rot_deg
-            tile.attributes["og_corners"] = corners
-            tiles.append(tile)
-    
+def scan_store(img, tile_metadata=None, detection=None, rectify=False, cache=None):
+    """
+    scan_image for very large boards: returns a columnar TileStore instead of Tile objects.
 
-    # change if the ratio if the QR OR physical hex tile changes, disproportionate to eachother
-    hex_width = qr_size * 2.66 if qr_size else 0
-    # print("hex_width: ", hex_width)
+    Returns:
+        img (np.ndarray): The original image, or the rectified image when rectify is set.
+        store (TileStore): One row per detected tile; pass it straight to BoardModel.
+        hex_width (float): Estimated hexagon width based on QR size.
+    """
+    img, record = scan_record(img, detection, rectify, cache)
+    return img, TileStore.from_record(record, tile_metadata), record["hex_width"]
 
-    return img, tiles, hex_width
 
+def scan_record(img, detection=None, rectify=False, cache=None):
+    """
+    detect_board behind the optional scan cache.
 
+    Returns:
+        tuple[np.ndarray, dict]: the image detection ran on and the scan record.
+    """
+    settings = get_detection_settings(detection)
+    with span("scan_cache_lookup"):
+        key = cache.key(img, settings, rectify) if cache is not None else None
+        record = cache.get(key) if cache is not None else None
+
+    if record is None:
+        if cache is not None:
+            count("scan_cache_misses")
+        with span("detect_board", rectify=rectify):
+            img, record = detect_board(img, settings, rectify)
+        if cache is not None:
+            cache.put(key, record)
+    else:
+        count("scan_cache_hits")
+        if record["homography"] is not None:
+            img = warp_image(img, np.array(record["homography"]), record["size"])
+    return img, record
+
+
+
+@profiled()
+def cv2_to_qimage(cv_img):
+    """
+    Convert a BGR OpenCV image to a QImage that owns its pixels. Unlike QPixmap, QImage may be
+    created off the GUI thread (gui.scan_worker).
+    """
+    # Imported here so headless scanning (core.batch_scan) never loads Qt
+    from PyQt6.QtGui import QImage
 
-def cv2_to_pixmap(cv_img):
-    """Convert a BGR OpenCV image to QPixmap for PyQt."""
     rgb_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
     height, width, channels = rgb_img.shape
     bytes_per_line = channels * width
     q_img = QImage(
         rgb_img.data, width, height, bytes_per_line, QImage.Format.Format_RGB888
     )
-    return QPixmap.fromImage(q_img)
+    return q_img.copy()  # detach from rgb_img's buffer
+
+@profiled()
+def cv2_to_pixmap(cv_img):
+    """Convert a BGR OpenCV image to QPixmap for PyQt."""
+    from PyQt6.QtGui import QPixmap
+
+    return QPixmap.fromImage(cv2_to_qimage(cv_img))
 
+@profiled()
 def xray_board(img, tiles):
     """
     Draw polylines and overlays on QR tile corners for visual feedback.
@@ -0,0 +1,363 @@
+import base64
+import json
+import time
+from dataclasses import dataclass, asdict
+import cv2
+import numpy as np
+from core.board_model import BoardModel
+from core.lattice import LatticeFit
+from core.tile_model import AnchorTile, ObjectTile
+from core.tile_store import TileStore, KIND_ANCHOR, KIND_OBJECT, COLUMN_ATTRIBUTES
+from core.zone_assignment import ZoneConfig
+from core.scan_cache import image_digest
+from core.profiling import span
+
+"""
+Versioned board snapshots: save a scanned board and reopen it without the photo.
+
+A snapshot holds the tiles (IDs, centroids, rotation, QR corners, attributes), the axial map,
+adjacency, zone state (BoardModel.zone_reach plus the zone settings it was grown with), the
+lattice fit, scan metadata and an optional JPEG thumbnail of the x-ray view. Loading restores
+the board with BoardModel.restore, so nothing is refitted, rebuilt or regrown.
+
+Two variants, picked by file extension:
+    .json   Readable; a superset of BoardModel.to_dict (what core.batch_scan wrote before),
+            so those older files load too (their zones are regrown).
+    .npz    Columnar NumPy arrays (uncompressed, no pickle): centroids, axial cells, rotations
+            and corners as arrays, adjacency as CSR offsets/targets, zones as (object, anchor,
+            distance) rows. Attributes are one JSON string. A 10k-tile board loads in about
+            80 ms (65 ms into a TileStore, columnar=True), against seconds to rescan it.
+
+Files carry "format" and "version"; files from a newer version are rejected rather than misread.
+"""
+
+SNAPSHOT_FORMAT = "regroup-board"
+SNAPSHOT_VERSION = 1
+
+THUMBNAIL_MAX_SIDE = 512
+THUMBNAIL_JPEG_QUALITY = 80
+
+
+@dataclass
+class BoardSnapshot:
+    """
+    Attributes:
+        board (BoardModel): The restored board.
+        scan (dict): Scan metadata saved with it (see scan_metadata).
+        thumbnail (bytes | None): JPEG thumbnail of the x-ray view, if one was saved.
+        version (int): Format version of the file (0 for pre-versioned batch_scan output).
+    """
+    board: BoardModel
+    scan: dict
+    thumbnail: bytes = None
+    version: int = SNAPSHOT_VERSION
+
+
+def scan_metadata(image_path=None, img=None, detection=None, rectify=False, **extra) -> dict:
+    """
+    Describes where a board came from, for the snapshot's "scan" section.
+
+    Parameters:
+        image_path (str, optional): Photo the board was scanned from.
+        img (np.ndarray, optional): The photo itself; its digest matches core.scan_cache keys.
+        detection (str | DetectionSettings, optional): Detection preset or settings used.
+        rectify (bool): Whether the photo was rectified before detection.
+        extra: Further JSON-serializable fields.
+    """
+    scan = {"saved_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "rectify": bool(rectify)}
+    if image_path:
+        scan["image_path"] = image_path
+    if img is not None:
+        scan["image_digest"] = image_digest(img)
+        scan["image_size"] = [int(img.shape[1]), int(img.shape[0])]
+    if detection is not None:
+        scan["detection"] = detection if isinstance(detection, str) else asdict(detection)
+    scan.update(extra)
+    return scan
+
+
+def make_thumbnail(img, max_side=THUMBNAIL_MAX_SIDE) -> bytes:
+    """Downscaled JPEG of a BGR image (e.g. the x-ray view), for the snapshot."""
+    scale = max_side / max(img.shape[:2])
+    if scale < 1:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY])
+    if not ok:
+        raise ValueError("Could not encode thumbnail")
+    return encoded.tobytes()
+
+
+def decode_thumbnail(data: bytes):
+    """JPEG thumbnail → BGR np.ndarray (None if there is none)."""
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def _thumbnail_bytes(thumbnail):
+    if thumbnail is None or isinstance(thumbnail, (bytes, bytearray)):
+        return thumbnail
+    return make_thumbnail(thumbnail)
+
+
+def save_board(board, path, scan=None, thumbnail=None):
+    """
+    Writes a snapshot; ".npz" paths get the columnar variant, anything else JSON.
+
+    Parameters:
+        board (BoardModel): Board to save.
+        path (str): Output file.
+        scan (dict, optional): Scan metadata (scan_metadata()).
+        thumbnail (bytes | np.ndarray, optional): JPEG bytes, or a BGR image to downscale and encode.
+    """
+    thumbnail = _thumbnail_bytes(thumbnail)
+    with span("save_board", tiles=len(board.tiles)):
+        if path.endswith(".npz"):
+            with open(path, "wb") as f:
+                np.savez(f, **board_to_arrays(board, scan, thumbnail))
+        else:
+            with open(path, "w") as f:
+                json.dump(board_to_json(board, scan, thumbnail), f)
+
+
+def load_board(path, tile_data=None, columnar=False) -> BoardSnapshot:
+    """
+    Reads a snapshot written by save_board (or a pre-versioned batch_scan .board.json).
+
+    Parameters:
+        tile_data (dict, optional): Tile metadata (asset_loader.load_tile_data). Each tile's
+            attributes dict is then the tile_data entry, updated with the saved attributes,
+            so edits made in the app reach tile_data as they do after a scan.
+        columnar (bool): Back the board with a TileStore instead of Tile objects.
+    """
+    with span("load_board", path=path):
+        if path.endswith(".npz"):
+            with np.load(path, allow_pickle=False) as npz:
+                return board_from_arrays({name: npz[name] for name in npz.files}, tile_data, columnar)
+        with open(path) as f:
+            return board_from_json(json.load(f), tile_data, columnar)
+
+
+def _check_version(data):
+    if data.get("format", SNAPSHOT_FORMAT) != SNAPSHOT_FORMAT:
+        raise ValueError(f"Not a board snapshot (format {data.get('format')!r})")
+    version = data.get("version", 0)
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"Board snapshot version {version} is newer than this app supports ({SNAPSHOT_VERSION})")
+    return version
+
+
+def _attributes(qr_id, saved, tile_data):
+    if tile_data is None:
+        return dict(saved)
+    shared = tile_data.setdefault(qr_id, {})
+    shared.update(saved)
+    return shared
+
+
+def lattice_summary(lattice):
+    """
+    The scalar fields of LatticeFit.report() (collision lists become counts). The per-tile parts
+    of a fit index the tiles as they were when it ran, which apply_delta has since added to,
+    removed from and moved, so they are not saved.
+    """
+    if lattice is None:
+        return None
+    report = lattice.report()
+    for key in ("relocated", "unresolved"):
+        report[key] = len(report[key])
+    return report
+
+
+def lattice_to_json(lattice):
+    """The lattice model (coefficients) plus lattice_summary; see lattice_from_json."""
+    if lattice is None:
+        return None
+    return {"coeffs": lattice.coeffs.tolist(), **lattice_summary(lattice)}
+
+
+def lattice_from_json(data, axial, centroids):
+    """
+    Rebuilds a LatticeFit from its coefficients, aligned with the restored tiles: axial is the
+    saved cell of each tile and residuals are measured again from the saved centroids.
+    """
+    if data is None:
+        return None
+    lattice = LatticeFit(coeffs=np.asarray(data["coeffs"], dtype=np.float64),
+                         axial=np.asarray(axial, dtype=np.int64).reshape(-1, 2), residuals=np.zeros(0))
+    points = np.asarray(centroids, dtype=np.float64).reshape(-1, 2)
+    lattice.residuals = np.linalg.norm(lattice.axial_to_pixel(lattice.axial) - points, axis=1) / lattice.spacing
+    return lattice
+
+
+def _restore(tiles, header, axial, centroids, adjacency_map, zone_reach, scan, thumbnail, version):
+    lattice = lattice_from_json(header.get("lattice_fit"), axial, centroids)
+    zone_config = ZoneConfig(**header["zone_config"]) if header.get("zone_config") else None
+    board = BoardModel.restore(tiles, header["hex_width"], axial, adjacency_map, zone_reach or {},
+                               lattice=lattice, fit_lattice=header.get("fit_lattice", True),
+                               zone_config=zone_config)
+    if zone_reach is None:
+        board.assign_zones()  # pre-versioned file: zones were not saved in a reusable form
+    return BoardSnapshot(board, scan or {}, thumbnail, version)
+
+
+# --- JSON variant ---
+
+def board_to_json(board, scan=None, thumbnail=None) -> dict:
+    """Snapshot as a JSON-serializable dict: BoardModel.to_dict plus the fields needed to restore it."""
+    data = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "scan": scan or {}}
+    data.update(board.to_dict())
+    data.update({
+        "lattice": lattice_summary(board.lattice),
+        "fit_lattice": board.fit_lattice,
+        "lattice_fit": lattice_to_json(board.lattice),
+        "zone_config": asdict(board.zone_config),
+        "zone_reach": board.zone_reach,
+        "thumbnail": base64.b64encode(thumbnail).decode("ascii") if thumbnail else None,
+    })
+    return data
+
+
+def board_from_json(data, tile_data=None, columnar=False) -> BoardSnapshot:
+    version = _check_version(data)
+    saved_tiles = data["tiles"]
+    ids = [tile["qr_id"] for tile in saved_tiles]
+
+    if columnar:
+        tiles = TileStore(capacity=max(64, len(ids)))
+        for tile in saved_tiles:
+            attributes = dict(tile.get("attributes", {}))
+            rotation = attributes.pop("rotation", None)
+            corners = attributes.pop("og_corners", None)
+            kind = KIND_ANCHOR if tile.get("type") == "AnchorTile" else KIND_OBJECT
+            tiles.append(tile["qr_id"], tile["centroid"], _attributes(tile["qr_id"], attributes, tile_data),
+                         rotation, corners, kind)
+    else:
+        tiles = []
+        for tile in saved_tiles:
+            cls = AnchorTile if tile.get("type") == "AnchorTile" else ObjectTile
+            tiles.append(cls(qr_id=tile["qr_id"], centroid=tuple(tile["centroid"]),
+                             attributes=_attributes(tile["qr_id"], tile.get("attributes", {}), tile_data)))
+
+    axial_map = data["axial_map"]
+    axial = [axial_map[qr_id] for qr_id in ids]
+    thumbnail = base64.b64decode(data["thumbnail"]) if data.get("thumbnail") else None
+    centroids = [tile["centroid"] for tile in saved_tiles]
+    return _restore(tiles, data, axial, centroids, data["adjacency_map"], data.get("zone_reach"),
+                    data.get("scan"), thumbnail, version)
+
+
+# --- Columnar (.npz) variant ---
+
+def board_to_arrays(board, scan=None, thumbnail=None) -> dict:
+    """Snapshot as named NumPy arrays for np.savez (no object arrays, so loading needs no pickle)."""
+    tiles = board.tiles
+    ids = [tile.qr_id for tile in tiles]
+    row_of = {qr_id: row for row, qr_id in enumerate(ids)}
+    n = len(ids)
+
+    store = board.store
+    if store is not None:
+        rows = store.live_rows()
+        centroids = store.centroids[rows]
+        kinds = store.kinds[rows]
+        rotations, has_rotation = store.rotations[rows], store.has_rotation[rows]
+        corners, has_corners = store.corners[rows].astype(np.float64), store.has_corners[rows]
+        metadata = [{k: v for k, v in (store.metadata[row] or {}).items() if k not in COLUMN_ATTRIBUTES}
+                    for row in rows.tolist()]
+    else:
+        centroids = np.array([tile.centroid for tile in tiles], dtype=np.float64).reshape(-1, 2)
+        kinds = np.array([KIND_ANCHOR if isinstance(tile, AnchorTile) else KIND_OBJECT for tile in tiles],
+                         dtype=np.uint8)
+        rotations = np.zeros(n, dtype=np.int16)
+        has_rotation = np.zeros(n, dtype=bool)
+        corners = np.zeros((n, 4, 2), dtype=np.float64)
+        has_corners = np.zeros(n, dtype=bool)
+        metadata = []
+        for row, tile in enumerate(tiles):
+            attributes = tile.attributes
+            if attributes.get("rotation") is not None:
+                rotations[row], has_rotation[row] = attributes["rotation"], True
+            if attributes.get("og_corners") is not None:
+                corners[row], has_corners[row] = np.asarray(attributes["og_corners"]).reshape(4, 2), True
+            metadata.append({k: v for k, v in attributes.items() if k not in COLUMN_ATTRIBUTES})
+
+    axial_map = board.axial_map
+    axial = np.array([axial_map[qr_id] for qr_id in ids], dtype=np.int32).reshape(-1, 2)
+
+    neighbours = [[row_of[n_id] for n_id in board.adjacency_map.get(qr_id, ()) if n_id in row_of] for qr_id in ids]
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(row) for row in neighbours])
+    targets = np.fromiter((j for row in neighbours for j in row), dtype=np.int32, count=int(offsets[-1]))
+
+    reach = [(row_of[obj], row_of[anchor], distance)
+             for obj, anchors in board.zone_reach.items() if obj in row_of
+             for anchor, distance in anchors.items() if anchor in row_of]
+    reach = np.array(reach, dtype=np.int32).reshape(-1, 3)
+
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "hex_width": board.hex_width,
+        "fit_lattice": board.fit_lattice,
+        "lattice_fit": lattice_to_json(board.lattice),
+        "zone_config": asdict(board.zone_config),
+        "scan": scan or {},
+    }
+    arrays = {
+        "header": np.array(json.dumps(header)),
+        "ids": np.array(ids, dtype=str),
+        "kinds": kinds,
+        "centroids": centroids,
+        "axial": axial,
+        "rotations": rotations,
+        "has_rotation": has_rotation,
+        "corners": corners,
+        "has_corners": has_corners,
+        "attributes": np.array(json.dumps(metadata)),
+        "adjacency_offsets": offsets,
+        "adjacency_targets": targets,
+        "zone_reach": reach,
+    }
+    if thumbnail:
+        arrays["thumbnail"] = np.frombuffer(thumbnail, dtype=np.uint8)
+    return arrays
+
+
+def board_from_arrays(arrays, tile_data=None, columnar=False) -> BoardSnapshot:
+    header = json.loads(str(arrays["header"]))
+    version = _check_version(header)
+    ids = arrays["ids"].tolist()
+    metadata = [_attributes(qr_id, saved, tile_data)
+                for qr_id, saved in zip(ids, json.loads(str(arrays["attributes"])))]
+    kinds = arrays["kinds"]
+
+    if columnar:
+        tiles = TileStore.from_columns(ids, arrays["centroids"], kinds, metadata, arrays["rotations"],
+                                       arrays["has_rotation"], arrays["corners"], arrays["has_corners"])
+    else:
+        centroids = arrays["centroids"].tolist()
+        rotations, has_rotation = arrays["rotations"].tolist(), arrays["has_rotation"].tolist()
+        corners, has_corners = arrays["corners"].tolist(), arrays["has_corners"].tolist()
+        anchors = (kinds == KIND_ANCHOR).tolist()
+        tiles = []
+        for row, qr_id in enumerate(ids):
+            attributes = metadata[row]
+            if has_rotation[row]:
+                attributes["rotation"] = rotations[row]
+            if has_corners[row]:
+                attributes["og_corners"] = corners[row]
+            cls = AnchorTile if anchors[row] else ObjectTile
+            tiles.append(cls(qr_id=qr_id, centroid=tuple(centroids[row]), attributes=attributes))
+
+    offsets = arrays["adjacency_offsets"].tolist()
+    targets = [ids[j] for j in arrays["adjacency_targets"].tolist()]
+    adjacency_map = {qr_id: targets[offsets[row]:offsets[row + 1]] for row, qr_id in enumerate(ids)}
+
+    zone_reach = {}
+    for obj, anchor, distance in arrays["zone_reach"].tolist():
+        zone_reach.setdefault(ids[obj], {})[ids[anchor]] = distance
+
+    thumbnail = arrays["thumbnail"].tobytes() if "thumbnail" in arrays else None
+    return _restore(tiles, header, arrays["axial"], arrays["centroids"], adjacency_map, zone_reach,
+                    header.get("scan"), thumbnail, version)
@@ -0,0 +1,33 @@
+## Warps a board photo with synthetic camera tilts and compares the scanned layout with and without rectification.
+## Run from the repo root: python -m core.debugging_scripts.rectification_test [board.jpg]
+import sys
+import cv2
+import numpy as np
+from core.board_scanner import scan_image
+from core.board_model import BoardModel
+
+img_path = sys.argv[1] if len(sys.argv) > 1 else "assets/tile_imgs/IMG_1620.jpg"
+img = cv2.imread(img_path)
+if img is None:
+    sys.exit(f"Could not read {img_path}")
+
+height, width = img.shape[:2]
+reference = BoardModel(*scan_image(img)[1:])
+print(f"top-down: {len(reference.tiles)} tiles")
+
+# (top-edge squeeze, top-edge drop, in-plane rotation in degrees): the top of the board recedes from the camera
+tilts = [(0.1, 0.0, 0), (0.2, 0.1, 0), (0.3, 0.2, 10), (0.0, 0.35, -20)]
+
+for squeeze, drop, rotation in tilts:
+    src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    dst = src + np.float32([[squeeze * width, drop * height], [-squeeze * width, drop * height], [0, 0], [0, 0]])
+    homography = np.vstack([cv2.getRotationMatrix2D((width / 2, height / 2), rotation, 1.0), [0, 0, 1]])
+    homography = homography @ cv2.getPerspectiveTransform(src, dst)
+    warped = cv2.warpPerspective(img, homography, (width, height), borderValue=(255, 255, 255))
+
+    for rectify in (False, True):
+        board = BoardModel(*scan_image(warped, rectify=rectify)[1:])
+        same_neighbors = sum(sorted(board.adjacency_map[tid]) == sorted(reference.adjacency_map.get(tid, []))
+                             for tid in board.adjacency_map)
+        print(f"tilt {squeeze:.2f}/{drop:.2f}/{rotation:+d}° rectify={rectify!s:5}: "
+              f"{len(board.tiles)} tiles, {same_neighbors} with the same neighbours as top-down")
@@ -0,0 +1,23 @@
+## Streams stable tile updates from the camera (or a recorded video passed as the first argument).
+## Run from the repo root: python -m core.debugging_scripts.stream_scan_test [video.mp4]
+import sys
+import json
+from core.stream_scanner import StreamScanner
+
+source = sys.argv[1] if len(sys.argv) > 1 else 0  # use find_camera.py to determine which camera feed to use.
+
+with open("assets/tile_definitions.json") as f:
+    tile_metadata = json.load(f)
+
+scanner = StreamScanner(source, tile_metadata=tile_metadata)
+
+print("Press Ctrl+C to quit.")
+try:
+    for update in scanner:
+        x, y = update.tile.centroid
+        print(f"[frame {update.frame_index}] {update.kind}: {update.tile.qr_id} ({update.tile.icon()}) at ({x:.0f}, {y:.0f})")
+except KeyboardInterrupt:
+    scanner.stop()
+
+tiles, hex_width = scanner.current_tiles()
+print(f"{len(tiles)} stable tiles, hex_width={hex_width:.1f}")
@@ -0,0 +1,200 @@
+import numpy as np
+
+"""
+Batched tile geometry.
+
+Vectorized QR-to-hex geometry (rotation, hex centre, QR size) shared by board_scanner and
+stream_scanner, plus BoardModel.centroid_to_axial / axial_round. Each function takes every
+tile on the board at once, so per-board geometry cost is a handful of NumPy calls regardless
+of tile count. close_pairs finds nearby centroids on a uniform grid, so neighbour searches
+stay linear in board size instead of comparing every tile with every other. fit_similarity
+registers two photos of the same board from the tiles they share.
+"""
+
+# Ratios between the QR code and the physical hex tile it is printed on.
+# Change if the QR OR physical hex tile changes, disproportionate to eachother.
+QR_TO_HEX_CENTER = 0.66  # QR centre → hex centre distance, in QR sides
+QR_TO_HEX_WIDTH = 2.66   # hex centre-to-centre spacing, in QR sides
+
+SQRT3 = 3 ** 0.5
+
+
+def as_corner_array(corners) -> np.ndarray:
+    """
+    Coerces QR corners (list of 4 points, or N such lists) into a float64 (N, 4, 2) array.
+    """
+    arr = np.asarray(corners, dtype=np.float64)
+    return arr.reshape(-1, 4, 2)
+
+
+def square_sides(corners) -> np.ndarray:
+    """
+    Average side length of each quadrilateral, with corners ordered around their centroid first.
+
+    Parameters:
+        corners: (N, 4, 2) corner array.
+
+    Returns:
+        np.ndarray: (N,) side lengths.
+    """
+    corners = as_corner_array(corners)
+    center = corners.mean(axis=1, keepdims=True)
+    angles = np.arctan2(corners[..., 1] - center[..., 1], corners[..., 0] - center[..., 0])
+    order = np.argsort(angles, axis=1, kind="stable")
+    ordered = np.take_along_axis(corners, order[..., None], axis=1)
+    edges = np.roll(ordered, -1, axis=1) - ordered
+    return np.hypot(edges[..., 0], edges[..., 1]).mean(axis=1)
+
+
+def rotation_angles(corners):
+    """
+    Rotation of each QR from its top edge (corner 0 → corner 1).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (N,) angles in radians, negated to restore upright
+            orientation, and (N,) degrees snapped to the nearest multiple of 60.
+    """
+    corners = as_corner_array(corners)
+    top_edge = corners[:, 1] - corners[:, 0]
+    angle_rads = np.arctan2(top_edge[:, 1], top_edge[:, 0])
+    rot_deg = (np.degrees(angle_rads) + 360) % 360
+    snapped_deg = (np.round(rot_deg / 60) * 60 % 360).astype(int)
+    return -angle_rads, snapped_deg
+
+
+def regulate_tiles(corners):
+    """
+    Rotation, hex centre and QR size for every detected QR at once.
+
+    Parameters:
+        corners: (N, 4, 2) corner array.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]:
+            rot_deg (N,) snapped rotation in degrees,
+            hex_centers (N, 2) centre of the hex tile each QR is printed on,
+            qr_sizes (N,) average QR side length.
+    """
+    corners = as_corner_array(corners)
+    angle_rads, rot_deg = rotation_angles(corners)
+    qr_sizes = square_sides(corners)
+    qr_origins = corners.mean(axis=1)
+
+    # Offset (0, -size * ratio) rotated by -angle_rads
+    theta = -angle_rads
+    distance = qr_sizes * QR_TO_HEX_CENTER
+    offsets = np.stack([distance * np.sin(theta), -distance * np.cos(theta)], axis=1)
+
+    return rot_deg, qr_origins + offsets, qr_sizes
+
+
+def axial_round(q, r):
+    """
+    Rounds fractional axial coordinates to the nearest hex cell, preserving q + r + s = 0.
+
+    Parameters:
+        q, r (np.ndarray): (N,) fractional axial coordinates.
+
+    Returns:
+        np.ndarray: (N, 2) int axial coordinates.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    r = np.asarray(r, dtype=np.float64)
+    s = -q - r
+
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (ds <= dr)  # when s has the largest error it is the one recomputed, leaving q and r as is
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+
+    return np.stack([rq, rr], axis=1).astype(int)
+
+
+def centroids_to_axial(centroids, hex_width):
+    """
+    Batched BoardModel.centroid_to_axial for flat-topped hexes.
+
+    Parameters:
+        centroids: (N, 2) pixel positions.
+        hex_width (float): Centre-to-centre spacing between hex tiles.
+
+    Returns:
+        np.ndarray: (N, 2) int axial (q, r) coordinates.
+    """
+    centroids = np.asarray(centroids, dtype=np.float64).reshape(-1, 2)
+    size = hex_width / SQRT3
+    x, y = centroids[:, 0], centroids[:, 1]
+    q = (x * (2 / 3)) / size
+    r = (-x / 3 + (SQRT3 / 3) * y) / size
+    return axial_round(q, r)
+
+
+def close_pairs(points, radius, rows=None):
+    """
+    Index pairs (i, j), i in rows, j != i, of points closer than radius, via a uniform grid of
+    radius-sized cells (only the 3×3 cells around each point are compared).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: i and j index arrays.
+    """
+    n = len(points)
+    rows = np.arange(n) if rows is None else np.asarray(rows)
+    if n == 0 or len(rows) == 0:
+        return np.empty(0, int), np.empty(0, int)
+
+    cells = np.floor(points / radius).astype(np.int64)
+    keys = (cells[:, 0] << 32) + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    sources, targets = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            wanted = ((cells[rows, 0] + dx) << 32) + (cells[rows, 1] + dy)
+            lo = np.searchsorted(sorted_keys, wanted, "left")
+            counts = np.searchsorted(sorted_keys, wanted, "right") - lo
+            total = counts.sum()
+            if total == 0:
+                continue
+            # Expand each [lo, lo + count) run into positions of the sorted array
+            run_starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+            sources.append(np.repeat(rows, counts))
+            targets.append(order[np.arange(total) + run_starts])
+
+    if not sources:
+        return np.empty(0, int), np.empty(0, int)
+    i, j = np.concatenate(sources), np.concatenate(targets)
+    keep = i != j
+    i, j = i[keep], j[keep]
+    close = np.einsum("ij,ij->i", points[i] - points[j], points[i] - points[j]) < radius * radius
+    return i[close], j[close]
+
+
+def fit_similarity(src, dst):
+    """
+    Least-squares similarity transform (rotation, uniform scale, translation) taking src onto
+    dst (Umeyama's method), e.g. to map a rescan's centroids into the board's pixel frame.
+
+    Parameters:
+        src, dst: (N, 2) matching points, N >= 2.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (2, 2) matrix (rotation times scale) and (2,) offset,
+            so that dst ≈ src @ matrix.T + offset.
+    """
+    src = np.asarray(src, dtype=np.float64).reshape(-1, 2)
+    dst = np.asarray(dst, dtype=np.float64).reshape(-1, 2)
+    src_mean, dst_mean = src.mean(axis=0), dst.mean(axis=0)
+    src_c, dst_c = src - src_mean, dst - dst_mean
+
+    u, sigma, vt = np.linalg.svd(dst_c.T @ src_c / len(src))
+    reflect = np.diag([1.0, np.sign(np.linalg.det(u @ vt)) or 1.0])
+    rotation = u @ reflect @ vt
+    variance = (src_c ** 2).sum() / len(src)
+    scale = (sigma * np.diag(reflect)).sum() / variance if variance > 0 else 1.0
+
+    matrix = scale * rotation
+    return matrix, dst_mean - src_mean @ matrix.T
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+import numpy as np
+from core.geometry import SQRT3, close_pairs
+
+"""
+Force-directed layout of the tile adjacency graph for GraphViewTab.
+
+Instead of nx.spring_layout from random positions (O(n²) per iteration, different on every
+refresh), nodes start at their tile's real axial position, so the layout already resembles
+the board. A short force refinement then runs, and only over nodes that changed since the
+previous layout (new tiles, moved tiles, changed neighbours) plus their neighbours; every
+other node keeps its previous position. Repulsion is limited to nodes within REPULSION_RADIUS,
+found with a uniform grid and reused across iterations (a Verlet list), so an iteration is
+O(nodes + nearby pairs) rather than O(n²).
+A weak pull towards the seed position keeps the drawing recognisable and stable.
+
+Results are cached per board snapshot (IDs, axial cells, edges), so redrawing an unchanged
+board does no layout work at all.
+
+Positions are in hex units: neighbouring cells are 1 apart, y grows downwards like the board.
+"""
+
+LAYOUT_ITERATIONS = 30
+REPULSION_RADIUS = 2.0
+NEIGHBOUR_SKIN = 0.5  # extra radius of the cached pair list; rebuilt once a node moves half of it
+SEED_PULL = 0.15
+START_TEMPERATURE = 0.1
+CACHE_SIZE = 8
+
+
+def axial_positions(axial):
+    """
+    Centres of flat-topped hexes for (N, 2) axial (q, r) cells, scaled so neighbours are 1 apart.
+
+    Returns:
+        np.ndarray: (N, 2) float positions.
+    """
+    axial = np.asarray(axial, dtype=np.float64).reshape(-1, 2)
+    q, r = axial[:, 0], axial[:, 1]
+    return np.stack([1.5 * q, SQRT3 * (r + q / 2)], axis=1) / SQRT3
+
+
+def _scatter_sum(index, values, n):
+    """Sums (K, 2) values into n rows by index (np.add.at, but with bincount's speed)."""
+    return np.stack([np.bincount(index, weights=values[:, 0], minlength=n),
+                     np.bincount(index, weights=values[:, 1], minlength=n)], axis=1)
+
+
+class GraphLayout:
+    """
+    Incremental, cached layout engine. One instance per view; not thread-safe, use it from a
+    single (render) thread.
+
+    Attributes:
+        nodes (dict): qr_id → (cell, neighbour IDs, position) from the previous layout, used
+            to decide which nodes changed.
+        cache (OrderedDict): Snapshot key → positions, most recently used last.
+    """
+
+    def __init__(self, iterations=LAYOUT_ITERATIONS):
+        self.iterations = iterations
+        self.nodes = {}
+        self.cache = OrderedDict()
+
+    @staticmethod
+    def snapshot_key(ids, axial, edges):
+        return hash((tuple(ids), np.asarray(axial).tobytes(), np.asarray(edges).tobytes()))
+
+    def layout(self, ids, axial, edges):
+        """
+        Parameters:
+            ids (list[str]): Node IDs.
+            axial (array-like): (N, 2) axial cell of each node.
+            edges (array-like): (E, 2) node index pairs.
+
+        Returns:
+            np.ndarray: (N, 2) positions in hex units.
+        """
+        axial = np.asarray(axial, dtype=np.int64).reshape(-1, 2)
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        key = self.snapshot_key(ids, axial, edges)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            return cached
+
+        neighbours = [[] for _ in ids]
+        for a, b in edges:
+            neighbours[a].append(ids[b])
+            neighbours[b].append(ids[a])
+        neighbours = [frozenset(n) for n in neighbours]
+
+        seeds = axial_positions(axial)
+        positions = seeds.copy()
+        movable = np.ones(len(ids), dtype=bool)
+        for i, qr_id in enumerate(ids):
+            previous = self.nodes.get(qr_id)
+            cell = (int(axial[i, 0]), int(axial[i, 1]))
+            if previous is not None and previous[0] == cell and previous[1] == neighbours[i]:
+                positions[i] = previous[2]
+                movable[i] = False
+        if len(edges) and movable.any():
+            # Let the changed nodes' neighbours settle around them as well
+            touched = movable[edges[:, 0]] | movable[edges[:, 1]]
+            movable[edges[touched].ravel()] = True
+
+        if movable.any():
+            positions = self.relax(positions, seeds, edges, np.flatnonzero(movable))
+
+        self.nodes = {qr_id: ((int(axial[i, 0]), int(axial[i, 1])), neighbours[i], positions[i].copy())
+                      for i, qr_id in enumerate(ids)}
+        self.cache[key] = positions
+        while len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return positions
+
+    def relax(self, positions, seeds, edges, rows):
+        """
+        Fruchterman–Reingold style refinement (ideal edge length 1) of positions[rows]; all
+        other nodes stay fixed but still push and pull on the moving ones.
+        """
+        positions = positions.copy()
+        moving = np.zeros(len(positions), dtype=bool)
+        moving[rows] = True
+        if len(edges):
+            edges = edges[moving[edges[:, 0]] | moving[edges[:, 1]]]
+
+        listed_at = None
+        for step in range(self.iterations):
+            temperature = START_TEMPERATURE * (1 - step / self.iterations)
+            force = np.zeros_like(positions)
+
+            # Candidate pairs within radius + skin, reused until some node has moved skin / 2
+            if listed_at is None or np.abs(positions[rows] - listed_at[rows]).max() > NEIGHBOUR_SKIN / 2:
+                i, j = close_pairs(positions, REPULSION_RADIUS + NEIGHBOUR_SKIN, rows)
+                listed_at = positions.copy()
+
+            # Repulsion k²/d from nodes within REPULSION_RADIUS only
+            delta = positions[i] - positions[j]
+            dist2 = np.maximum(np.einsum("ij,ij->i", delta, delta), 1e-4)
+            weight = (dist2 < REPULSION_RADIUS ** 2) / dist2
+            force += _scatter_sum(i, delta * weight[:, None], len(positions))
+
+            # Attraction d²/k along edges
+            if len(edges):
+                delta = positions[edges[:, 1]] - positions[edges[:, 0]]
+                dist = np.sqrt(np.einsum("ij,ij->i", delta, delta))[:, None]
+                pull = delta * dist
+                force += _scatter_sum(edges[:, 0], pull, len(positions))
+                force -= _scatter_sum(edges[:, 1], pull, len(positions))
+
+            force += SEED_PULL * (seeds - positions)
+
+            # Move at most `temperature` per step
+            step_force = force[rows]
+            length = np.maximum(np.sqrt(np.einsum("ij,ij->i", step_force, step_force)), 1e-9)[:, None]
+            positions[rows] += step_force / length * np.minimum(length, temperature)
+        return positions
@@ -0,0 +1,334 @@
+import numpy as np
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.geometry import axial_round, close_pairs
+
+"""
+Global hex-lattice fitting.
+
+Instead of rounding every centroid against the image origin with a spacing taken from one QR,
+the lattice is estimated from all centroids at once:
+
+1. Spacing and rotation from every pair of tiles roughly one hex apart (median length, and the
+   circular mean of their directions modulo 60°).
+2. Axial coordinates are grown outwards from the tile nearest the board centre, one neighbour
+   step at a time, so perspective and lens distortion never accumulate into a wrong cell.
+   Tiles not connected to the seed are placed by the fitted model.
+3. A least-squares model (affine, or quadratic once there are enough tiles to absorb
+   perspective) maps axial coordinates to pixels; residuals are measured against it.
+4. Collisions (two tiles in one cell) are detected explicitly: the tile with the smaller residual
+   keeps the cell, the other moves to the closest free neighbouring cell if it is within one
+   spacing, otherwise the collision is reported as unresolved.
+"""
+
+# Flat-topped hexes in image coordinates (y down), as in BoardModel.centroid_to_axial:
+# the q step is (1.5 * size, sqrt(3)/2 * size), i.e. 30°, and the r step is (0, sqrt(3) * size), i.e. 90°.
+Q_STEP_ANGLE = np.radians(30)
+R_STEP_ANGLE = np.radians(90)
+
+NEIGHBOR_OFFSETS = np.array([[1, 0], [1, -1], [0, -1], [-1, 0], [-1, 1], [0, 1]])
+
+# Tiles needed before the quadratic (perspective-absorbing) model is used instead of the affine one
+MIN_TILES_FOR_QUADRATIC = 12
+
+
+def _features(axial, quadratic):
+    q, r = axial[:, 0], axial[:, 1]
+    columns = [np.ones_like(q), q, r]
+    if quadratic:
+        columns += [q * q, q * r, r * r]
+    return np.stack(columns, axis=1)
+
+
+@dataclass
+class LatticeFit:
+    """
+    A fitted hex lattice and the axial assignment of every centroid.
+
+    Attributes:
+        coeffs (np.ndarray): (3, 2) affine or (6, 2) quadratic coefficients mapping
+            [1, q, r(, q², qr, r²)] to pixel (x, y).
+        axial (np.ndarray): (N, 2) int axial coordinates, collisions resolved where possible.
+        residuals (np.ndarray): (N,) distance from each centroid to its modelled cell centre, in spacings.
+        collisions (dict): Cell → indices that initially landed in it (only cells with more than one).
+        relocated (list): (index, from_cell, to_cell) for tiles moved to a free neighbouring cell.
+        unresolved (list): Cells still holding more than one index.
+    """
+    coeffs: np.ndarray
+    axial: np.ndarray
+    residuals: np.ndarray
+    collisions: dict = field(default_factory=dict)
+    relocated: list = field(default_factory=list)
+    unresolved: list = field(default_factory=list)
+
+    @property
+    def quadratic(self) -> bool:
+        return len(self.coeffs) == 6
+
+    @property
+    def origin(self) -> np.ndarray:
+        """Pixel position of axial (0, 0)."""
+        return self.coeffs[0]
+
+    @property
+    def basis(self) -> np.ndarray:
+        """2x2 matrix whose columns are the pixel steps for +q and +r at the origin."""
+        return self.coeffs[1:3].T
+
+    @property
+    def spacing(self) -> float:
+        """Centre-to-centre distance at the origin, in pixels."""
+        return float(np.linalg.norm(self.basis, axis=0).mean())
+
+    @property
+    def rotation_deg(self) -> float:
+        """Rotation of the lattice relative to an upright flat-topped layout."""
+        q_step = self.basis[:, 0]
+        return float(np.degrees(np.arctan2(q_step[1], q_step[0]) - Q_STEP_ANGLE))
+
+    def axial_to_pixel(self, axial) -> np.ndarray:
+        axial = np.asarray(axial, dtype=np.float64).reshape(-1, 2)
+        return _features(axial, self.quadratic) @ self.coeffs
+
+    def pixel_to_fractional(self, points, iterations=5) -> np.ndarray:
+        """
+        Inverts the model: linear solve at the origin, then Newton steps for the quadratic terms.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        frac = np.linalg.solve(self.basis, (points - self.origin).T).T
+        if not self.quadratic or not len(points):
+            return frac
+
+        c = self.coeffs
+        for _ in range(iterations):
+            q, r = frac[:, 0], frac[:, 1]
+            jacobian = np.empty((len(frac), 2, 2))
+            jacobian[:, :, 0] = c[1] + 2 * q[:, None] * c[3] + r[:, None] * c[4]
+            jacobian[:, :, 1] = c[2] + q[:, None] * c[4] + 2 * r[:, None] * c[5]
+            error = self.axial_to_pixel(frac) - points
+            frac = frac - np.linalg.solve(jacobian, error[..., None])[..., 0]
+        return frac
+
+    def pixel_to_axial(self, points) -> np.ndarray:
+        """(N, 2) pixel positions → (N, 2) int axial coordinates on this lattice."""
+        frac = self.pixel_to_fractional(points)
+        return axial_round(frac[:, 0], frac[:, 1])
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: JSON-serializable summary of the fit quality and collisions.
+        """
+        residuals = self.residuals if len(self.residuals) else np.zeros(1)
+        return {
+            "model": "quadratic" if self.quadratic else "affine",
+            "spacing": self.spacing,
+            "rotation_deg": self.rotation_deg,
+            "rms_residual": float(np.sqrt(np.mean(residuals ** 2))),
+            "max_residual": float(residuals.max()),
+            "collisions": len(self.collisions),
+            "relocated": [(int(i), list(a), list(b)) for i, a, b in self.relocated],
+            "unresolved": [list(cell) for cell in self.unresolved],
+        }
+
+
+def neighbor_pairs(points, max_dist):
+    """
+    All ordered pairs (i, j), i != j, closer than max_dist, found on a uniform grid of
+    max_dist-sized cells (geometry.close_pairs), so the cost is linear in the number of tiles.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: i indices, j indices, (M, 2) vectors j - i,
+            sorted by i, then j.
+    """
+    i, j = close_pairs(points, max_dist)
+    order = np.lexsort((j, i))
+    i, j = i[order], j[order]
+    return i, j, points[j] - points[i]
+
+
+def nearest_neighbor_distances(points, radius=None):
+    """
+    Distance from each point to its nearest other point (inf for a single point).
+
+    Pairs closer than radius are found on a uniform grid; points with none get their radius
+    doubled until they do. A point that found a neighbour within the radius has found its
+    nearest one, so the result is exact. The first radius defaults to the mean point spacing
+    over the bounding box, so on a board most points finish in the first pass.
+    """
+    n = len(points)
+    distances = np.full(n, np.inf)
+    if n < 2:
+        return distances
+    extent = np.ptp(points, axis=0)
+    limit = float(np.hypot(*extent))
+    if limit == 0:
+        return np.zeros(n)  # every point on top of the others
+    if radius is None:
+        radius = max(np.sqrt(extent[0] * extent[1] / n), extent.max() / n)
+
+    rows = np.arange(n)
+    while len(rows):
+        i, j = close_pairs(points, radius, rows)
+        if len(i):
+            np.minimum.at(distances, i, np.linalg.norm(points[j] - points[i], axis=1))
+        rows = rows[np.isinf(distances[rows])]
+        if radius > limit:
+            break
+        radius *= 2
+    return distances
+
+
+def upright_basis(spacing, rotation=0.0):
+    """2x2 basis (columns: q step, r step) for a lattice of the given spacing, rotated by `rotation` radians."""
+    return spacing * np.array([
+        [np.cos(Q_STEP_ANGLE + rotation), np.cos(R_STEP_ANGLE + rotation)],
+        [np.sin(Q_STEP_ANGLE + rotation), np.sin(R_STEP_ANGLE + rotation)],
+    ])
+
+
+def estimate_spacing_and_rotation(points, spacing_hint=None):
+    """
+    Returns:
+        tuple[float, float, tuple]: spacing in pixels, rotation in radians, and the
+            (i, j, vectors) neighbour pairs used for the estimate.
+    """
+    nearest = nearest_neighbor_distances(points, 1.4 * spacing_hint if spacing_hint else None)
+    if spacing_hint:
+        # Ignore gaps (missing tiles) and near-duplicates when a rough spacing is known
+        usable = (nearest > 0.6 * spacing_hint) & (nearest < 1.4 * spacing_hint)
+        nearest = nearest[usable] if usable.any() else nearest
+    # The nearest of six noisy neighbours is biased short, so only use it to pick the pairs
+    rough = float(np.median(nearest))
+
+    i, j, vectors = neighbor_pairs(points, 1.35 * rough)
+    lengths = np.linalg.norm(vectors, axis=1)
+    keep = lengths > 0.75 * rough
+    i, j, vectors, lengths = i[keep], j[keep], vectors[keep], lengths[keep]
+    if not len(lengths):
+        return rough, 0.0, (i, j, vectors)
+
+    # Neighbour directions repeat every 60°: average them on the 6-fold circle
+    angles = np.arctan2(vectors[:, 1], vectors[:, 0]) - Q_STEP_ANGLE
+    rotation = float(np.angle(np.mean(np.exp(6j * angles))) / 6)
+    return float(np.median(lengths)), rotation, (i, j, vectors)
+
+
+def grow_assignment(n, seed, pairs, basis):
+    """
+    Breadth-first assignment of axial cells from the seed tile along neighbour pairs.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (N, 2) axial coordinates and a mask of assigned tiles.
+    """
+    i, j, vectors = pairs
+    steps = np.linalg.solve(basis, vectors.T).T
+    rounded = axial_round(steps[:, 0], steps[:, 1])
+    # Only accept pairs that round to exactly one hex step
+    is_step = (np.abs(rounded).sum(axis=1) <= 2) & (np.abs(rounded[:, 0] + rounded[:, 1]) <= 1) & rounded.any(axis=1)
+
+    neighbors = [[] for _ in range(n)]
+    for a, b, step in zip(i[is_step].tolist(), j[is_step].tolist(), rounded[is_step].tolist()):
+        neighbors[a].append((b, step))
+
+    axial = np.zeros((n, 2), dtype=int)
+    assigned = np.zeros(n, dtype=bool)
+    assigned[seed] = True
+    queue = deque([seed])
+    while queue:
+        a = queue.popleft()
+        for b, (dq, dr) in neighbors[a]:
+            if not assigned[b]:
+                axial[b] = (axial[a][0] + dq, axial[a][1] + dr)
+                assigned[b] = True
+                queue.append(b)
+    return axial, assigned
+
+
+def fit_model(axial, points, mask, fallback):
+    """
+    Least-squares axial → pixel model over the masked tiles. Returns `fallback` coefficients
+    when the tiles cannot pin down a lattice (e.g. all in one row).
+    """
+    cells = axial[mask].astype(np.float64)
+    if len(np.unique(cells, axis=0)) < 3 or np.linalg.matrix_rank(cells - cells.mean(axis=0)) < 2:
+        return fallback
+    quadratic = mask.sum() >= MIN_TILES_FOR_QUADRATIC
+    coeffs, *_ = np.linalg.lstsq(_features(cells, quadratic), points[mask], rcond=None)
+    if abs(np.linalg.det(coeffs[1:3])) < 1e-6 * np.abs(fallback[1:3]).max() ** 2:
+        return fallback
+    return coeffs
+
+
+def resolve_collisions(fit, points):
+    """
+    Moves all but the best-fitting tile of each over-full cell to the closest free neighbouring
+    cell (within one spacing of its centroid). Updates fit in place.
+    """
+    cells = {}
+    for i, cell in enumerate(map(tuple, fit.axial.tolist())):
+        cells.setdefault(cell, []).append(i)
+    fit.collisions = {cell: idx for cell, idx in cells.items() if len(idx) > 1}
+
+    for cell, indices in fit.collisions.items():
+        indices = sorted(indices, key=lambda i: fit.residuals[i])
+        for i in indices[1:]:
+            candidates = np.array(cell) + NEIGHBOR_OFFSETS
+            distances = np.linalg.norm(fit.axial_to_pixel(candidates) - points[i], axis=1) / fit.spacing
+            for k in np.argsort(distances):
+                target = tuple(candidates[k].tolist())
+                if distances[k] <= 1.0 and target not in cells:
+                    cells[target] = [i]
+                    cells[cell].remove(i)
+                    fit.axial[i] = candidates[k]
+                    fit.residuals[i] = distances[k]
+                    fit.relocated.append((i, cell, target))
+                    break
+
+    fit.unresolved = [cell for cell, idx in cells.items() if len(idx) > 1]
+    return fit
+
+
+def fit_hex_lattice(centroids, spacing_hint: Optional[float] = None):
+    """
+    Fits a hex lattice to tile centroids and assigns axial coordinates.
+
+    Parameters:
+        centroids: (N, 2) pixel positions.
+        spacing_hint (float, optional): Rough centre-to-centre spacing (e.g. hex_width from the QR size).
+
+    Returns:
+        LatticeFit: Axial (0, 0) is the tile nearest the middle of the board.
+    """
+    points = np.asarray(centroids, dtype=np.float64).reshape(-1, 2)
+    n = len(points)
+
+    if n < 3:
+        # Too few tiles to estimate rotation: upright lattice through the first tile
+        spacing = spacing_hint or (float(np.linalg.norm(points[1] - points[0])) if n == 2 else 1.0)
+        origin = points[0] if n else np.zeros(2)
+        fit = LatticeFit(coeffs=np.vstack([origin, upright_basis(spacing).T]),
+                         axial=np.zeros((n, 2), dtype=int), residuals=np.zeros(n))
+        if n:
+            fit.axial = fit.pixel_to_axial(points)
+            fit.residuals = np.linalg.norm(fit.axial_to_pixel(fit.axial) - points, axis=1) / fit.spacing
+        return resolve_collisions(fit, points)
+
+    spacing, rotation, pairs = estimate_spacing_and_rotation(points, spacing_hint)
+
+    # Grow from the tile closest to the middle of the board, where distortion is lowest
+    seed = int(np.argmin(np.linalg.norm(points - np.median(points, axis=0), axis=1)))
+    axial, assigned = grow_assignment(n, seed, pairs, upright_basis(spacing, rotation))
+
+    upright = np.vstack([points[seed], upright_basis(spacing, rotation).T])
+    fit = LatticeFit(coeffs=fit_model(axial, points, assigned, upright), axial=axial, residuals=np.zeros(n))
+
+    # Tiles separated from the seed by gaps are placed by the model
+    if not assigned.all():
+        fit.axial[~assigned] = fit.pixel_to_axial(points[~assigned])
+        fit.coeffs = fit_model(fit.axial, points, np.ones(n, dtype=bool), fit.coeffs)
+
+    fit.residuals = np.linalg.norm(fit.axial_to_pixel(fit.axial) - points, axis=1) / fit.spacing
+    return resolve_collisions(fit, points)
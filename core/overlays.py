@@ -1,4 +1,5 @@
 import cv2
+from core.tile_model import assigned_anchor_ids
 
 
 def draw_tile_overlay(img, tile):
@@ -19,9 +20,10 @@ def draw_tile_overlay(img, tile):
     label = tile.icon() if callable(tile.icon) else str(tile.icon)
     cv2.putText(img, label, (x + 10, y), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
 
-    # Anchor of object in-zone
-    if hasattr(tile, "assigned_to") and tile.assigned_to:
-        cv2.putText(img, f" {tile.assigned_to}", (x + 10, y + 20), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+    # Anchor(s) of object in-zone, closest first
+    anchor_ids = assigned_anchor_ids(tile)
+    if anchor_ids:
+        cv2.putText(img, f" {', '.join(anchor_ids)}", (x + 10, y + 20), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
 
     # Anchor's child count
     if hasattr(tile, "children") and tile.children:
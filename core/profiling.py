@@ -0,0 +1,249 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import wraps
+
+"""
+Lightweight instrumentation for the scan-to-render pipeline: named spans, counters and
+memory snapshots, collected by one process-wide Profiler (PROFILER).
+
+Disabled by default, and then span() hands back a shared no-op context manager and
+@profiled functions call straight through, so the hooks can stay in hot code. Enable it
+from the Diagnostics dock, with PROFILER.enable(), or by starting the app with
+REGROUP_PROFILE=1 set.
+
+Results can be read as per-span aggregates (summary), saved as JSON, or saved as a Chrome
+trace (chrome://tracing, https://ui.perfetto.dev) that shows spans per thread.
+"""
+
+# Events kept for trace export; aggregates are kept for every span regardless
+MAX_EVENTS = 100_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+class Profiler:
+    """
+    Collects spans, counters and memory snapshots. Safe to use from worker threads.
+
+    Attributes:
+        enabled (bool): When False, span / count / snapshot_memory do nothing.
+        events (deque): Most recent trace events, oldest dropped past max_events.
+        stats (dict): span name → [calls, total_ns, min_ns, max_ns].
+        counters (dict): counter name → running total.
+        memory (list[dict]): Memory snapshots ({"label", "time", "current", "peak"}, bytes).
+    """
+
+    def __init__(self, enabled=False, max_events=MAX_EVENTS):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.stats = {}
+        self.counters = {}
+        self.memory = []
+        self.threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, trace_memory=False):
+        """
+        Parameters:
+            trace_memory (bool): Also start tracemalloc so snapshots report Python heap usage
+                (slows allocation-heavy code noticeably).
+        """
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.stats.clear()
+            self.counters.clear()
+            self.memory.clear()
+            self.threads.clear()
+            self._origin = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        """
+        Context manager timing the enclosed block under `name`. Keyword arguments are attached
+        to the trace event (keep them small: counts, sizes, flags).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def record(self, name, start_ns, duration_ns, args=None):
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                self.stats[name] = [1, duration_ns, duration_ns, duration_ns]
+            else:
+                stats[0] += 1
+                stats[1] += duration_ns
+                stats[2] = min(stats[2], duration_ns)
+                stats[3] = max(stats[3], duration_ns)
+            self.threads[thread.ident] = thread.name
+            self.events.append(("X", name, start_ns, duration_ns, thread.ident, args or None))
+
+    def count(self, name, value=1):
+        """Adds value to a named counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.events.append(("C", name, time.perf_counter_ns(), 0, threading.get_ident(), {name: total}))
+
+    def snapshot_memory(self, label):
+        """
+        Records current and peak memory: the Python heap when tracemalloc is tracing, otherwise
+        the process's peak resident set size (where the platform reports it).
+        """
+        if not self.enabled:
+            return None
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+        else:
+            current = peak = _peak_rss()
+        snapshot = {"label": label, "time": (time.perf_counter_ns() - self._origin) / 1e9,
+                    "current": current, "peak": peak}
+        with self._lock:
+            self.memory.append(snapshot)
+            self.events.append(("C", "memory", time.perf_counter_ns(), 0, threading.get_ident(),
+                                {"current": current}))
+        return snapshot
+
+    def summary(self):
+        """
+        Returns:
+            dict: {"spans": {name: {"calls", "total_ms", "mean_ms", "min_ms", "max_ms"}},
+                   "counters": {...}, "memory": [...]}, spans sorted by total time.
+        """
+        with self._lock:
+            stats = {name: list(values) for name, values in self.stats.items()}
+            counters = dict(self.counters)
+            memory = list(self.memory)
+
+        spans = {}
+        for name, (calls, total, low, high) in sorted(stats.items(), key=lambda item: -item[1][1]):
+            spans[name] = {"calls": calls, "total_ms": total / 1e6, "mean_ms": total / calls / 1e6,
+                           "min_ms": low / 1e6, "max_ms": high / 1e6}
+        return {"spans": spans, "counters": counters, "memory": memory}
+
+    def trace_events(self, pid=None, origin_ns=None):
+        """
+        Events in Chrome trace format, timestamps in microseconds since the last reset.
+
+        Parameters:
+            origin_ns (int, optional): perf_counter_ns() value to measure timestamps from instead.
+                perf_counter is system-wide on Linux and macOS, so processes given the same origin
+                line up in one trace.
+        """
+        pid = os.getpid() if pid is None else pid
+        origin = self._origin if origin_ns is None else origin_ns
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+        for phase, name, start, duration, tid, args in events:
+            event = {"name": name, "ph": phase, "ts": (start - origin) / 1000, "pid": pid, "tid": tid}
+            if phase == "X":
+                event["dur"] = duration / 1000
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return trace
+
+    def save_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2, default=str)
+
+    def save_chrome_trace(self, path, extra_events=()):
+        """
+        Parameters:
+            extra_events (iterable): Trace events from other processes (e.g. batch_scan workers).
+        """
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events() + list(extra_events), "displayTimeUnit": "ms"},
+                      f, default=str)
+
+
+def _peak_rss():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024  # Linux reports KiB
+
+
+PROFILER = Profiler(enabled=os.environ.get("REGROUP_PROFILE", "") not in ("", "0"))
+
+
+def span(name, **args):
+    """PROFILER.span; a no-op context manager while profiling is disabled."""
+    return PROFILER.span(name, **args)
+
+
+def count(name, value=1):
+    PROFILER.count(name, value)
+
+
+def snapshot_memory(label):
+    return PROFILER.snapshot_memory(label)
+
+
+def profiled(name=None):
+    """
+    Decorator timing every call of a function as a span (named after its qualified name by default).
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER.span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,271 @@
+import cv2
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Union
+
+from core.profiling import span, count
+
+"""
+Multi-scale, tiled QR detection for high-resolution board photos.
+
+1. Locate candidate QR quads on a downscaled pyramid level (detection only, no decoding).
+2. Grow each candidate into a padded full-resolution crop (crops of neighbouring codes overlap).
+3. Decode the crops in parallel threads (OpenCV releases the GIL while detecting). When no
+   candidates are found, or search_full_frame is set, the whole frame is split into
+   overlapping tiles and decoded the same way.
+4. Merge duplicate detections from overlapping tiles by qr_id.
+"""
+
+
+@dataclass(frozen=True)
+class DetectionSettings:
+    """
+    Speed/recall trade-off knobs for detect_qr_codes.
+
+    Attributes:
+        pyramid_scale (float): Downscale factor of the candidate search level (1.0 disables the pyramid).
+        region_margin (float): Padding around each candidate, as a fraction of its QR side.
+        tile_size (int): Edge length in pixels of the full-frame tiles that get decoded.
+        tile_overlap (float): Minimum overlap between neighbouring full-frame tiles, as a fraction of tile_size.
+        max_workers (int): Decoder threads.
+        full_frame_fallback (bool): Decode the whole frame (tiled) when no candidates are found.
+        search_full_frame (bool): Always decode the whole frame (tiled), in addition to candidates.
+        eps (float): Passed to QRCodeDetector.setEpsX / setEpsY.
+    """
+    pyramid_scale: float = 0.5
+    region_margin: float = 0.5
+    tile_size: int = 1024
+    tile_overlap: float = 0.25
+    max_workers: int = 4
+    full_frame_fallback: bool = True
+    search_full_frame: bool = False
+    eps: float = 0.1
+
+
+DETECTION_PRESETS = {
+    "fast": DetectionSettings(pyramid_scale=0.25, region_margin=0.35, tile_size=1536, full_frame_fallback=False),
+    "balanced": DetectionSettings(),
+    "thorough": DetectionSettings(pyramid_scale=0.75, region_margin=0.75, tile_size=768, tile_overlap=0.35,
+                                  search_full_frame=True),
+}
+
+_local = threading.local()
+
+
+def get_detection_settings(settings: Union[str, DetectionSettings, None] = None, **overrides) -> DetectionSettings:
+    """
+    Resolves a preset name ("fast", "balanced", "thorough") or DetectionSettings, applying keyword overrides.
+    """
+    if settings is None:
+        settings = "balanced"
+    if isinstance(settings, str):
+        if settings not in DETECTION_PRESETS:
+            raise ValueError(f"Unknown detection preset '{settings}'. Choose from {sorted(DETECTION_PRESETS)}")
+        settings = DETECTION_PRESETS[settings]
+    return replace(settings, **overrides) if overrides else settings
+
+
+def _get_detector(eps):
+    """QRCodeDetector is not thread-safe, so each decoder thread keeps its own."""
+    detector = getattr(_local, "detector", None)
+    if detector is None or _local.eps != eps:
+        detector = cv2.QRCodeDetector()
+        detector.setEpsX(eps)
+        detector.setEpsY(eps)
+        _local.detector = detector
+        _local.eps = eps
+    return detector
+
+
+def _get_candidate_detector(eps):
+    """
+    The ArUco-based detector (OpenCV >= 4.8) localises small, downscaled codes far more
+    reliably than QRCodeDetector, so prefer it for the candidate search when available.
+    """
+    if not hasattr(cv2, "QRCodeDetectorAruco"):
+        return _get_detector(eps)
+    detector = getattr(_local, "candidate_detector", None)
+    if detector is None:
+        detector = cv2.QRCodeDetectorAruco()
+        _local.candidate_detector = detector
+    return detector
+
+
+def find_candidate_quads(gray, settings: DetectionSettings):
+    """
+    Finds QR quads on the downscaled pyramid level.
+
+    Returns:
+        np.ndarray: (N, 4, 2) corner array in full-resolution pixel coordinates.
+    """
+    scale = settings.pyramid_scale
+    level = gray if scale >= 1.0 else cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    ok, points = _get_candidate_detector(settings.eps).detectMulti(level)
+    if not ok or points is None:
+        return np.empty((0, 4, 2), dtype=np.float32)
+
+    return points.reshape(-1, 4, 2).astype(np.float32) / min(scale, 1.0)
+
+
+def candidate_regions(quads, image_shape, margin):
+    """
+    Grows each candidate quad by `margin` QR sides into a full-resolution crop box.
+
+    Boxes are deliberately not merged: on a dense board, padded boxes chain together into one
+    huge region, and multi-code decoding cost grows much faster than the crop area.
+
+    Returns:
+        list[tuple[int, int, int, int]]: (x0, y0, x1, y1) regions clipped to the image.
+    """
+    height, width = image_shape[:2]
+    regions = []
+    for quad in quads:
+        side = np.linalg.norm(quad - np.roll(quad, 1, axis=0), axis=1).mean()
+        pad = side * margin
+        x0, y0 = quad.min(axis=0) - pad
+        x1, y1 = quad.max(axis=0) + pad
+        regions.append((max(0, int(x0)), max(0, int(y0)), min(width, int(np.ceil(x1))), min(height, int(np.ceil(y1)))))
+    return regions
+
+
+def split_region(region, tile_size, overlap):
+    """
+    Splits a region into overlapping tiles no larger than tile_size.
+
+    Parameters:
+        overlap (int): Overlap in pixels; should be at least one QR side so every code lies fully inside a tile.
+
+    Returns:
+        list[tuple[int, int, int, int]]: (x0, y0, x1, y1) tiles.
+    """
+    x0, y0, x1, y1 = region
+    step = max(1, tile_size - overlap)
+
+    def spans(start, stop):
+        if stop - start <= tile_size:
+            return [(start, stop)]
+        positions = list(range(start, stop - tile_size, step)) + [stop - tile_size]
+        return [(p, p + tile_size) for p in positions]
+
+    return [(tx0, ty0, tx1, ty1) for ty0, ty1 in spans(y0, y1) for tx0, tx1 in spans(x0, x1)]
+
+
+def _offset_detections(decoded, points, x0, y0):
+    found = []
+    for data, corners in zip(decoded, points):
+        corners = np.squeeze(corners)
+        if data.strip() == "" or corners.shape != (4, 2):
+            continue
+        found.append((data, corners.astype(np.float32) + np.array([x0, y0], dtype=np.float32)))
+    return found
+
+
+def decode_tile(gray, tile, eps, single=False):
+    """
+    Decodes the QR codes inside one tile.
+
+    Parameters:
+        single (bool): Tile was cut around one candidate; try the much cheaper single-code
+            decoder first and only fall back to multi-code decoding if it fails.
+
+    Returns:
+        list[tuple[str, np.ndarray]]: (data, (4, 2) corners in full-image coordinates).
+    """
+    x0, y0, x1, y1 = tile
+    crop = gray[y0:y1, x0:x1]
+    detector = _get_detector(eps)
+
+    if single:
+        with span("detectAndDecode"):
+            data, points, _ = detector.detectAndDecode(crop)
+        if data and points is not None:
+            return _offset_detections([data], points.reshape(-1, 4, 2), x0, y0)
+        count("single_decode_fallbacks")
+
+    with span("detectAndDecodeMulti", width=x1 - x0, height=y1 - y0):
+        ok, decoded, points, _ = detector.detectAndDecodeMulti(crop)
+    if not ok or points is None:
+        return []
+    return _offset_detections(decoded, points, x0, y0)
+
+
+def quad_area(corners):
+    x, y = corners[:, 0], corners[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+
+def merge_quads(quads, extra):
+    """
+    Adds the extra candidate quads whose centre is not already within half a QR side of a candidate.
+    """
+    if not len(quads) or not len(extra):
+        return np.concatenate([quads, extra]).reshape(-1, 4, 2)
+    centers, extra_centers = quads.mean(axis=1), extra.mean(axis=1)
+    sides = np.linalg.norm(extra - np.roll(extra, 1, axis=1), axis=2).mean(axis=1)
+    distances = np.linalg.norm(extra_centers[:, None] - centers[None], axis=2).min(axis=1)
+    return np.concatenate([quads, extra[distances > 0.5 * sides]])
+
+
+def merge_detections(detections):
+    """
+    Merges duplicate detections (from overlapping tiles) by qr_id, keeping the largest quad,
+    which is the one least likely to have been clipped by a tile edge.
+    """
+    best = {}
+    for data, corners in detections:
+        if data not in best or quad_area(corners) > quad_area(best[data]):
+            best[data] = corners
+    return list(best.items())
+
+
+def detect_qr_codes(gray, settings: Union[str, DetectionSettings, None] = None, quads=None):
+    """
+    Detects and decodes every QR code in a grayscale image using the multi-scale tiled pipeline.
+
+    Parameters:
+        gray (np.ndarray): Single-channel image.
+        settings (str | DetectionSettings, optional): Preset name or settings. Defaults to "balanced".
+        quads (np.ndarray, optional): (N, 4, 2) candidate quads already known for this image
+            (e.g. carried through rectification), searched in addition to the pyramid candidates.
+
+    Returns:
+        list[tuple[str, np.ndarray]]: (qr_id, (4, 2) float32 corners), one entry per unique qr_id.
+    """
+    settings = get_detection_settings(settings)
+    height, width = gray.shape[:2]
+
+    with span("find_candidate_quads"):
+        found = find_candidate_quads(gray, settings)
+    quads = found if quads is None else merge_quads(found, np.asarray(quads, dtype=np.float32).reshape(-1, 4, 2))
+
+    # Tiles must overlap by at least one (padded) QR side so no code is cut in every tile
+    if len(quads):
+        qr_side = np.linalg.norm(quads - np.roll(quads, 1, axis=1), axis=2).mean(axis=1).max()
+    else:
+        qr_side = 0
+    overlap = int(max(settings.tile_overlap * settings.tile_size, qr_side * (1 + 2 * settings.region_margin)))
+    tile_size = max(settings.tile_size, overlap * 2)
+
+    # (tile, single) pairs: one crop per candidate, plus overlapping tiles over the whole frame if asked
+    tiles = [(region, True) for region in candidate_regions(quads, gray.shape, settings.region_margin)]
+    if settings.search_full_frame or (not tiles and settings.full_frame_fallback):
+        tiles += [(tile, False) for tile in split_region((0, 0, width, height), tile_size, overlap)]
+    if not tiles:
+        return []
+    count("qr_candidates", len(quads))
+    count("decode_tiles", len(tiles))
+
+    def decode(task):
+        tile, single = task
+        return decode_tile(gray, tile, settings.eps, single=single)
+
+    if len(tiles) == 1 or settings.max_workers <= 1:
+        results = [decode(task) for task in tiles]
+    else:
+        with ThreadPoolExecutor(max_workers=min(settings.max_workers, len(tiles))) as pool:
+            results = list(pool.map(decode, tiles))
+
+    return merge_detections(d for found in results for d in found)
@@ -0,0 +1,294 @@
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+
+from core.geometry import QR_TO_HEX_WIDTH
+from core.qr_detection import find_candidate_quads, get_detection_settings
+
+"""
+Perspective rectification of board photos.
+
+The QR-to-hex ratios (geometry.QR_TO_HEX_CENTER / QR_TO_HEX_WIDTH) only hold in a top-down view.
+For oblique shots a homography for the board plane is estimated and the photo is warped once to
+a fronto-parallel canonical image; detection and geometry then run on that image.
+
+The homography comes either from board fiducials (known board-plane positions of some image
+points) or from the QR quads themselves: every QR is a square of the same size on the board, so
+H is refined until every warped quad is as close as possible to a square of the common side.
+"""
+
+
+@dataclass
+class Rectification:
+    """
+    Attributes:
+        image (np.ndarray): Warped, fronto-parallel image.
+        homography (np.ndarray): 3x3 matrix mapping original image pixels to rectified pixels.
+        source (str): "qr", "fiducials" or "identity" (too few codes to estimate a homography).
+        qr_size (float): Median QR side in rectified pixels.
+        residual (float): RMS distance of warped QR corners from their ideal squares, in rectified pixels.
+        quads (np.ndarray): (N, 4, 2) candidate QR quads mapped into the rectified image, ready to
+            pass to detect_qr_codes so the candidate search does not run twice.
+    """
+    image: np.ndarray
+    homography: np.ndarray
+    source: str
+    quads: np.ndarray = field(default_factory=lambda: np.empty((0, 4, 2), dtype=np.float32))
+    qr_size: float = 0.0
+    residual: float = 0.0
+
+    def to_rectified(self, points) -> np.ndarray:
+        """Maps (N, 2) original image points into the rectified image."""
+        return transform_points(self.homography, points)
+
+    def to_original(self, points) -> np.ndarray:
+        """Maps (N, 2) rectified points back to the original image."""
+        return transform_points(np.linalg.inv(self.homography), points)
+
+
+def transform_points(homography, points) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 1, 2)
+    if not len(points):
+        return np.empty((0, 2))
+    return cv2.perspectiveTransform(points, homography).reshape(-1, 2)
+
+
+def fit_squares(quads, side):
+    """
+    Closest square of the given side to each quad (rotation and translation only).
+
+    Parameters:
+        quads: (N, 4, 2) corners, in detector order (either winding).
+
+    Returns:
+        np.ndarray: (N, 4, 2) ideal square corners, in the same order.
+    """
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    centers = quads.mean(axis=1, keepdims=True)
+    centered = quads - centers
+
+    # Match each quad's winding, so a square is only ever rotated onto it, never mirrored
+    x, y = centered[..., 0], centered[..., 1]
+    winding = np.sign((x * np.roll(y, -1, axis=1) - y * np.roll(x, -1, axis=1)).sum(axis=1))
+    unit = side * np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+    unit = np.where(winding[:, None, None] < 0, unit * [1, -1], unit)
+
+    # 2D Procrustes: the best rotation angle from the summed cross and dot products
+    cross = (unit[..., 0] * centered[..., 1] - unit[..., 1] * centered[..., 0]).sum(axis=1)
+    dot = (unit[..., 0] * centered[..., 0] + unit[..., 1] * centered[..., 1]).sum(axis=1)
+    angles = np.arctan2(cross, dot)
+    cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    rotated = np.stack([cos * unit[..., 0] - sin * unit[..., 1], sin * unit[..., 0] + cos * unit[..., 1]], axis=2)
+    return rotated + centers
+
+
+def quad_sides(quads) -> np.ndarray:
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    return np.linalg.norm(quads - np.roll(quads, 1, axis=1), axis=2).mean(axis=1)
+
+
+def square_residual(homography, quads):
+    """
+    Returns:
+        tuple[float, float]: median QR side after warping, and RMS distance of the warped corners
+            from squares of that side.
+    """
+    warped = transform_points(homography, np.asarray(quads).reshape(-1, 2)).reshape(-1, 4, 2)
+    side = float(np.median(quad_sides(warped)))
+    residual = float(np.sqrt(np.mean(np.sum((warped - fit_squares(warped, side)) ** 2, axis=2))))
+    return side, residual
+
+
+def metric_correction(quads):
+    """
+    Affine correction that turns parallelograms back into squares, in closed form: the metric M
+    (K^T K) that makes both edge vectors of every quad orthogonal and of equal length.
+
+    Returns:
+        np.ndarray: 2x2 matrix K (identity if the quads give no usable constraint).
+    """
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+    u = 0.5 * ((quads[:, 1] - quads[:, 0]) + (quads[:, 2] - quads[:, 3]))
+    v = 0.5 * ((quads[:, 3] - quads[:, 0]) + (quads[:, 2] - quads[:, 1]))
+    rows = np.concatenate([
+        np.stack([u[:, 0] * v[:, 0], u[:, 0] * v[:, 1] + u[:, 1] * v[:, 0], u[:, 1] * v[:, 1]], axis=1),
+        np.stack([u[:, 0] ** 2 - v[:, 0] ** 2, 2 * (u[:, 0] * u[:, 1] - v[:, 0] * v[:, 1]), u[:, 1] ** 2 - v[:, 1] ** 2], axis=1),
+    ])
+    a, b, c = np.linalg.svd(rows)[2][-1]
+    if a < 0:
+        a, b, c = -a, -b, -c
+    metric = np.array([[a, b], [b, c]])
+    if a <= 0 or np.linalg.det(metric) <= 0:
+        return np.eye(2)
+    return np.linalg.cholesky(metric / np.sqrt(np.linalg.det(metric))).T
+
+
+def _rectify_points(params, points, quad_count):
+    """Applies the projective part (vanishing line params), then the closed-form metric correction."""
+    h1, h2 = params
+    projective = np.array([[1, 0, 0], [0, 1, 0], [h1, h2, 1]])
+    warped = transform_points(projective, points).reshape(quad_count, 4, 2)
+    correction = metric_correction(warped)
+    return projective, correction, warped @ correction.T
+
+
+def _squareness(params, points, quad_count):
+    *_, rectified = _rectify_points(params, points, quad_count)
+    side = float(np.median(quad_sides(rectified)))
+    return ((rectified - fit_squares(rectified, side)) / side).ravel()
+
+
+def _solve_vanishing_line(points, quad_count, iterations=30):
+    """Levenberg-Marquardt over the two projective parameters, with a numerical Jacobian."""
+    params = np.zeros(2)
+    residual = _squareness(params, points, quad_count)
+    cost = residual @ residual
+    damping = 1e-3
+    step_size = 1e-6
+    for _ in range(iterations):
+        jacobian = np.stack([(_squareness(params + step_size * e, points, quad_count) - residual) / step_size
+                             for e in np.eye(2)], axis=1)
+        normal = jacobian.T @ jacobian
+        gradient = jacobian.T @ residual
+        step = np.linalg.solve(normal + damping * np.diag(np.diag(normal) + 1e-12), -gradient)
+        candidate = params + step
+        candidate_residual = _squareness(candidate, points, quad_count)
+        candidate_cost = candidate_residual @ candidate_residual
+        if candidate_cost < cost:
+            params, residual, cost = candidate, candidate_residual, candidate_cost
+            damping /= 3
+            if np.abs(step).max() < 1e-9:
+                break
+        else:
+            damping *= 3
+    return params, residual.reshape(quad_count, 4, 2)
+
+
+def homography_from_quads(quads, outlier_factor=3.0):
+    """
+    Estimates the board-plane homography from detected QR quads.
+
+    Every code is a square on the board, so the homography is solved in two strata: the
+    vanishing line (two projective parameters, by least squares on squareness), then the affine
+    metric correction in closed form. Quads that stay far from square (false candidates, badly
+    localised corners) are dropped and the fit is repeated once.
+
+    Returns:
+        tuple[np.ndarray, float, float]: homography, QR side and RMS residual, all in the
+            (unscaled, untranslated) rectified frame.
+    """
+    quads = np.asarray(quads, dtype=np.float64).reshape(-1, 4, 2)
+
+    # Normalise so the projective parameters are well conditioned
+    center = quads.reshape(-1, 2).mean(axis=0)
+    scale = 1.0 / max(float(np.abs(quads.reshape(-1, 2) - center).mean()), 1e-9)
+    normalize = np.array([[scale, 0, -scale * center[0]], [0, scale, -scale * center[1]], [0, 0, 1]])
+    points = transform_points(normalize, quads.reshape(-1, 2))
+
+    keep = np.ones(len(quads), dtype=bool)
+    for _ in range(2):
+        used = points.reshape(-1, 4, 2)[keep].reshape(-1, 2)
+        params, residual = _solve_vanishing_line(used, int(keep.sum()))
+        quad_error = np.sqrt((residual ** 2).sum(axis=2).mean(axis=1))
+        inliers = quad_error <= outlier_factor * max(float(np.median(quad_error)), 1e-3)
+        if inliers.all() or inliers.sum() < 2:
+            break
+        keep[np.flatnonzero(keep)[~inliers]] = False
+
+    projective, correction, _ = _rectify_points(params, used, int(keep.sum()))
+    affine = np.eye(3)
+    affine[:2, :2] = correction
+    homography = affine @ projective @ normalize
+    homography /= homography[2, 2]
+
+    side, residual = square_residual(homography, quads[keep])
+    return homography, side, residual
+
+
+def canonical_homography(homography, image_shape, qr_size, target_qr_size, region=None, margin=0.0, max_side=8192):
+    """
+    Scales, rotates and translates a rectifying homography so the output has the target QR size,
+    keeps the photo's "up" direction at the centre of the region, and just covers the region.
+
+    Parameters:
+        region: (N, 2) original image points that must stay in view (defaults to the image corners).
+        margin (float): Extra border around the region, in target pixels.
+
+    Returns:
+        tuple[np.ndarray, tuple[int, int]]: final homography and (width, height) of the output image.
+    """
+    height, width = image_shape[:2]
+    if region is None:
+        region = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float64)
+
+    # The QR fit leaves the in-plane rotation arbitrary (it follows the reference code)
+    center = region.mean(axis=0)
+    up = np.diff(transform_points(homography, [center, center - (0, 1)]), axis=0)[0]
+    angle = np.arctan2(-up[0], -up[1])
+    scale = target_qr_size / qr_size
+    cos, sin = scale * np.cos(angle), scale * np.sin(angle)
+    scaled = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]]) @ homography
+    warped = transform_points(scaled, region)
+    x0, y0 = warped.min(axis=0) - margin
+    x1, y1 = warped.max(axis=0) + margin
+
+    # Never produce an output larger than max_side, whatever the target size asked for
+    shrink = min(1.0, max_side / max(x1 - x0, y1 - y0, 1))
+    final = np.diag([shrink, shrink, 1.0]) @ np.array([[1, 0, -x0], [0, 1, -y0], [0, 0, 1]]) @ scaled
+    size = (int(np.ceil((x1 - x0) * shrink)), int(np.ceil((y1 - y0) * shrink)))
+    return final, size
+
+
+def warp_image(img, homography, size):
+    """Warps a photo into the rectified frame; the border is white like the board background."""
+    return cv2.warpPerspective(img, homography, tuple(size), flags=cv2.INTER_LINEAR,
+                               borderMode=cv2.BORDER_CONSTANT, borderValue=(255, 255, 255))
+
+
+def rectify_board(img, detection=None, target_qr_size=None, fiducials=None, min_codes=2, margin=1.5):
+    """
+    Warps a board photo to a fronto-parallel view.
+
+    Parameters:
+        img (np.ndarray): BGR or grayscale photo.
+        detection (str | DetectionSettings, optional): Settings for the candidate quad search.
+        target_qr_size (float, optional): QR side in the output, in pixels. Defaults to the largest
+            QR side in the photo, so the closest codes keep their resolution.
+        fiducials (tuple, optional): (image_points, board_points), each (N >= 4, 2), with board_points in
+            any board unit; used instead of the QR quads. The output is still scaled by QR size when
+            codes are found, otherwise target_qr_size is taken as pixels per board unit.
+        min_codes (int): Codes needed to estimate the homography from QR quads.
+        margin (float): Border kept around the outermost codes, in hex widths (so whole tiles stay in view).
+
+    Returns:
+        Rectification: The warped image and homography, or the unchanged image with source
+            "identity" when there is too little to go on.
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    quads = find_candidate_quads(gray, get_detection_settings(detection))
+
+    if fiducials is not None:
+        image_points, board_points = (np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in fiducials)
+        homography, _ = cv2.findHomography(image_points, board_points, 0)
+        if homography is None:
+            raise ValueError("Could not fit a homography to the fiducials")
+        source = "fiducials"
+        # Without codes the output scale is target_qr_size pixels per board unit
+        qr_size = square_residual(homography, quads)[0] if len(quads) else 1.0
+    elif len(quads) >= min_codes:
+        homography, qr_size, _ = homography_from_quads(quads)
+        source = "qr"
+    else:
+        return Rectification(image=img, homography=np.eye(3), source="identity", quads=quads)
+
+    target = target_qr_size or (float(quad_sides(quads).max()) if len(quads) else 1.0)
+    region = quads.reshape(-1, 2) if len(quads) else None
+    final, size = canonical_homography(homography, gray.shape, qr_size, target, region=region,
+                                       margin=margin * QR_TO_HEX_WIDTH * target if len(quads) else 0.0)
+
+    warped = warp_image(img, final, size)
+    rectification = Rectification(image=warped, homography=final, source=source)
+    if len(quads):
+        rectification.quads = transform_points(final, quads.reshape(-1, 2)).reshape(-1, 4, 2).astype(np.float32)
+        rectification.qr_size, rectification.residual = square_residual(final, quads)
+    return rectification
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from dataclasses import asdict
+
+"""
+Persistent on-disk cache of scan results.
+
+Entries are keyed by a hash of the image pixels plus everything that changes what the detector
+returns (detection settings including eps but not the thread count, rectification, and CACHE_VERSION). Each entry is
+one small JSON file holding the detected codes (qr_id, og_corners, rotation, centroid), the
+hex_width and, for rectified scans, the homography needed to rebuild the warped image.
+Tile metadata is not cached, so edited definitions or attributes apply on a cache hit.
+
+Entries are evicted least-recently-used (file mtime, refreshed on every hit) once the cache
+exceeds max_entries or max_bytes. Writes are atomic, so batch worker processes can share a cache.
+"""
+
+# Bump when scan_image's output for the same inputs changes (e.g. new geometry constants)
+CACHE_VERSION = 2
+
+# Detection settings that only change how fast a scan runs, not what it finds
+UNHASHED_SETTINGS = ("max_workers",)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "regroup", "scans")
+
+
+def image_digest(img) -> str:
+    """Hash of the decoded pixels, shape and dtype (the same photo re-encoded still hits)."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{img.shape}|{img.dtype}".encode())
+    digest.update(memoryview(img if img.flags.c_contiguous else img.copy()).cast("B"))
+    return digest.hexdigest()
+
+
+class ScanCache:
+    """
+    Parameters:
+        cache_dir (str): Directory for the entries; created on first write.
+        max_entries (int): Most entries kept.
+        max_bytes (int): Most bytes kept across all entries.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, img, settings, rectify=False) -> str:
+        """
+        Parameters:
+            img (np.ndarray): Photo as passed to scan_image.
+            settings (DetectionSettings): Resolved detection settings.
+            rectify (bool): Whether the scan is rectified.
+        """
+        detection = {k: v for k, v in asdict(settings).items() if k not in UNHASHED_SETTINGS}
+        params = json.dumps({"version": CACHE_VERSION, "detection": detection, "rectify": bool(rectify)},
+                            sort_keys=True)
+        return hashlib.blake2b(f"{image_digest(img)}|{params}".encode(), digest_size=20).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Returns:
+            dict | None: The cached scan record, or None on a miss (or unreadable entry).
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, key, record):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def entries(self):
+        """
+        Returns:
+            list[tuple[float, int, str]]: (last used, size in bytes, path), oldest first.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # evicted by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "oldest": time.ctime(entries[0][0]) if entries else None,
+        }
@@ -0,0 +1,335 @@
+import cv2
+import queue
+import threading
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from core.geometry import regulate_tiles, square_sides, QR_TO_HEX_WIDTH
+from core.qr_detection import detect_qr_codes, decode_tile, get_detection_settings
+from core.tile_model import Tile, create_tile
+
+"""
+Continuous scanning from a camera, a recorded video file or any iterable of frames.
+
+A producer thread pulls frames into a bounded queue; detection runs on a worker pool.
+Each qr_id is tracked across frames and only regions whose pixels changed since the code was
+last decoded there are re-decoded. A full multi-code scan runs every `full_scan_interval`
+frames to pick up new tiles, and immediately after a tracked code fails to re-decode.
+Tiles are reported once they have been seen at the same place for `stable_frames` frames.
+"""
+
+_END_OF_STREAM = object()
+
+
+@dataclass
+class TileUpdate:
+    """
+    A stable change to a tracked tile.
+
+    Attributes:
+        kind (str): "added", "moved" or "removed".
+        tile (Tile): Tile built from the tracked corners (last known position for "removed").
+        frame_index (int): Frame on which the change became stable.
+    """
+    kind: str
+    tile: Tile
+    frame_index: int
+
+
+@dataclass
+class TrackedCode:
+    qr_id: str
+    corners: np.ndarray
+    last_seen: int
+    hits: int = 1
+    box: Optional[tuple] = None
+    reference: Optional[np.ndarray] = field(default=None, repr=False)
+    emitted_corners: Optional[np.ndarray] = None
+    tile: Optional[Tile] = field(default=None, repr=False)
+
+
+def iter_frames(source, api_preference=cv2.CAP_ANY):
+    """
+    Yields BGR frames from a camera index, a video file path, an opened cv2.VideoCapture
+    or any iterable of frames (e.g. a synthetic generator in tests).
+    """
+    if isinstance(source, (int, str)):
+        cap = cv2.VideoCapture(source, api_preference)
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open frame source: {source}")
+        try:
+            yield from _read_capture(cap)
+        finally:
+            cap.release()
+    elif hasattr(source, "read"):
+        yield from _read_capture(source)
+    else:
+        yield from source
+
+
+def _read_capture(cap):
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            return
+        yield frame
+
+
+def max_corner_shift(a, b):
+    return float(np.max(np.linalg.norm(a - b, axis=1)))
+
+
+def padded_box(corners, margin, shape):
+    height, width = shape[:2]
+    side = np.linalg.norm(corners - np.roll(corners, 1, axis=0), axis=1).mean()
+    x0, y0 = corners.min(axis=0) - side * margin
+    x1, y1 = corners.max(axis=0) + side * margin
+    return max(0, int(x0)), max(0, int(y0)), min(width, int(np.ceil(x1))), min(height, int(np.ceil(y1)))
+
+
+class StreamScanner:
+    """
+    Streams stable Tile updates from a video source.
+
+    Use either as an iterator (`for update in scanner: ...`) or with a callback via `run()`.
+
+    Parameters:
+        source: Camera index, video path, cv2.VideoCapture or iterable of BGR frames.
+        tile_metadata (dict, optional): Mapping of QR IDs to metadata, as for scan_image.
+        detection (str | DetectionSettings): Preset used for full scans. Defaults to "balanced".
+        max_workers (int): Frames processed concurrently.
+        queue_size (int): Frames buffered between producer and workers.
+        drop_frames (bool, optional): Drop the oldest buffered frame when the queue is full rather than
+            blocking the producer. Defaults to True for cameras and False for files and iterables.
+        move_threshold (float): Corner displacement in pixels that counts as a move.
+        diff_threshold (float): Mean absolute grey-level change that triggers re-decoding a region.
+        stable_frames (int): Consecutive consistent sightings before a tile is reported.
+        lost_frames (int): Frames without a sighting before a tile is reported removed.
+        full_scan_interval (int): Run a full multi-code scan every N frames.
+        on_update (callable, optional): Called with each TileUpdate by `run()`.
+    """
+
+    def __init__(self, source, tile_metadata=None, detection="balanced", max_workers=2, queue_size=4,
+                 drop_frames=None, move_threshold=4.0, diff_threshold=6.0, stable_frames=3,
+                 lost_frames=15, full_scan_interval=15, region_margin=0.5,
+                 on_update: Optional[Callable[[TileUpdate], None]] = None):
+        self.source = source
+        self.tile_metadata = tile_metadata or {}
+        self.detection = get_detection_settings(detection)
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.drop_frames = isinstance(source, int) if drop_frames is None else drop_frames
+        self.move_threshold = move_threshold
+        self.diff_threshold = diff_threshold
+        self.stable_frames = stable_frames
+        self.lost_frames = lost_frames
+        self.full_scan_interval = full_scan_interval
+        self.region_margin = region_margin
+        self.on_update = on_update
+
+        self.tracks: dict[str, TrackedCode] = {}
+        self._rescan_requested = False
+        self._stop = threading.Event()
+        self._frames = queue.Queue(maxsize=queue_size)
+        self._producer = None
+
+    # ----- Producer -----
+
+    def _produce(self):
+        try:
+            for index, frame in enumerate(iter_frames(self.source)):
+                if self._stop.is_set():
+                    break
+                self._put((index, frame))
+        except Exception as e:
+            self._put(e)
+        finally:
+            self._put(_END_OF_STREAM, force=True)
+
+    def _put(self, item, force=False):
+        while not self._stop.is_set() or force:
+            if self.drop_frames and not force:
+                try:
+                    self._frames.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        self._frames.get_nowait()  # drop the stalest frame
+                    except queue.Empty:
+                        pass
+                    continue
+            try:
+                self._frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if force and self._stop.is_set():
+                    return
+
+    # ----- Detection (worker threads) -----
+
+    def _detect(self, gray, regions, full_scan):
+        """
+        Parameters:
+            regions (dict): qr_id → (box, reference patch) for the tracked codes.
+
+        Returns:
+            tuple[list[tuple[str, np.ndarray]], list[str], list[str]]: fresh (qr_id, corners)
+            observations, IDs whose region is unchanged, and IDs that changed but did not re-decode.
+        """
+        if full_scan:
+            return detect_qr_codes(gray, self.detection), [], []
+
+        observations, unchanged, lost = [], [], []
+        for qr_id, (box, reference) in regions.items():
+            x0, y0, x1, y1 = box
+            patch = gray[y0:y1, x0:x1]
+            if reference is not None and reference.shape == patch.shape and patch.size:
+                if float(cv2.absdiff(patch, reference).mean()) < self.diff_threshold:
+                    unchanged.append(qr_id)
+                    continue
+            found = [d for d in decode_tile(gray, box, self.detection.eps, single=True) if d[0] == qr_id]
+            if found:
+                observations.extend(found)
+            else:
+                lost.append(qr_id)
+        return observations, unchanged, lost
+
+    # ----- Tracking (consumer thread) -----
+
+    def _build_tile(self, track):
+        rot_degs, hex_centers, _ = regulate_tiles(track.corners)
+        attributes = dict(self.tile_metadata.get(track.qr_id, {}))
+        tile = create_tile(qr_id=track.qr_id, centroid=tuple(float(x) for x in hex_centers[0]), attributes=attributes)
+        tile.attributes["rotation"] = int(rot_degs[0])
+        tile.attributes["og_corners"] = track.corners.tolist()
+        return tile
+
+    def _update_tracks(self, frame_index, gray, observations, unchanged):
+        updates = []
+
+        for qr_id in unchanged:
+            track = self.tracks.get(qr_id)
+            if track:
+                track.last_seen = frame_index
+                track.hits += 1
+
+        for qr_id, corners in observations:
+            track = self.tracks.get(qr_id)
+            if track is None:
+                track = self.tracks[qr_id] = TrackedCode(qr_id=qr_id, corners=corners, last_seen=frame_index)
+            elif max_corner_shift(track.corners, corners) > self.move_threshold:
+                track.corners = corners
+                track.hits = 1  # still moving, wait until it settles
+            else:
+                track.corners = 0.5 * (track.corners + corners)
+                track.hits += 1
+            track.last_seen = frame_index
+
+            # Region and pixels to compare later frames against
+            track.box = padded_box(track.corners, self.region_margin, gray.shape)
+            x0, y0, x1, y1 = track.box
+            track.reference = gray[y0:y1, x0:x1].copy()
+
+        for qr_id, track in list(self.tracks.items()):
+            if frame_index - track.last_seen > self.lost_frames:
+                del self.tracks[qr_id]
+                if track.emitted_corners is not None:
+                    updates.append(TileUpdate("removed", track.tile, frame_index))
+                continue
+
+            if track.hits < self.stable_frames:
+                continue
+            if track.emitted_corners is None:
+                kind = "added"
+            elif max_corner_shift(track.emitted_corners, track.corners) > self.move_threshold:
+                kind = "moved"
+            else:
+                continue
+            track.emitted_corners = track.corners.copy()
+            track.tile = self._build_tile(track)
+            updates.append(TileUpdate(kind, track.tile, frame_index))
+
+        return updates
+
+    # ----- Public API -----
+
+    def __iter__(self):
+        return self.updates()
+
+    def updates(self):
+        """
+        Generator of TileUpdate objects; runs until the source is exhausted or stop() is called.
+        """
+        self._stop.clear()
+        self._producer = threading.Thread(target=self._produce, name="StreamScannerProducer", daemon=True)
+        self._producer.start()
+
+        in_flight = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while True:
+                    item = self._frames.get()
+                    if item is _END_OF_STREAM:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+
+                    frame_index, frame = item
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+                    full_scan = (not self.tracks or self._rescan_requested
+                                 or frame_index % self.full_scan_interval == 0)
+                    self._rescan_requested = False
+                    regions = {qr_id: (t.box, t.reference) for qr_id, t in self.tracks.items()}
+                    future = pool.submit(self._detect, gray, regions, full_scan)
+                    in_flight.append((frame_index, gray, future))
+
+                    while len(in_flight) >= self.max_workers:
+                        yield from self._collect(*in_flight.popleft())
+
+                    if self._stop.is_set():
+                        break
+
+                while in_flight:
+                    yield from self._collect(*in_flight.popleft())
+        finally:
+            self.stop()
+
+    def _collect(self, frame_index, gray, future):
+        observations, unchanged, lost = future.result()
+        if lost:
+            self._rescan_requested = True  # moved or covered: look for it everywhere
+        yield from self._update_tracks(frame_index, gray, observations, unchanged)
+
+    def run(self):
+        """
+        Blocks until the source is exhausted or stop() is called, passing each update to on_update.
+        """
+        for update in self.updates():
+            if self.on_update:
+                self.on_update(update)
+
+    def stop(self):
+        self._stop.set()
+        if self._producer and self._producer.is_alive() and self._producer is not threading.current_thread():
+            # Unblock a producer waiting on a full queue
+            try:
+                while True:
+                    self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            self._producer.join(timeout=1.0)
+
+    def current_tiles(self):
+        """
+        Returns:
+            tuple[list[Tile], float]: The stable tiles and a hex_width estimate, ready for BoardModel.
+        """
+        tiles = [t.tile for t in self.tracks.values() if t.tile is not None]
+        if not tiles:
+            return [], 0
+        qr_sizes = square_sides([t.attributes["og_corners"] for t in tiles])
+        # same QR-to-hex ratio as scan_image
+        return tiles, float(np.median(qr_sizes)) * QR_TO_HEX_WIDTH
@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Tuple, Set, Dict, Any, Optional, Union
+from typing import Tuple, Set, Dict, Any, List, Optional, Union
+
+# Attributes written by the scanner or the tile definitions rather than by the user
+SYSTEM_ATTRIBUTE_KEYS = frozenset({"icon", "tile_type", "rotation", "og_corners", "qr_corners", "centroid"})
 
 
 @dataclass
@@ -60,9 +63,11 @@ class AnchorTile(Tile):
 @dataclass
 class ObjectTile(Tile):
     """
-    Represents a user-assignable object tile that belongs to an anchor.
+    Represents a user-assignable object tile that belongs to one or more anchors.
+    assigned_to is None, an anchor ID, or a list of anchor IDs (closest first) for tiles in
+    overlapping zones.
     """
-    assigned_to: Optional[str] = None
+    assigned_to: Optional[Union[str, List[str]]] = None
     
     def __repr__(self):
         anchor_id = self.assigned_to.qr_id if hasattr(self.assigned_to, 'qr_id') else self.assigned_to
@@ -86,5 +91,22 @@ def create_tile(qr_id: str, centroid: Tuple[float, float], attributes: Dict[str,
         return AnchorTile(qr_id=qr_id, centroid=centroid, attributes=attributes)
     else:
         return ObjectTile(qr_id=qr_id, centroid=centroid, attributes=attributes)
-    
 
+
+def is_tagged(attributes: Dict[str, Any]) -> bool:
+    """True if a tile has any user-defined attribute (nickname, colour, tags)."""
+    return any(key not in SYSTEM_ATTRIBUTE_KEYS and value not in ("", None, "None")
+               for key, value in attributes.items())
+
+
+def assigned_anchor_ids(tile) -> Tuple[str, ...]:
+    """
+    Anchor IDs an object tile is assigned to. assigned_to may hold None, a single anchor ID
+    or a list of IDs (a tile in overlapping zones).
+    """
+    assigned = getattr(tile, "assigned_to", None)
+    if assigned is None:
+        return ()
+    if isinstance(assigned, str):
+        return (assigned,)
+    return tuple(assigned)
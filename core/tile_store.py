@@ -0,0 +1,438 @@
+import numpy as np
+from collections.abc import MutableMapping, MutableSet
+
+from core.tile_model import Tile, AnchorTile, ObjectTile
+
+"""
+Columnar tile storage for very large boards.
+
+TileStore keeps one row per tile in NumPy arrays (centroids, axial coordinates, rotations,
+QR corners, zone assignment) instead of one dataclass, one attributes dict and nested corner
+lists per tile. Metadata dicts are shared with tile_metadata rather than copied, as scan_image does.
+
+Tile objects are created lazily: store.tile(qr_id) returns a TileView subclass of AnchorTile /
+ObjectTile whose fields read and write the store's columns, so BoardModel, the scanner and the
+GUI can use them wherever a Tile is expected. Views are cached per row and cheap to hold.
+"""
+
+KIND_OBJECT = 0
+KIND_ANCHOR = 1
+
+# Attributes held in columns rather than in the per-tile metadata dict
+COLUMN_ATTRIBUTES = ("rotation", "og_corners")
+
+
+class TileAttributes(MutableMapping):
+    """
+    A tile's attributes: rotation and og_corners come from the store columns, everything else
+    from the (shared) metadata dict.
+    """
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        store, row = self.store, self.row
+        if key == "rotation" and store.has_rotation[row]:
+            return int(store.rotations[row])
+        if key == "og_corners" and store.has_corners[row]:
+            return store.corners[row].tolist()
+        if key in COLUMN_ATTRIBUTES or store.metadata[row] is None:
+            raise KeyError(key)
+        return store.metadata[row][key]
+
+    def __setitem__(self, key, value):
+        store, row = self.store, self.row
+        if key == "rotation":
+            store.rotations[row] = value
+            store.has_rotation[row] = True
+        elif key == "og_corners":
+            store.corners[row] = np.asarray(value, dtype=np.float32).reshape(4, 2)
+            store.has_corners[row] = True
+        else:
+            if store.metadata[row] is None:
+                store.metadata[row] = {}
+            store.metadata[row][key] = value
+
+    def __delitem__(self, key):
+        store, row = self.store, self.row
+        if key == "rotation" and store.has_rotation[row]:
+            store.has_rotation[row] = False
+        elif key == "og_corners" and store.has_corners[row]:
+            store.has_corners[row] = False
+        elif store.metadata[row] is not None:
+            del store.metadata[row][key]
+        else:
+            raise KeyError(key)
+
+    def _column_keys(self):
+        keys = []
+        if self.store.has_rotation[self.row]:
+            keys.append("rotation")
+        if self.store.has_corners[self.row]:
+            keys.append("og_corners")
+        return keys
+
+    def __iter__(self):
+        metadata = self.store.metadata[self.row] or {}
+        yield from (key for key in metadata if key not in COLUMN_ATTRIBUTES)
+        yield from self._column_keys()
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ZoneChildren(MutableSet):
+    """
+    An anchor's children: the object rows whose zone column points at the anchor's row, plus
+    rows that list it as a further zone in shared_zones.
+    """
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __contains__(self, qr_id):
+        child = self.store.row_of.get(qr_id)
+        return child is not None and self.row in self.store.zone_rows(child)
+
+    def _rows(self):
+        store = self.store
+        rows = np.flatnonzero((store.zones[:store.size] == self.row) & store.alive[:store.size]).tolist()
+        rows += [child for child, zones in store.shared_zones.items() if self.row in zones[1:] and store.alive[child]]
+        return rows
+
+    def __iter__(self):
+        return iter([self.store.ids[row] for row in self._rows()])
+
+    def __len__(self):
+        return len(self._rows())
+
+    def add(self, qr_id):
+        child = self.store.row_of.get(qr_id)
+        if child is not None:
+            zones = self.store.zone_rows(child)
+            if self.row not in zones:
+                self.store.set_zone_rows(child, zones + [self.row])
+
+    def discard(self, qr_id):
+        child = self.store.row_of.get(qr_id)
+        if child is not None:
+            zones = self.store.zone_rows(child)
+            if self.row in zones:
+                self.store.set_zone_rows(child, [zone for zone in zones if zone != self.row])
+
+    def __repr__(self):
+        return repr(set(self))
+
+
+class TileView:
+    """
+    Mixin turning the Tile dataclass fields into properties over a TileStore row.
+    Views are created with TileStore.tile(), never with the dataclass constructor.
+    """
+
+    @property
+    def qr_id(self):
+        return self._store.ids[self._row]
+
+    @property
+    def centroid(self):
+        x, y = self._store.centroids[self._row]
+        return (float(x), float(y))
+
+    @centroid.setter
+    def centroid(self, value):
+        self._store.centroids[self._row] = value
+
+    @property
+    def attributes(self):
+        return TileAttributes(self._store, self._row)
+
+    @attributes.setter
+    def attributes(self, value):
+        self._store.metadata[self._row] = value
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["type"] = self.tile_class.__name__
+        return data
+
+
+class AnchorTileView(TileView, AnchorTile):
+    tile_class = AnchorTile
+
+    @property
+    def children(self):
+        return ZoneChildren(self._store, self._row)
+
+    @children.setter
+    def children(self, value):
+        view = ZoneChildren(self._store, self._row)
+        view.clear()
+        for qr_id in value:
+            view.add(qr_id)
+
+
+class ObjectTileView(TileView, ObjectTile):
+    tile_class = ObjectTile
+
+    @property
+    def assigned_to(self):
+        zones = [self._store.ids[zone] for zone in self._store.zone_rows(self._row)]
+        if not zones:
+            return None
+        return zones[0] if len(zones) == 1 else zones
+
+    @assigned_to.setter
+    def assigned_to(self, anchor_ids):
+        if isinstance(anchor_ids, str):
+            anchor_ids = [anchor_ids]
+        row_of = self._store.row_of
+        self._store.set_zone_rows(self._row, [row_of[a] for a in anchor_ids or () if a in row_of])
+
+
+class TileStore:
+    """
+    Columnar tile table. Rows are appended and tombstoned (never reused), so row numbers
+    and views stay valid for the lifetime of the store.
+
+    Attributes:
+        ids (list[str]): qr_id per row.
+        row_of (dict): qr_id → row, for live rows only.
+        centroids (np.ndarray): (capacity, 2) float64 hex centres.
+        axial (np.ndarray): (capacity, 2) int32 axial coordinates (set by BoardModel).
+        rotations (np.ndarray): (capacity,) int16 snapped rotation in degrees.
+        corners (np.ndarray): (capacity, 4, 2) float32 QR corners.
+        kinds (np.ndarray): (capacity,) uint8 KIND_OBJECT or KIND_ANCHOR.
+        zones (np.ndarray): (capacity,) int32 row of the assigned (first) anchor, -1 if unassigned.
+        shared_zones (dict): Row → anchor rows, for the few objects in more than one zone
+            (zones holds the first of them).
+        metadata (list[dict | None]): Per-row metadata dict (shared with tile_metadata, not copied);
+            None until the first attribute is written to a tile without metadata.
+    """
+
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.ids = []
+        self.row_of = {}
+        self.metadata = []
+        self.shared_zones = {}
+        self._views = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        def grow(array, shape, dtype, fill=0):
+            new = np.full((capacity,) + shape, fill, dtype=dtype)
+            if array is not None:
+                new[:self.size] = array[:self.size]
+            return new
+
+        existing = getattr(self, "centroids", None) is not None
+        self.centroids = grow(self.centroids if existing else None, (2,), np.float64)
+        self.axial = grow(self.axial if existing else None, (2,), np.int32)
+        self.rotations = grow(self.rotations if existing else None, (), np.int16)
+        self.corners = grow(self.corners if existing else None, (4, 2), np.float32)
+        self.kinds = grow(self.kinds if existing else None, (), np.uint8)
+        self.zones = grow(self.zones if existing else None, (), np.int32, -1)
+        self.alive = grow(self.alive if existing else None, (), bool, False)
+        self.has_rotation = grow(self.has_rotation if existing else None, (), bool, False)
+        self.has_corners = grow(self.has_corners if existing else None, (), bool, False)
+        self.capacity = capacity
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def __contains__(self, qr_id):
+        return qr_id in self.row_of
+
+    def __iter__(self):
+        return iter(self.tiles())
+
+    def append(self, qr_id, centroid, attributes=None, rotation=None, corners=None, kind=None) -> int:
+        """
+        Adds a row (or overwrites the live row with the same qr_id).
+
+        Parameters:
+            attributes (dict, optional): Metadata dict; stored by reference.
+            kind (int, optional): KIND_ANCHOR or KIND_OBJECT. Defaults to the attributes'
+                "tile_type", as in create_tile.
+
+        Returns:
+            int: The row.
+        """
+        row = self.row_of.get(qr_id)
+        if row is None:
+            if self.size == self.capacity:
+                self._allocate(self.capacity * 2)
+            row = self.size
+            self.size += 1
+            self.ids.append(qr_id)
+            self.metadata.append(attributes)
+            self.row_of[qr_id] = row
+        else:
+            self.metadata[row] = attributes
+            self._views.pop(row, None)
+
+        self.centroids[row] = centroid
+        if kind is None:
+            kind = KIND_ANCHOR if attributes and attributes.get("tile_type") == "anchor" else KIND_OBJECT
+        self.kinds[row] = kind
+        self.zones[row] = -1
+        self.shared_zones.pop(row, None)
+        self.alive[row] = True
+        self.has_rotation[row] = rotation is not None
+        self.rotations[row] = rotation if rotation is not None else 0
+        self.has_corners[row] = corners is not None
+        if corners is not None:
+            self.corners[row] = np.asarray(corners, dtype=np.float32).reshape(4, 2)
+        return row
+
+    def add_tile(self, tile: Tile):
+        """
+        Puts a plain Tile into the store and returns its view (views are returned as is). The
+        tile's attributes dict is kept by reference, like from_record's metadata, so it stays
+        shared with tile_metadata. Its rotation and og_corners are copied into the columns, which
+        views read instead of the dict's own entries.
+        """
+        if isinstance(tile, TileView) and tile._store is self:
+            return tile
+        attributes = tile.attributes
+        if isinstance(tile, TileView):
+            attributes = dict(attributes)  # another store's view has no single dict to share
+        rotation = attributes.get("rotation")
+        corners = attributes.get("og_corners")
+        kind = KIND_ANCHOR if isinstance(tile, AnchorTile) else KIND_OBJECT
+        row = self.append(tile.qr_id, tile.centroid, attributes, rotation, corners, kind)
+        view = self.tile_at_row(row)
+        if isinstance(tile, ObjectTile) and tile.assigned_to is not None:
+            view.assigned_to = tile.assigned_to
+        if isinstance(tile, AnchorTile):
+            for child_id in tile.children:
+                view.children.add(child_id)
+        return view
+
+    def remove(self, qr_id):
+        row = self.row_of.pop(qr_id, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        self.shared_zones.pop(row, None)
+        for child, shared in list(self.shared_zones.items()):
+            if row in shared:
+                self.set_zone_rows(child, [zone for zone in shared if zone != row])
+        zones = self.zones[:self.size]
+        zones[zones == row] = -1  # orphan its children
+        self._views.pop(row, None)
+
+    def zone_rows(self, row) -> list:
+        """Anchor rows of an object row, first zone first."""
+        shared = self.shared_zones.get(row)
+        if shared is not None:
+            return list(shared)
+        zone = int(self.zones[row])
+        return [zone] if zone >= 0 else []
+
+    def set_zone_rows(self, row, zones):
+        zones = list(dict.fromkeys(zones))
+        self.zones[row] = zones[0] if zones else -1
+        if len(zones) > 1:
+            self.shared_zones[row] = zones
+        else:
+            self.shared_zones.pop(row, None)
+
+    def tile_at_row(self, row):
+        view = self._views.get(row)
+        if view is None:
+            cls = AnchorTileView if self.kinds[row] == KIND_ANCHOR else ObjectTileView
+            view = cls.__new__(cls)
+            view._store, view._row = self, row
+            self._views[row] = view
+        return view
+
+    def tile(self, qr_id):
+        """View of the tile with this qr_id, or None."""
+        row = self.row_of.get(qr_id)
+        return None if row is None else self.tile_at_row(row)
+
+    def tiles(self):
+        """Views of all live tiles, in insertion order."""
+        return [self.tile_at_row(row) for row in np.flatnonzero(self.alive[:self.size]).tolist()]
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self.size])
+
+    def drop_views(self):
+        """Releases cached views (e.g. after a bulk pass); they are recreated on demand."""
+        self._views.clear()
+
+    def compact(self):
+        """
+        Returns a new store without tombstoned rows (views of the old store are not carried over).
+        """
+        rows = self.live_rows()
+        new = TileStore(capacity=max(64, len(rows)))
+        remap = {}
+        for row in rows.tolist():
+            remap[row] = new.append(self.ids[row], self.centroids[row], self.metadata[row],
+                                    int(self.rotations[row]) if self.has_rotation[row] else None,
+                                    self.corners[row] if self.has_corners[row] else None,
+                                    int(self.kinds[row]))
+            new.axial[remap[row]] = self.axial[row]
+        for row in rows.tolist():
+            new.set_zone_rows(remap[row], [remap[zone] for zone in self.zone_rows(row) if zone in remap])
+        return new
+
+    @classmethod
+    def from_tiles(cls, tiles):
+        store = cls(capacity=max(64, len(tiles)))
+        for tile in tiles:
+            store.add_tile(tile)
+        store.drop_views()
+        return store
+
+    @classmethod
+    def from_columns(cls, ids, centroids, kinds, metadata, rotations, has_rotation, corners, has_corners):
+        """
+        Builds a store from whole columns (e.g. a core.board_snapshot .npz) without appending row
+        by row. Arrays are aligned with ids, which must be unique.
+        """
+        n = len(ids)
+        store = cls(capacity=max(64, n))
+        store.size = n
+        store.ids = list(ids)
+        store.row_of = {qr_id: row for row, qr_id in enumerate(store.ids)}
+        store.metadata = list(metadata)
+        store.centroids[:n] = centroids
+        store.kinds[:n] = kinds
+        store.rotations[:n] = rotations
+        store.has_rotation[:n] = has_rotation
+        store.corners[:n] = corners
+        store.has_corners[:n] = has_corners
+        store.alive[:n] = True
+        return store
+
+    @classmethod
+    def from_record(cls, record, tile_metadata=None):
+        """
+        Builds a store straight from a scan record (board_scanner.detect_board) without
+        creating any Tile objects.
+        """
+        codes = record["codes"]
+        store = cls(capacity=max(64, len(codes)))
+        for code in codes:
+            attributes = tile_metadata.get(code["qr_id"]) if tile_metadata else None
+            store.append(code["qr_id"], code["centroid"], attributes, code["rotation"], code["og_corners"])
+        return store
+
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (excluding ids and shared metadata)."""
+        return sum(getattr(self, name).nbytes for name in
+                   ("centroids", "axial", "rotations", "corners", "kinds", "zones", "alive",
+                    "has_rotation", "has_corners"))
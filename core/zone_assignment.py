@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+"""
+Zone membership: which anchors each object tile belongs to.
+
+A zone grows outwards from its anchor through chains of adjacent object tiles (other anchors
+block it), up to the anchor's radius in hex steps: radius 1 is the anchor's direct neighbours,
+None floods through every object tile connected to the anchor. An object can be reached by
+several anchors and then belongs to all of them (overlap "all"), or only to the closest ones,
+ties kept (overlap "nearest").
+
+All anchors grow at once in one level-by-level, multi-source BFS over the board's adjacency
+map, so every (object, anchor) pair is visited once and the cost is linear in board size times
+the number of zones a tile ends up in. With "nearest", a tile only passes on the anchors that
+reached it first, which bounds the cost by board size alone.
+
+Radii and the overlap policy come from the "zones" section of zone_shapes.json.
+"""
+
+OVERLAP_ALL = "all"
+OVERLAP_NEAREST = "nearest"
+
+
+@dataclass
+class ZoneConfig:
+    """
+    Attributes:
+        radius (int | None): Default zone radius in hex steps; None floods through connected objects.
+        anchor_radius (dict): Anchor ID → radius (int or None), overriding the default.
+        overlap (str): OVERLAP_ALL (object joins every zone that reaches it) or OVERLAP_NEAREST.
+    """
+    radius: Optional[int] = 1
+    anchor_radius: dict = field(default_factory=dict)
+    overlap: str = OVERLAP_ALL
+
+    @classmethod
+    def from_shapes(cls, zone_shapes):
+        """Reads the "zones" section of zone_shapes.json (missing keys keep their defaults)."""
+        zones = zone_shapes.get("zones", {})
+        config = cls(radius=zones.get("radius", 1),
+                     anchor_radius=dict(zones.get("anchor_radius", {})),
+                     overlap=zones.get("overlap", OVERLAP_ALL))
+        if config.overlap not in (OVERLAP_ALL, OVERLAP_NEAREST):
+            raise ValueError(f"Unknown zone overlap policy: {config.overlap!r}")
+        return config
+
+    def radius_of(self, anchor_id):
+        return self.anchor_radius.get(anchor_id, self.radius)
+
+    @property
+    def independent(self) -> bool:
+        """True if each zone can be recomputed on its own (no pruning between anchors)."""
+        return self.overlap == OVERLAP_ALL
+
+
+def zone_reach(adjacency_map, anchor_ids, object_tiles, config):
+    """
+    Multi-source BFS from the given anchors through object tiles.
+
+    Parameters:
+        adjacency_map (dict): Tile ID → neighbour IDs.
+        anchor_ids (iterable[str]): Anchors to grow zones from.
+        object_tiles (container[str]): IDs of object tiles (the only tiles zones pass through).
+        config (ZoneConfig): Radii and overlap policy.
+
+    Returns:
+        dict: Object ID → {anchor ID: distance in hex steps} for every object reached.
+    """
+    nearest = config.overlap == OVERLAP_NEAREST
+    limit = {}
+    reach = {}
+    frontier = {}  # tile ID → anchors that first reached it at the current distance
+    for anchor_id in anchor_ids:
+        radius = config.radius_of(anchor_id)
+        if radius is None or radius > 0:
+            limit[anchor_id] = radius
+            frontier.setdefault(anchor_id, []).append(anchor_id)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        arrivals = {}
+        for tile_id, anchors in frontier.items():
+            anchors = [a for a in anchors if limit[a] is None or limit[a] >= distance]
+            if not anchors:
+                continue
+            for neighbor_id in adjacency_map.get(tile_id, ()):
+                if neighbor_id not in object_tiles:
+                    continue
+                seen = reach.get(neighbor_id)
+                if seen is None:
+                    seen = reach[neighbor_id] = {}
+                elif nearest and min(seen.values()) < distance:
+                    continue  # already claimed by a closer anchor
+                for anchor_id in anchors:
+                    if anchor_id not in seen:
+                        seen[anchor_id] = distance
+                        arrivals.setdefault(neighbor_id, []).append(anchor_id)
+        frontier = arrivals
+    return reach
+
+
+def resolve_zones(reach, overlap, anchor_order):
+    """
+    Zones of one object from its reach.
+
+    Parameters:
+        reach (dict): Anchor ID → distance, as returned per object by zone_reach.
+        overlap (str): OVERLAP_ALL or OVERLAP_NEAREST.
+        anchor_order (dict): Anchor ID → board order, to break distance ties.
+
+    Returns:
+        tuple[str]: Anchor IDs, closest first.
+    """
+    if not reach:
+        return ()
+    if len(reach) == 1:
+        return tuple(reach)
+    if overlap == OVERLAP_NEAREST:
+        closest = min(reach.values())
+        reach = {a: d for a, d in reach.items() if d == closest}
+    return tuple(sorted(reach, key=lambda a: (reach[a], anchor_order.get(a, len(anchor_order)))))
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+import numpy as np
+
+"""
+Zone membership overlaps for any number of zones.
+
+Each tile's zones are packed into a bitset (one bit per zone, np.packbits over a
+tiles × zones boolean matrix). One np.unique over the bitsets groups tiles into the exact
+intersection regions, so all 2^N possible regions are never enumerated, only those that
+contain tiles. Zone sizes and pairwise intersection counts come from the same matrix.
+
+Used by the Venn/UpSet tab, which draws a Venn diagram for two or three zones and an UpSet
+matrix otherwise.
+"""
+
+
+@dataclass
+class OverlapRegion:
+    """
+    Tiles that belong to exactly these zones and no others.
+
+    Attributes:
+        zones (tuple[str]): Zone (anchor) IDs, in ZoneOverlaps.zone_ids order; empty for unassigned tiles.
+        members (list[str]): Member IDs (or labels), in input order.
+    """
+    zones: tuple
+    members: list = field(default_factory=list)
+
+    def code(self, zone_ids):
+        """Region ID as used by matplotlib_venn ("101" = in the first and third zone only)."""
+        return "".join("1" if zone_id in self.zones else "0" for zone_id in zone_ids)
+
+
+@dataclass
+class ZoneOverlaps:
+    """
+    Attributes:
+        zone_ids (list[str]): Zones, in input order.
+        zone_sizes (np.ndarray): (Z,) member count per zone.
+        pairwise (np.ndarray): (Z, Z) members shared by each pair of zones (diagonal = zone sizes).
+        regions (list[OverlapRegion]): Non-empty exact regions, largest first.
+    """
+    zone_ids: list
+    zone_sizes: np.ndarray
+    pairwise: np.ndarray
+    regions: list
+
+    def members_of(self, zone_id):
+        """All members of one zone (union of its regions)."""
+        return [m for region in self.regions if zone_id in region.zones for m in region.members]
+
+
+def membership_matrix(zone_ids, member_zones):
+    """
+    Parameters:
+        zone_ids (list[str]): Zones (columns).
+        member_zones (list[iterable[str]]): Zone IDs of each member (rows); unknown IDs are ignored.
+
+    Returns:
+        np.ndarray: (members, zones) bool matrix.
+    """
+    column = {zone_id: i for i, zone_id in enumerate(zone_ids)}
+    rows, cols = [], []
+    for row, zones in enumerate(member_zones):
+        for zone_id in zones:
+            col = column.get(zone_id)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    matrix = np.zeros((len(member_zones), len(zone_ids)), dtype=bool)
+    matrix[rows, cols] = True
+    return matrix
+
+
+def zone_overlaps(zone_ids, member_ids, member_zones, include_unassigned=False):
+    """
+    Computes every non-empty intersection region in one pass.
+
+    Parameters:
+        zone_ids (list[str]): Zones to analyse.
+        member_ids (list[str]): Members (e.g. object tile IDs or display labels).
+        member_zones (list[iterable[str]]): Zones of each member, aligned with member_ids.
+        include_unassigned (bool): Also return the region of members in no zone.
+
+    Returns:
+        ZoneOverlaps
+    """
+    zone_ids = list(zone_ids)
+    matrix = membership_matrix(zone_ids, member_zones)
+    counts = matrix.astype(np.int32)
+    pairwise = counts.T @ counts
+
+    regions = []
+    if len(member_ids) and zone_ids:
+        bitsets = np.packbits(matrix, axis=1)
+        keys, inverse, sizes = np.unique(bitsets, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        in_zone = np.unpackbits(keys, axis=1)[:, :len(zone_ids)].astype(bool)
+        grouped = [member_ids[i] for i in np.argsort(inverse, kind="stable").tolist()]
+        ends = np.cumsum(sizes).tolist()
+        start = 0
+        for row, end in zip(in_zone, ends):
+            zones = tuple(zone_ids[i] for i in np.flatnonzero(row).tolist())
+            if zones or include_unassigned:
+                regions.append(OverlapRegion(zones, grouped[start:end]))
+            start = end
+    elif include_unassigned and len(member_ids):
+        regions.append(OverlapRegion((), list(member_ids)))
+
+    regions.sort(key=lambda region: (-len(region.members), len(region.zones)))
+    return ZoneOverlaps(zone_ids, np.diag(pairwise).copy(), pairwise, regions)
@@ -0,0 +1,229 @@
+from collections import Counter
+from dataclasses import dataclass
+import numpy as np
+from core.tile_model import assigned_anchor_ids
+
+"""
+Cross-zone relationships between neighbouring object tiles, kept up to date as the board changes.
+
+Every undirected edge between two object tiles is stored once, keyed (tile, neighbour) with
+tile < neighbour, together with its relation rows (tile zone, neighbour zone, kind):
+    cross-zone            Both tiles are in zones, and these two zones are not shared by them.
+    unassigned-neighbor   One tile is in a zone, the other in none (zone None on that side).
+Edges between tiles with the same zones have no rows and are not stored.
+
+Aggregates (edges per zone pair, boundary tiles per zone, unassigned frontier tiles per zone) are
+counters adjusted as rows come and go, so queries cost O(answer), and after a board delta only
+the edges of touched tiles are re-derived. table() gives the rows as NumPy columns for bulk use.
+"""
+
+CROSS_ZONE = 0
+UNASSIGNED_NEIGHBOR = 1
+KIND_NAMES = ("cross-zone", "unassigned-neighbor")
+
+
+def edge_rows(tile_zones, neighbor_zones):
+    """
+    Relation rows of one edge.
+
+    Parameters:
+        tile_zones (tuple[str]): Zones of the first tile.
+        neighbor_zones (tuple[str]): Zones of the second tile.
+
+    Returns:
+        list[tuple]: (tile zone, neighbour zone, kind) rows; empty if the edge crosses no boundary.
+    """
+    if tile_zones and neighbor_zones:
+        only_neighbor = [zone for zone in neighbor_zones if zone not in tile_zones]
+        return [(zone, other, CROSS_ZONE)
+                for zone in tile_zones if zone not in neighbor_zones for other in only_neighbor]
+    if tile_zones:
+        return [(zone, None, UNASSIGNED_NEIGHBOR) for zone in tile_zones]
+    return [(None, zone, UNASSIGNED_NEIGHBOR) for zone in neighbor_zones]
+
+
+def _bump(counters, zone, qr_id, step):
+    counter = counters.get(zone)
+    if counter is None:
+        counter = counters[zone] = Counter()
+    counter[qr_id] += step
+    if counter[qr_id] <= 0:
+        del counter[qr_id]
+        if not counter:
+            del counters[zone]
+
+
+@dataclass
+class EdgeTable:
+    """
+    All relation rows as columns, one row per (edge, zone pair).
+
+    Attributes:
+        tile_ids (list[str]): Tiles referenced by tile / neighbor.
+        zone_ids (list[str]): Zones referenced by tile_zone / neighbor_zone.
+        tile (np.ndarray): (R,) int32 index into tile_ids (the smaller ID of the edge).
+        neighbor (np.ndarray): (R,) int32 index into tile_ids.
+        tile_zone (np.ndarray): (R,) int32 index into zone_ids, -1 = unassigned.
+        neighbor_zone (np.ndarray): (R,) int32 index into zone_ids, -1 = unassigned.
+        kind (np.ndarray): (R,) uint8 CROSS_ZONE or UNASSIGNED_NEIGHBOR.
+    """
+    tile_ids: list
+    zone_ids: list
+    tile: np.ndarray
+    neighbor: np.ndarray
+    tile_zone: np.ndarray
+    neighbor_zone: np.ndarray
+    kind: np.ndarray
+
+
+class ZoneRelations:
+    """
+    Deduplicated cross-zone edge table of a board. BoardModel.relations builds it on first use
+    and apply_delta keeps it current.
+
+    Attributes:
+        edges (dict): (tile, neighbour) → relation rows, see edge_rows.
+        tile_edges (dict): Tile ID → keys of its stored edges.
+        pair_counts (Counter): (zone, zone) sorted pair → cross-zone rows between them.
+        boundary (dict): Zone ID → Counter of its tiles with a row leaving the zone.
+        frontier (dict): Zone ID → Counter of unassigned tiles next to the zone.
+    """
+
+    def __init__(self):
+        self.edges = {}
+        self.tile_edges = {}
+        self.pair_counts = Counter()
+        self.boundary = {}
+        self.frontier = {}
+        self._table = None
+
+    @classmethod
+    def from_board(cls, board):
+        relations = cls()
+        relations.update(board, board.object_tiles)
+        return relations
+
+    def update(self, board, tile_ids):
+        """
+        Re-derives every edge of the given tiles, e.g. BoardChangeSet.touched(): tiles that were
+        added, moved, removed, reassigned or got new neighbours.
+        """
+        for qr_id in tile_ids:
+            for key in list(self.tile_edges.get(qr_id, ())):
+                self._remove(key)
+
+        object_tiles = board.object_tiles
+        zones_of = {}
+        for qr_id in tile_ids:
+            tile = object_tiles.get(qr_id)
+            if tile is None:
+                continue
+            zones = zones_of.get(qr_id)
+            if zones is None:
+                zones = zones_of[qr_id] = assigned_anchor_ids(tile)
+            for neighbor_id in board.adjacency_map.get(qr_id, ()):
+                neighbor_zones = zones_of.get(neighbor_id)
+                if neighbor_zones is None:
+                    neighbor = object_tiles.get(neighbor_id)
+                    if neighbor is None:
+                        continue  # anchors are zone sources, not members
+                    neighbor_zones = zones_of[neighbor_id] = assigned_anchor_ids(neighbor)
+                if neighbor_zones == zones:
+                    continue  # same zones (or both unassigned): no boundary
+                forward = qr_id < neighbor_id
+                key = (qr_id, neighbor_id) if forward else (neighbor_id, qr_id)
+                if key in self.edges:
+                    continue
+                rows = edge_rows(zones, neighbor_zones) if forward else edge_rows(neighbor_zones, zones)
+                if rows:
+                    self._add(key, rows)
+        self._table = None
+
+    def _add(self, key, rows):
+        self.edges[key] = rows
+        for qr_id in key:
+            self.tile_edges.setdefault(qr_id, set()).add(key)
+        self._count(key, rows, 1)
+
+    def _remove(self, key):
+        rows = self.edges.pop(key)
+        for qr_id in key:
+            keys = self.tile_edges[qr_id]
+            keys.discard(key)
+            if not keys:
+                del self.tile_edges[qr_id]
+        self._count(key, rows, -1)
+
+    def _count(self, key, rows, step):
+        tile_id, neighbor_id = key
+        for tile_zone, neighbor_zone, kind in rows:
+            if kind == CROSS_ZONE:
+                pair = (tile_zone, neighbor_zone) if tile_zone < neighbor_zone else (neighbor_zone, tile_zone)
+                self.pair_counts[pair] += step
+                if self.pair_counts[pair] <= 0:
+                    del self.pair_counts[pair]
+                _bump(self.boundary, tile_zone, tile_id, step)
+                _bump(self.boundary, neighbor_zone, neighbor_id, step)
+            elif tile_zone is not None:
+                _bump(self.boundary, tile_zone, tile_id, step)
+                _bump(self.frontier, tile_zone, neighbor_id, step)
+            else:
+                _bump(self.boundary, neighbor_zone, neighbor_id, step)
+                _bump(self.frontier, neighbor_zone, tile_id, step)
+
+    # --- Queries ---
+
+    def zone_pair_counts(self) -> dict:
+        """(zone, zone) → number of cross-zone edges between the two zones."""
+        return dict(self.pair_counts)
+
+    def neighbouring_zones(self, zone_id) -> dict:
+        """Zone ID → number of cross-zone edges between that zone and zone_id."""
+        return {a if b == zone_id else b: n for (a, b), n in self.pair_counts.items() if zone_id in (a, b)}
+
+    def boundary_tiles(self, zone_id) -> set:
+        """Tiles of the zone with a neighbour in another zone or in none."""
+        return set(self.boundary.get(zone_id, ()))
+
+    def frontier_tiles(self, zone_id=None) -> set:
+        """Unassigned object tiles next to the zone (or next to any zone)."""
+        if zone_id is not None:
+            return set(self.frontier.get(zone_id, ()))
+        return set().union(*self.frontier.values())
+
+    def relations_of(self, qr_id) -> list:
+        """The tile's relations, as to_dicts() rows."""
+        return [row for key in self.tile_edges.get(qr_id, ()) for row in self._dicts(key)]
+
+    def to_dicts(self) -> list:
+        """
+        Every relation row once, as
+        {"tile_id", "neighbor_id", "tile_zone", "neighbor_zone", "type"} dicts.
+        """
+        return [row for key in self.edges for row in self._dicts(key)]
+
+    def _dicts(self, key):
+        return [{"tile_id": key[0], "neighbor_id": key[1], "tile_zone": tile_zone,
+                 "neighbor_zone": neighbor_zone, "type": KIND_NAMES[kind]}
+                for tile_zone, neighbor_zone, kind in self.edges[key]]
+
+    def table(self) -> EdgeTable:
+        """All rows as NumPy columns; cached until the next update."""
+        if self._table is None:
+            tile_index, zone_index = {}, {None: -1}
+            tile, neighbor, tile_zone, neighbor_zone, kind = [], [], [], [], []
+            for (tile_id, neighbor_id), rows in self.edges.items():
+                a = tile_index.setdefault(tile_id, len(tile_index))
+                b = tile_index.setdefault(neighbor_id, len(tile_index))
+                for zone_a, zone_b, row_kind in rows:
+                    tile.append(a)
+                    neighbor.append(b)
+                    tile_zone.append(zone_index.setdefault(zone_a, len(zone_index) - 1))
+                    neighbor_zone.append(zone_index.setdefault(zone_b, len(zone_index) - 1))
+                    kind.append(row_kind)
+            self._table = EdgeTable(
+                list(tile_index), [zone for zone in zone_index if zone is not None],
+                np.array(tile, dtype=np.int32), np.array(neighbor, dtype=np.int32),
+                np.array(tile_zone, dtype=np.int32), np.array(neighbor_zone, dtype=np.int32),
+                np.array(kind, dtype=np.uint8))
+        return self._table
@@ -1,294 +1,345 @@
+from functools import partial
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QScrollArea, QFrame,
-    QLineEdit, QHBoxLayout, QComboBox, QFrame, QPushButton,QVBoxLayout
+    QWidget, QVBoxLayout, QLabel, QFrame,
+    QLineEdit, QHBoxLayout, QComboBox, QPushButton
 )
-from core.tile_model import Tile, AnchorTile, ObjectTile
+from PyQt6.QtCore import pyqtSignal, QTimer
+from core.tile_model import Tile, AnchorTile, ObjectTile, SYSTEM_ATTRIBUTE_KEYS
 from core.board_model import BoardModel
 
+"""
+Attribute form for the selected tile.
+
+The form is built once. Each section is a fixed widget that set_tile shows, hides and
+re-binds, and variable-length sections (zone names, anchor attribute keys, user attributes)
+draw rows from a RowPool. Switching tiles therefore calls setText on existing widgets
+instead of destroying and rebuilding them, and widgets are only created when a tile has
+more rows than any tile before it.
+
+Text edits are debounced: the last value typed into each row is written after
+WRITE_DEBOUNCE_MS, when editing finishes, or before the form switches to another tile.
+"""
+
+WRITE_DEBOUNCE_MS = 300
+
+COLOR_CHOICES = ["None", "Red", "Blue", "Green", "Yellow"]
+
+# Attributes with their own widget, not repeated as free-text rows
+DEDICATED_KEYS = {"nickname", "color", "attribute_keys"}
+
+
+class AttributeRow(QWidget):
+    """
+    A label and a line edit, re-bound to a different attribute on every set_tile.
+
+    Emits:
+        edited (AttributeRow, str): The user typed into the field (not emitted by bind()).
+        finished (AttributeRow): The field lost focus or Return was pressed.
+    """
+    edited = pyqtSignal(object, str)
+    finished = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.label = QLabel()
+        self.edit = QLineEdit()
+        self.qr_id = None
+        self.write = None
+
+        row = QHBoxLayout(self)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.addWidget(self.label)
+        row.addWidget(self.edit)
+
+        # textEdited, unlike textChanged, is not emitted by setText, so binding never writes
+        self.edit.textEdited.connect(lambda text: self.edited.emit(self, text))
+        self.edit.editingFinished.connect(lambda: self.finished.emit(self))
+
+    def bind(self, label, value, qr_id, write):
+        """
+        Parameters:
+            label (str): Row caption.
+            value (str): Current value shown in the field.
+            qr_id (str): Tile reported in attributes_changed when the value is written.
+            write (callable): write(text) stores an edited value.
+        """
+        self.label.setText(label)
+        self.edit.setText(value)
+        self.qr_id = qr_id
+        self.write = write
+
+
+class RowPool:
+    """
+    AttributeRows stacked in one container widget. begin() starts a re-bind, take() hands
+    out the next row (creating one only when the pool is exhausted), end() hides the rest.
+    """
+
+    def __init__(self, editor):
+        self.editor = editor
+        self.container = QWidget()
+        self.layout = QVBoxLayout(self.container)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.rows = []
+        self.used = 0
+
+    def begin(self):
+        self.used = 0
+
+    def take(self):
+        if self.used == len(self.rows):
+            row = AttributeRow()
+            row.edited.connect(self.editor.queue_write)
+            row.finished.connect(self.editor.flush_writes)
+            self.layout.addWidget(row)
+            self.rows.append(row)
+        row = self.rows[self.used]
+        self.used += 1
+        row.setVisible(True)
+        return row
+
+    def end(self):
+        for row in self.rows[self.used:]:
+            row.setVisible(False)
+            row.write = None
+        self.container.setVisible(self.used > 0)
+
+
 class AttributeEditor(QWidget):
+    attributes_changed = pyqtSignal(str)  # qr_id whose displayed attributes were edited
+
     def __init__(self, tile_data: dict, board: BoardModel):
         super().__init__()
         self.tile_data = tile_data
         self.board = board
         self.tile = None
+        self.pending_writes = {}  # AttributeRow → (qr_id, write, text), applied by flush_writes
+        self.write_timer = QTimer(self)
+        self.write_timer.setSingleShot(True)
+        self.write_timer.setInterval(WRITE_DEBOUNCE_MS)
+        self.write_timer.timeout.connect(self.flush_writes)
         self.init_ui()
 
     def init_ui(self):
         self.label = QLabel("Attribute Editor")
         self.main_layout = QVBoxLayout()
         self.main_layout.addWidget(self.label)
-        self.setLayout(self.main_layout)
 
+        # --- Header and common nickname ---
+        self.header = QLabel()
+        self.nickname_row = AttributeRow()
+        self.nickname_row.edited.connect(self.queue_write)
+        self.nickname_row.finished.connect(self.flush_writes)
+
+        # --- Object tiles: zone and editable zone names ---
+        self.zone_label = QLabel()
+        self.zone_name_rows = RowPool(self)
+        self.siblings_label = QLabel("Siblings: TBD")
+
+        # --- Anchor tiles: children and neighbouring zones ---
+        self.children_label = QLabel()
+        self.borders_label = QLabel()
+        self.borders_label.setWordWrap(True)
+
+        # --- Colour dropdown ---
+        self.color_combo = QComboBox()
+        self.color_combo.addItems(COLOR_CHOICES)
+        self.color_combo.textActivated.connect(self.on_color_chosen)  # user choices only
+        self.color_row = QWidget()
+        color_layout = QHBoxLayout(self.color_row)
+        color_layout.setContentsMargins(0, 0, 0, 0)
+        color_layout.addWidget(QLabel("Colour:"))
+        color_layout.addWidget(self.color_combo)
+
+        self.divider = QFrame()
+        self.divider.setFrameShape(QFrame.Shape.HLine)
+        self.divider.setFrameShadow(QFrame.Shadow.Sunken)
+
+        # --- Anchor tiles: attribute keys offered to assigned tiles ---
+        self.attribute_keys_label = QLabel("Attributes (for assigned tiles):")
+        self.attribute_key_rows = RowPool(self)
+        self.add_key_button = QPushButton("Add Attribute")
+        self.add_key_button.clicked.connect(self.add_attribute_key)
+
+        # --- Object tiles: add a new attribute ---
+        self.new_attribute_row = QWidget()
+        self.new_key_input = QComboBox()
+        self.new_key_input.setEditable(True)  # Allow user-defined text
+        self.new_value_input = QLineEdit()
+        self.new_value_input.setPlaceholderText("Value")
+        add_button = QPushButton("Add")
+        add_button.clicked.connect(self.add_attribute)
+        input_row = QHBoxLayout(self.new_attribute_row)
+        input_row.setContentsMargins(0, 0, 0, 0)
+        input_row.addWidget(self.new_key_input)
+        input_row.addWidget(self.new_value_input)
+        input_row.addWidget(add_button)
+
+        # --- User-defined attributes ---
+        self.user_attribute_rows = RowPool(self)
+
+        self.sections = [
+            self.header, self.nickname_row, self.zone_label, self.zone_name_rows.container,
+            self.siblings_label, self.children_label, self.borders_label, self.color_row, self.divider,
+            self.attribute_keys_label, self.attribute_key_rows.container, self.add_key_button,
+            self.new_attribute_row, self.user_attribute_rows.container,
+        ]
+        for section in self.sections:
+            self.main_layout.addWidget(section)
+            section.setVisible(False)
+        self.main_layout.addStretch()
+        self.setLayout(self.main_layout)
 
     def set_tile(self, tile: Tile):
+        """Re-binds the form to a tile, writing any pending edits to the previous one first."""
+        self.flush_writes()
         self.tile = tile
         tile_attributes = tile.attributes
-        self.clear_fields()
-
-        # --- Header ---
-        header = QLabel(f"Editing {tile.icon()}")
-        self.main_layout.addWidget(header)
-
-        # --- Common: Nickname ---
-        self.nickname_field(tile_attributes)
-
-        if isinstance(tile, ObjectTile):
-            self.set_object_tile(tile)
-        elif isinstance(tile, AnchorTile):
-            self.set_anchor_tile(tile)
-
-        if isinstance(tile, ObjectTile):
-            self.add_new_attribute_ui(tile_attributes)
-        
-        self.user_defined_attributes(tile_attributes, tile)
-        
-
-    def nickname_field(self, tile_attributes: dict):
-        label = QLabel("Nickname:")
-        edit = QLineEdit()
-        edit.setText(tile_attributes.get("nickname", ""))
-        edit.textChanged.connect(lambda text: tile_attributes.update({"nickname": text}))
-
-        row = QHBoxLayout()
-        row.addWidget(label)
-        row.addWidget(edit)
-
-        container = QWidget()
-        container.setLayout(row)
-        self.main_layout.addWidget(container)        
-
-    def set_object_tile(self, tile: ObjectTile):
-        tile_attributes = tile.attributes
-
-        # --- Zones (Uneditable) ---
-        anchors = self.board.get_anchors_of_tile(tile)
+        is_object = isinstance(tile, ObjectTile)
+        is_anchor = isinstance(tile, AnchorTile)
+
+        self.setUpdatesEnabled(False)
+        self.header.setText(f"Editing {tile.icon()}")
+        self.header.setVisible(True)
+        self.nickname_row.bind("Nickname:", tile_attributes.get("nickname", ""), tile.qr_id,
+                               partial(self.set_attribute, tile_attributes, "nickname"))
+        self.nickname_row.setVisible(True)
+
+        self.bind_zones(tile if is_object else None)
+        self.siblings_label.setVisible(is_object)
+        self.bind_children(tile if is_anchor else None)
+        self.bind_borders(tile if is_anchor else None)
+
+        self.color_combo.setCurrentIndex(max(self.color_combo.findText(tile_attributes.get("color", "None")), 0))
+        self.color_row.setVisible(is_object or is_anchor)
+        self.divider.setVisible(is_object or is_anchor)
+
+        self.bind_attribute_keys(tile if is_anchor else None)
+        self.bind_new_attribute(tile if is_object else None)
+        self.bind_user_attributes(tile)
+        self.setUpdatesEnabled(True)
+
+    def bind_zones(self, tile):
+        self.zone_name_rows.begin()
+        anchors = self.board.get_anchors_of_tile(tile) if tile is not None else []
         if anchors:
             zone_names = [f"{a.icon()} ({a.attributes.get('nickname', '')})" for a in anchors]
-            zone_label = QLabel("Zone(s): " + ", ".join(zone_names))
+            self.zone_label.setText("Zone(s): " + ", ".join(zone_names))
         else:
-            zone_label = QLabel("Zone: None")
-        self.layout().addWidget(zone_label)
-
-        # --- Editable Zone Name(s) ---
+            self.zone_label.setText("Zone: None")
         for anchor in anchors:
-            label = QLabel(f"Zone Name for {anchor.icon()}:")
-            edit = QLineEdit()
-            edit.setText(anchor.attributes.get("nickname", ""))
-
-            # Bind the update to the correct anchor object
-            edit.textChanged.connect(lambda text, a=anchor: a.attributes.update({"nickname": text}))
-
-            row = QHBoxLayout()
-            row.addWidget(label)
-            row.addWidget(edit)
-            self.layout().addLayout(row)
+            # Edits the anchor's nickname, so the anchor is the tile reported as changed
+            self.zone_name_rows.take().bind(f"Zone Name for {anchor.icon()}:", anchor.attributes.get("nickname", ""),
+                                            anchor.qr_id, partial(self.set_attribute, anchor.attributes, "nickname"))
+        self.zone_name_rows.end()
+        self.zone_label.setVisible(tile is not None)
+
+    def bind_children(self, anchor):
+        if anchor is not None:
+            children = [self.board.get_tile_by_id(qr_id) for qr_id in sorted(anchor.children)]
+            child_names = ", ".join(t.icon() for t in children if t is not None)
+            self.children_label.setText(f"Children: {child_names or 'None'}")
+        self.children_label.setVisible(anchor is not None)
+
+    def bind_borders(self, anchor):
+        """Zones bordering this one and unassigned neighbours, from the board's cross-zone edge table."""
+        if anchor is not None:
+            relations = self.board.relations
+            borders = []
+            for zone_id, edges in sorted(relations.neighbouring_zones(anchor.qr_id).items(), key=lambda item: -item[1]):
+                zone = self.board.anchor_tiles.get(zone_id)
+                borders.append(f"{zone.icon() if zone else zone_id} ({edges})")
+            frontier = len(relations.frontier_tiles(anchor.qr_id))
+            self.borders_label.setText(f"Borders: {', '.join(borders) or 'None'}; unassigned neighbours: {frontier}")
+        self.borders_label.setVisible(anchor is not None)
+
+    def bind_attribute_keys(self, anchor):
+        self.attribute_key_rows.begin()
+        if anchor is not None:
+            # Get or initialize the list of attribute keys
+            existing_keys = anchor.attributes.setdefault("attribute_keys", [])
+            for i, key in enumerate(existing_keys):
+                self.attribute_key_rows.take().bind("Attribute:", key, anchor.qr_id,
+                                                    partial(self.rename_attribute_key, existing_keys, i))
+        self.attribute_key_rows.end()
+        for section in (self.attribute_keys_label, self.add_key_button):
+            section.setVisible(anchor is not None)
+
+    def bind_new_attribute(self, tile):
+        if tile is not None:
+            self.new_key_input.clear()
+            self.new_key_input.addItem("empty")
+            for a in self.board.get_anchors_of_tile(tile):
+                self.new_key_input.addItems(a.attributes.get("attribute_keys", []))
+            self.new_value_input.clear()
+        self.new_attribute_row.setVisible(tile is not None)
+
+    def bind_user_attributes(self, tile):
+        self.user_attribute_rows.begin()
+        for key, value in tile.attributes.items():
+            if key in SYSTEM_ATTRIBUTE_KEYS or key in DEDICATED_KEYS:
+                continue  # Skip internal keys and those edited above
+            self.user_attribute_rows.take().bind(f"{key}:", str(value), tile.qr_id,
+                                                 partial(self.set_attribute, tile.attributes, key))
+        self.user_attribute_rows.end()
+
+    def queue_write(self, row, text):
+        if row.write is None:
+            return
+        self.pending_writes[row] = (row.qr_id, row.write, text)
+        self.write_timer.start()
+
+    def flush_writes(self, *_):
+        """Applies pending edits, announcing each edited tile once."""
+        self.write_timer.stop()
+        pending, self.pending_writes = self.pending_writes, {}
+        changed = []
+        for qr_id, write, text in pending.values():
+            write(text)
+            if qr_id not in changed:
+                changed.append(qr_id)
+        for qr_id in changed:
+            self.attributes_changed.emit(qr_id)
+
+    def set_attribute(self, tile_attributes: dict, key: str, value):
+        tile_attributes[key] = value
 
-        # --- Placeholder: Siblings ---
-        siblings_label = QLabel("Siblings: TBD")
-        self.main_layout.addWidget(siblings_label)
-        # --- Color Dropdown ---
-        self.color_dropdown(tile_attributes)
+    def rename_attribute_key(self, attribute_keys: list, index: int, text: str):
+        new_text = text.strip()
+        if new_text and index < len(attribute_keys):
+            attribute_keys[index] = new_text
 
-        # --- Divider ---
-        self.divider()
+    def on_color_chosen(self, text: str):
+        if self.tile is None:
+            return
+        self.tile.attributes["color"] = text
+        self.attributes_changed.emit(self.tile.qr_id)
 
-    def set_anchor_tile(self, tile: AnchorTile):
-        tile_attributes = tile.attributes
-
-        # --- Children (list ObjectTiles assigned to this anchor) ---
-        children = [t for t in self.board.object_tiles.values() if t.assigned_to == tile.qr_id]
-        child_names = ", ".join(t.icon() for t in children) if children else "None"
-        children_label = QLabel(f"Children: {child_names}")
-        self.main_layout.addWidget(children_label)
-        # --- Color Dropdown ---
-        self.color_dropdown(tile_attributes)
-
-        # --- Divider ---
-        self.divider()
-
-        # --- Attribute Keys (Editable per anchor) ---
-        attributes_label = QLabel("Attributes (for assigned tiles):")
-        
-        self.main_layout.addWidget(attributes_label)
-         
-        # Get or initialize the list of attribute keys
-        existing_keys = tile_attributes.setdefault("attribute_keys", [])
-
-        for i, key in enumerate(existing_keys):
-            key_row = QHBoxLayout()
-
-            key_label = QLabel("Attribute:")
-            key_edit = QLineEdit()
-            key_edit.setText(key)
-
-            # Safer update using editingFinished
-            def make_update_handler(index, line_edit):
-                def handler():
-                    new_text = line_edit.text().strip()
-                    if new_text:
-                        tile_attributes["attribute_keys"][index] = new_text
-                return handler
-
-            key_edit.editingFinished.connect(make_update_handler(i, key_edit))
-
-            key_row.addWidget(key_label)
-            key_row.addWidget(key_edit)
-            self.layout().addLayout(key_row)
-
-  
-            container = QWidget()
-            container.setLayout(key_row)
-            self.main_layout.addWidget(container)
-
-        # --- Add Attribute Button ---
-        add_key_button = QPushButton("Add Attribute")
-        add_key_button.clicked.connect(lambda: self.add_attribute_key(tile))
-        add_key_button.clicked.connect(lambda: print("Add clicked"))
-        self.layout().addWidget(add_key_button)
-
-    def add_attribute_key(self, anchor):
+    def add_attribute_key(self):
+        anchor = self.tile
+        self.flush_writes()
         anchor.attributes.setdefault("attribute_keys", []).append("new_key")
-        self.set_tile(anchor)  # Re-render
-        
-
-    def color_dropdown(self, tile_attributes: dict):
-        label = QLabel("Colour:")
-        combo = QComboBox()
-        combo.addItems(["None", "Red", "Blue", "Green", "Yellow"])
-        current = tile_attributes.get("color", "None")
-        index = combo.findText(current)
-        if index != -1:
-            combo.setCurrentIndex(index)
-        combo.currentTextChanged.connect(lambda text: tile_attributes.update({"color": text}))
-
-        row = QHBoxLayout()
-        row.addWidget(label)
-        row.addWidget(combo)
-
-        container = QWidget()
-        container.setLayout(row)
-        self.main_layout.addWidget(container)  
-
-    def divider(self):
-        line = QFrame()
-        line.setFrameShape(QFrame.Shape.HLine)
-        line.setFrameShadow(QFrame.Shadow.Sunken)
-        self.main_layout.addWidget(line)
-
-    def user_defined_attributes(self, tile_attributes: dict, tile):
-        system_keys = {"icon", "tile_type", "rotation", "og_corners", "qr_corners", "centroid"}
-        print("tile attributes", tile_attributes)
-        for key, value in tile_attributes.items():
-            if key in system_keys:
-                continue  # Skip internal keys
-            
-            label = QLabel(f"{key}:")
-            edit = QLineEdit(str(value))
-            print(f"tile: {tile.icon()} key: {key}, value {value}")
-
-            def make_updater(k):
-                return lambda text: tile_attributes.update({k: text})
-
-            edit.textChanged.connect(make_updater(key))
-
-            row = QHBoxLayout()
-            row.addWidget(label)
-            row.addWidget(edit)
-
-            self.layout().addLayout(row)  # Allow for both Anchor and Object tiles
-
-    
-    def add_new_attribute_ui(self, tile_attributes: dict):
-        if isinstance(self.tile, ObjectTile):
-            anchors = self.board.get_anchors_of_tile(self.tile)
-            key_input = QComboBox()
-            key_input.setEditable(True)  # Allow user-defined text
-            key_input.addItem("empty")
-            for a in anchors:
-                for key in a.attributes.get("attribute_keys", []):
-                    key_input.addItem(key)
-        else:
-            key_input = QLineEdit()
-            key_input.setPlaceholderText("New attribute name")
+        self.bind_attribute_keys(anchor)
+        self.attributes_changed.emit(anchor.qr_id)
 
-        value_input = QLineEdit()
-        value_input.setPlaceholderText("Value")
+    def add_attribute(self):
+        key = self.new_key_input.currentText().strip()
+        value = self.new_value_input.text().strip()
+        if not key or self.tile is None:
+            return  # Do nothing on empty key
 
-        add_button = QPushButton("Add")
-
-        def add_attribute():
-            key = key_input.currentText().strip() if isinstance(key_input, QComboBox) else key_input.text().strip()
-            value = value_input.text().strip()
-            print(f"ADDING: {key=}, {value=}")  # Debug line
-
-            if not key:
-                return  # Do nothing on empty key
-
-            if isinstance(self.tile, ObjectTile):
-                tile_attributes[key] = value  # Always allow key update
-            else:
-                if key not in tile_attributes:
-                    tile_attributes[key] = ""
-                if key not in tile_attributes.get("attribute_keys", []):
-                    tile_attributes.setdefault("attribute_keys", []).append(key)
-
-            # Add label and editable field to UI
-            label = QLabel(f"{key}:")
-            field = QLineEdit(value)
-            field.textChanged.connect(lambda text, k=key: tile_attributes.update({k: text}))
-
-            row = QHBoxLayout()
-            row.addWidget(label)
-            row.addWidget(field)
-            self.layout().addLayout(row)
-
-            # Clear inputs
-            if isinstance(key_input, QComboBox):
-                key_input.setCurrentText("")
-            else:
-                key_input.clear()
-            value_input.clear()
-
-        add_button.clicked.connect(add_attribute)
-
-        input_row = QHBoxLayout()
-        input_row.addWidget(key_input)
-        input_row.addWidget(value_input)
-        input_row.addWidget(add_button)
-
-        container = QWidget()
-        container.setLayout(input_row)
-        self.layout().addWidget(container)
-
-    def clear_fields(self):
-        layout = self.layout()
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-            elif item.layout():
-                self.clear_layout(item.layout())
-
-    def clear_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-            elif item.layout():
-                self.clear_layout(item.layout())
-
-
-    def add_attribute_row(self, key, value):
+        self.flush_writes()
         tile_attributes = self.tile.attributes
-        tile_attributes[key] = value
-
-        label = QLabel(f"{key}:")
-        field = QLineEdit(value)
-        field.textChanged.connect(lambda text, k=key: tile_attributes.update({k: text}))
-
-        row = QHBoxLayout()
-        row.addWidget(label)
-        row.addWidget(field)
-        self.main_layout.addWidget(row)
+        if isinstance(self.tile, ObjectTile):
+            tile_attributes[key] = value  # Always allow key update
+        else:
+            if key not in tile_attributes:
+                tile_attributes[key] = ""
+            if key not in tile_attributes.get("attribute_keys", []):
+                tile_attributes.setdefault("attribute_keys", []).append(key)
+        self.bind_user_attributes(self.tile)
+        self.attributes_changed.emit(self.tile.qr_id)
+
+        # Clear inputs
+        self.new_key_input.setCurrentText("")
+        self.new_value_input.clear()
@@ -1,14 +1,34 @@
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsItem, QGraphicsTextItem
-from PyQt6.QtGui import QBrush, QPen, QColor, QPainterPath, QPainter, QAction
-from PyQt6.QtCore import QRectF, QPointF, Qt, pyqtSignal
+from PyQt6.QtGui import QBrush, QPen, QColor, QPainterPath, QPainter, QAction, QPolygonF
+from PyQt6.QtCore import QRectF, QPointF, Qt, pyqtSignal, QVariantAnimation, QEasingCurve
 import math
+from functools import lru_cache
 from core.tile_model import Tile, AnchorTile, ObjectTile
+from core.geometry import axial_round
 from gui.custom_board_scene import CustomBoardScene
+from gui.selection_model import mode_for_modifiers
+from core.profiling import span, profiled
 
 # Constants for rendering
 DEFAULT_COLOR = QColor("lightgray")
 ANCHOR_BORDER_COLOR = QColor("black")
 ANCHOR_BORDER_WIDTH = 3
+MOVE_ANIMATION_MS = 250
+HIGHLIGHT_COLOR = QColor("red")
+HIGHLIGHT_WIDTH = 3
+
+# Level of detail, by on-screen hex radius in pixels (rendered_hex_size × zoom):
+# labels from LABEL_MIN_RADIUS_PX, per-tile items with borders from OVERVIEW_MAX_RADIUS_PX,
+# below that one batched fill pass for the whole board
+LOD_DETAIL = "detail"
+LOD_OUTLINE = "outline"
+LOD_OVERVIEW = "overview"
+LABEL_MIN_RADIUS_PX = 14
+OVERVIEW_MAX_RADIUS_PX = 6
+MAX_ZOOM_RADIUS_PX = 60  # max zoom-in always reaches at least this hex radius
+
+# Above this many tiles the view repaints by bounding regions instead of per-item rects
+SMART_UPDATE_MIN_ITEMS = 1000
 
 class BoardView(QGraphicsView):
     """
@@ -24,10 +44,18 @@ class BoardView(QGraphicsView):
 
     def __init__(self, board, tile_attributes, color_map, parent=None):
         super().__init__(parent)
-        self.tile_items = []
+        self.tile_items = {}  # qr_id → TileGraphicsItem, kept in sync with the board by apply_changes
+        self.pending_moves = {}  # TileGraphicsItem → (start, end) QPointF while a move animates
+        self.move_animation = QVariantAnimation(self)
+        self.move_animation.setDuration(MOVE_ANIMATION_MS)
+        self.move_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        self.move_animation.valueChanged.connect(self.step_move_animation)
+        self.move_animation.finished.connect(self.finish_move_animation)
         self.setScene(CustomBoardScene())
         # self.setScene(self.scene)
-        self.scene().tile_selected.connect(self.tile_selected.emit) #scene.tile_selected → board_view.tile_selected → tile_sidebar.select_item_by_id
+        self.scene().tile_clicked.connect(self.on_tile_clicked) #scene.tile_clicked → selection model / board_view.tile_selected
+        self.selection_model = None  # TileSelectionModel shared with the sidebar, see set_selection_model
+        self.highlighted_ids = set()  # IDs drawn highlighted; items outside this set are never touched on a click
 
         self.board = board
         self.tile_attributes = tile_attributes
@@ -36,16 +64,22 @@ class BoardView(QGraphicsView):
         self.rendered_hex_size = self.calculate_rendered_hex_size()
         # print(self.rendered_hex_size)
 
+        self.level_of_detail = LOD_DETAIL
+        self.overview_item = BoardOverviewItem(self)
+        self.scene().addItem(self.overview_item)
+
         self.render_board()
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        # Items set their own pen and brush on every paint
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState)
 
         # cap zooming
         self.current_scale = 1.0
         self.max_scale = 3.0
         self.min_scale = 0.5
         
-        self.highlighted_item = None  # store the last tile item selected by user
+        self.update_render_settings()
 
     def set_axial_coords(self):
         """
@@ -59,26 +93,191 @@ class BoardView(QGraphicsView):
                 coords[tile.qr_id] = axial
         return coords
 
+    @profiled()
     def render_board(self):
         """
         Populates the graphics scene with tile items positioned using axial coordinates.
         """
-        self.tile_items = []  # Track all tile graphics items
+        self.clear_tiles()
 
         for tile in self.board.tiles:
-            q, r = self.axial_coords.get(tile.qr_id, (0, 0))  # Safe fallback
-            x, y = axial_to_pixel(q, r, self.rendered_hex_size)
-            color = self.resolve_tile_color(tile.qr_id)
+            self.add_tile_item(tile)
+        self.overview_item.invalidate()
+
+    def clear_tiles(self):
+        """Removes every tile item from the scene (the overview item stays)."""
+        self.finish_move_animation()
+        for item in self.tile_items.values():
+            self.scene().removeItem(item)
+        self.tile_items = {}  # Track all tile graphics items
+
+    def tile_position(self, qr_id):
+        q, r = self.axial_coords.get(qr_id, (0, 0))  # Safe fallback
+        return QPointF(*axial_to_pixel(q, r, self.rendered_hex_size))
+
+    def add_tile_item(self, tile):
+        tile_item = TileGraphicsItem(tile, self.resolve_tile_color(tile.qr_id), self.rendered_hex_size)
+        tile_item.setPos(self.tile_position(tile.qr_id))
+
+        # Optional: let tile_item know its parent view for emitting signals if needed
+        tile_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+
+        tile_item.highlighted = tile.qr_id in self.highlighted_ids
+        tile_item.setVisible(self.level_of_detail != LOD_OVERVIEW)
+        tile_item.label_item.setVisible(self.level_of_detail == LOD_DETAIL)
+        self.scene().addItem(tile_item)
+        self.tile_items[tile.qr_id] = tile_item
+        return tile_item
+
+    def remove_tile_item(self, qr_id):
+        item = self.tile_items.pop(qr_id, None)
+        if item is None:
+            return
+        self.pending_moves.pop(item, None)
+        self.scene().removeItem(item)
 
-            tile_item = TileGraphicsItem(tile, color, self.rendered_hex_size)
-            tile_item.setPos(QPointF(x, y))
+    def set_board(self, board, tile_attributes=None, changes=None):
+        """
+        Shows a new or rescanned board, reusing the existing tile items.
 
-            # Optional: let tile_item know its parent view for emitting signals if needed
-            tile_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+        Parameters:
+            board (BoardModel): The board to show.
+            tile_attributes (dict, optional): Tile metadata for the new scan; keeps the current one if omitted.
+            changes (BoardChangeSet, optional): What apply_delta changed, when board is the board already
+                shown. Only those tiles are touched; otherwise every item is reconciled by qr_id.
+        """
+        if tile_attributes is not None:
+            self.tile_attributes = tile_attributes
+        if board is self.board and changes is not None:
+            self.apply_changes(changes)
+            return
+
+        self.board = board
+        self.axial_coords = self.set_axial_coords()
+        if self.rendered_hex_size is None:
+            self.rendered_hex_size = self.calculate_rendered_hex_size()
+
+        tiles = {tile.qr_id: tile for tile in board.tiles}
+        removed = [qr_id for qr_id in self.tile_items if qr_id not in tiles]
+        added = [qr_id for qr_id in tiles if qr_id not in self.tile_items]
+        kept = [qr_id for qr_id in tiles if qr_id in self.tile_items]
+        for qr_id in kept:
+            self.tile_items[qr_id].tile = tiles[qr_id]
+        self.reconcile(added, kept, removed, recolour=kept)
+
+    @profiled()
+    def apply_changes(self, changes, recoloured=()):
+        """
+        Updates only the items named in a change set: adds, removes, animates moves and repaints
+        tiles whose colour or zone changed. Items of untouched tiles are left alone.
 
-            self.scene().addItem(tile_item)
-            self.tile_items.append(tile_item)
+        Parameters:
+            changes (BoardChangeSet): Result of BoardModel.apply_delta on the board shown.
+            recoloured (iterable[str]): Tiles whose colour attribute was edited.
+        """
+        for qr_id in list(changes.added) + list(changes.moved):
+            axial = self.board.axial_map.get(qr_id)
+            if axial is not None:
+                self.axial_coords[qr_id] = axial
+        for qr_id in changes.removed:
+            self.axial_coords.pop(qr_id, None)
+
+        refresh = list(dict.fromkeys(list(changes.reassigned) + list(recoloured)))
+        self.reconcile(changes.added, changes.moved, changes.removed, recolour=refresh)
+
+    def refresh_tiles(self, qr_ids):
+        """Repaints the given tiles after an attribute edit (colour, nickname)."""
+        for qr_id in qr_ids:
+            item = self.tile_items.get(qr_id)
+            if item is not None:
+                item.set_color(self.resolve_tile_color(qr_id))
+        self.overview_item.invalidate()
+
+    def reconcile(self, added, moved, removed, recolour=()):
+        """
+        Brings the items of the given tiles in line with the board. Moved items glide to their
+        new cell in one shared animation; everything else is updated in place.
+        """
+        if self.rendered_hex_size is None:
+            self.rendered_hex_size = self.calculate_rendered_hex_size()
+        self.finish_move_animation()
+
+        for qr_id in removed:
+            self.remove_tile_item(qr_id)
+
+        for qr_id in added:
+            tile = self.board.get_tile_by_id(qr_id)
+            if tile is not None and qr_id not in self.tile_items:
+                self.add_tile_item(tile)
+
+        for qr_id in moved:
+            item = self.tile_items.get(qr_id)
+            if item is None:
+                continue
+            item.sync_rotation()
+            target = self.tile_position(qr_id)
+            if item.pos() != target:
+                self.pending_moves[item] = (item.pos(), target)
+
+        self.refresh_tiles(recolour)
+
+        if self.pending_moves:
+            self.move_animation.setStartValue(0.0)
+            self.move_animation.setEndValue(1.0)
+            self.move_animation.start()
+        self.update_render_settings()
+
+    def step_move_animation(self, t):
+        for item, (start, end) in self.pending_moves.items():
+            item.setPos(start + (end - start) * t)
+
+    def finish_move_animation(self):
+        """Stops a running move animation and puts every item on its target."""
+        if self.move_animation.state() == QVariantAnimation.State.Running:
+            self.move_animation.stop()
+        for item, (_, end) in self.pending_moves.items():
+            item.setPos(end)
+        self.pending_moves.clear()
+        self.overview_item.invalidate()
+        self.refresh_overview_highlight()
+
+    def update_render_settings(self):
+        """
+        Chooses the level of detail for the current zoom and the viewport update mode for the
+        current item count. Called after zooming and after the board changes.
+        """
+        if self.rendered_hex_size:
+            self.max_scale = max(3.0, MAX_ZOOM_RADIUS_PX / self.rendered_hex_size)
+        self.setViewportUpdateMode(
+            QGraphicsView.ViewportUpdateMode.SmartViewportUpdate if len(self.tile_items) >= SMART_UPDATE_MIN_ITEMS
+            else QGraphicsView.ViewportUpdateMode.MinimalViewportUpdate)
+
+        radius = (self.rendered_hex_size or 0) * self.current_scale
+        if radius >= LABEL_MIN_RADIUS_PX:
+            level = LOD_DETAIL
+        elif radius >= OVERVIEW_MAX_RADIUS_PX:
+            level = LOD_OUTLINE
+        else:
+            level = LOD_OVERVIEW
+        if level != self.level_of_detail:
+            self.set_level_of_detail(level)
 
+    @profiled()
+    def set_level_of_detail(self, level):
+        """
+        detail: tiles with labels and borders. outline: tiles without labels.
+        overview: tile items hidden, the whole board drawn as batched fills without antialiasing.
+        """
+        previous, self.level_of_detail = self.level_of_detail, level
+        overview = level == LOD_OVERVIEW
+        if overview != (previous == LOD_OVERVIEW):
+            for item in self.tile_items.values():
+                item.setVisible(not overview)
+            self.overview_item.setVisible(overview)
+            self.setRenderHint(QPainter.RenderHint.Antialiasing, not overview)
+        if (level == LOD_DETAIL) != (previous == LOD_DETAIL):
+            for item in self.tile_items.values():
+                item.label_item.setVisible(level == LOD_DETAIL)
 
     def resolve_tile_color(self, qr_id):
         """
@@ -91,7 +290,7 @@ class BoardView(QGraphicsView):
             QColor: The color to use for the tile.
         """
         attr = self.tile_attributes.get(qr_id, {})
-        color_name = attr.get("color")
+        color_name = str(attr.get("color", "")).lower()  # the attribute editor stores "Red", the map uses "red"
         if color_name and color_name in self.color_map:
             return QColor(self.color_map[color_name])
         return DEFAULT_COLOR
@@ -122,6 +321,10 @@ class BoardView(QGraphicsView):
 
         return min(size_x, size_y)
     
+    def paintEvent(self, event):
+        with span("BoardView.paintEvent"):
+            super().paintEvent(event)
+
     def wheelEvent(self, event):
         zoom_in_factor = 1.15
         zoom_out_factor = 1 / zoom_in_factor
@@ -135,12 +338,48 @@ class BoardView(QGraphicsView):
 
         self.current_scale *= factor
         self.scale(factor, factor)
+        self.update_render_settings()
     
+    def set_selection_model(self, selection_model):
+        """Shares a TileSelectionModel with other views; clicks then select through it."""
+        self.selection_model = selection_model
+        selection_model.selection_changed.connect(self.on_selection_changed)
+        self.on_selection_changed(set(selection_model.selected), self.highlighted_ids - selection_model.selected)
+
+    def on_selection_changed(self, added, removed):
+        """Repaints only the tiles whose selection state changed."""
+        for qr_id in removed:
+            self.highlighted_ids.discard(qr_id)
+            item = self.tile_items.get(qr_id)
+            if item is not None:
+                item.set_highlight(False)
+        for qr_id in added:
+            self.highlighted_ids.add(qr_id)
+            item = self.tile_items.get(qr_id)
+            if item is not None:
+                item.set_highlight(True)
+        self.refresh_overview_highlight()
+
+    def refresh_overview_highlight(self):
+        self.overview_item.set_highlighted(
+            [self.tile_items[qr_id] for qr_id in self.highlighted_ids if qr_id in self.tile_items])
+
     def highlight_tile_by_id(self, tile_id: str):
-        # print(f"[DEBUG] highlight_tile_by_id: {tile_id}")
-        for item in self.tile_items:
-            item.highlighted = (item.tile.qr_id == tile_id)
-            item.update()
+        """Highlights a single tile, un-highlighting only the previously highlighted ones."""
+        if self.selection_model is not None:
+            self.selection_model.select(tile_id)
+        else:
+            self.on_selection_changed({tile_id} - self.highlighted_ids, self.highlighted_ids - {tile_id})
+
+    def tile_at_scene_pos(self, pos):
+        """Tile under a scene position, found from axial coordinates rather than item hit tests."""
+        if not self.rendered_hex_size:
+            return None
+        size = self.rendered_hex_size
+        q = (2 / 3 * pos.x()) / size
+        r = (-1 / 3 * pos.x() + math.sqrt(3) / 3 * pos.y()) / size
+        cell = tuple(axial_round([q], [r])[0].tolist())
+        return self.board.tile_at(cell)
 
     # def handle_tile_selected(self, tile: Tile):
     #     print(f"[DEBUG] handle_tile_selected: {tile.qr_id}")
@@ -153,9 +392,12 @@ class BoardView(QGraphicsView):
         # print(f"[DEBUG] handle_tile_selected: {tile.qr_id}")
         self.highlight_tile_by_id(tile.qr_id)
 
-    def on_tile_clicked(self, tile: Tile):  # now receives the full Tile
+    def on_tile_clicked(self, tile: Tile, modifiers=Qt.KeyboardModifier.NoModifier):  # now receives the full Tile
         # print(f"[DEBUG] on_tile_selected: {tile.qr_id}")
-        self.highlight_tile_by_id(tile.qr_id)
+        if self.selection_model is not None:
+            self.selection_model.select(tile.qr_id, mode_for_modifiers(modifiers))
+        else:
+            self.highlight_tile_by_id(tile.qr_id)
         self.tile_selected.emit(tile)  # emit Tile object instead of ID
 
 
@@ -180,6 +422,46 @@ def axial_to_pixel(q, r, rendered_hex_size):
     return x, y
 
 
+def hexagon_points(size, rotation_deg=0):
+    """The six corners of a hexagon of radius `size` centred on the origin, turned by rotation_deg."""
+    rotation_rad = math.radians(rotation_deg)
+    return [QPointF(size * math.cos(math.radians(60 * i) + rotation_rad),
+                    size * math.sin(math.radians(60 * i) + rotation_rad)) for i in range(6)]
+
+
+def hexagon_path(size, rotation_deg=0):
+    """
+    Shared hexagon outline for tiles of this size and rotation. A hexagon turned by 60° is the
+    same shape, so rotations are reduced mod 60 and every snapped rotation shares one path per size.
+    Callers must not modify the returned path.
+    """
+    return _hexagon_path(float(size), round(rotation_deg % 60, 3))
+
+
+@lru_cache(maxsize=64)
+def _hexagon_path(size, rotation_deg):
+    path = QPainterPath()
+    points = hexagon_points(size, rotation_deg)
+    path.moveTo(points[0])
+    for point in points[1:]:
+        path.lineTo(point)
+    path.closeSubpath()
+    return path
+
+
+@lru_cache(maxsize=256)
+def cached_brush(rgba):
+    return QBrush(QColor.fromRgba(rgba))
+
+
+@lru_cache(maxsize=64)
+def cached_pen(rgba, width):
+    """Pen of the given colour and width; width 0 means no outline."""
+    if width == 0:
+        return QPen(Qt.PenStyle.NoPen)
+    return QPen(QColor.fromRgba(rgba), width)
+
+
 
 class TileGraphicsItem(QGraphicsItem):
     """
@@ -217,16 +499,49 @@ class TileGraphicsItem(QGraphicsItem):
         self.highlighted = False
         self.setAcceptHoverEvents(True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
-        
+
+        # Geometry and paint objects are shared between tiles; the item is painted once into a
+        # device-resolution cache and only repainted when it changes or the zoom level does
+        self.path = hexagon_path(size, rotation_deg)
+        margin = max(HIGHLIGHT_WIDTH, ANCHOR_BORDER_WIDTH) / 2
+        self.bounds = self.path.boundingRect().adjusted(-margin, -margin, margin, margin)
+        self.brush = cached_brush(color.rgba())
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.label_item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
     def boundingRect(self):
         """
         Returns the bounding rectangle for the tile item.
 
         Returns:
-            QRectF: The bounding rectangle.
+            QRectF: The bounding rectangle (the hexagon plus half the widest border).
         """
-        return QRectF(-self.size, -self.size, 2 * self.size, 2 * self.size)
+        return self.bounds
+
+    def shape(self):
+        """Hexagon outline, so clicks in the corners between tiles hit the right tile."""
+        return self.path
+
+    def current_pen(self):
+        # Border priority: highlighted > anchor > none
+        if self.highlighted:
+            return cached_pen(HIGHLIGHT_COLOR.rgba(), HIGHLIGHT_WIDTH)
+        if isinstance(self.tile, AnchorTile):
+            return cached_pen(ANCHOR_BORDER_COLOR.rgba(), ANCHOR_BORDER_WIDTH)
+        return cached_pen(0, 0)
+
+    def set_color(self, color):
+        if color != self.color:
+            self.color = color
+            self.brush = cached_brush(color.rgba())
+            self.update()
+
+    def sync_rotation(self):
+        """Re-reads the tile's rotation (after a rescan moved or turned it) and repaints if it changed."""
+        rotation_deg = self.tile.attributes.get("rotation", 0)
+        if rotation_deg != self.label_item.rotation():
+            self.label_item.setRotation(rotation_deg)
+            self.update()
 
     def set_highlight(self, state: bool):
         # print(f"[DEBUG] set_highlight: {self.tile.qr_id}")
@@ -243,45 +558,92 @@ class TileGraphicsItem(QGraphicsItem):
             option (QStyleOptionGraphicsItem): Style options.
             widget (QWidget): Optional widget reference.
         """
-        points = self.create_hexagon_points()
-
-        # Construct hexagon path
-        path = QPainterPath()
-        if points:
-            path.moveTo(points[0])
-            for point in points[1:]:
-                path.lineTo(point)
-            path.closeSubpath()
-
-        # Fill
-        painter.setBrush(QBrush(self.color))
-
-        # Border priority: highlighted > anchor > none
-        if self.highlighted:
-            painter.setPen(QPen(QColor("red"), 3))
-        elif isinstance(self.tile, AnchorTile):
-            painter.setPen(QPen(ANCHOR_BORDER_COLOR, ANCHOR_BORDER_WIDTH))
-        else:
-            painter.setPen(QPen(Qt.PenStyle.NoPen))
-
-        # Draw the hexagon
-        painter.drawPath(path)
+        painter.setBrush(self.brush)
+        painter.setPen(self.current_pen())
+        painter.drawPath(self.path)
 
     def create_hexagon_points(self):
-        rotation_deg = self.tile.attributes.get("rotation", 0)
-        rotation_rad = math.radians(rotation_deg)
-
-        points = []
-        for i in range(6):
-            angle_rad = math.radians(60 * i) + rotation_rad
-            x = self.size * math.cos(angle_rad)
-            y = self.size * math.sin(angle_rad)
-            points.append(QPointF(x, y))
-        return points
+        return hexagon_points(self.size, self.tile.attributes.get("rotation", 0))
     
     def mousePressEvent(self, event):
         # print(f"[DEBUG] Tile on board clicked: {self.tile.qr_id}")
         scene = self.scene()
         if hasattr(scene, 'tile_was_clicked'):
             # print(f"[DEBUG] Calling tile_was_clicked for: {self.tile.qr_id}")
-            scene.tile_was_clicked(self.tile)
\ No newline at end of file
+            scene.tile_was_clicked(self.tile, event.modifiers())
+
+
+class BoardOverviewItem(QGraphicsItem):
+    """
+    Zoomed-out stand-in for every TileGraphicsItem: one filled path per colour, so the whole board
+    costs a handful of draw calls. Rebuilt lazily after the board or colours change.
+
+    Parameters:
+        view (BoardView): The view whose tile items it summarises.
+    """
+
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+        self.paths = []  # (brush, QPainterPath)
+        self.highlight_path = QPainterPath()
+        self.highlight_pen = QPen(HIGHLIGHT_COLOR, HIGHLIGHT_WIDTH)
+        self.highlight_pen.setCosmetic(True)  # stays visible however far out the view is zoomed
+        self.bounds = QRectF()
+        self.dirty = True
+        self.setVisible(False)
+        self.setZValue(-1)
+
+    def invalidate(self):
+        self.dirty = True
+        if self.isVisible():
+            self.rebuild()
+
+    @profiled("BoardOverviewItem.rebuild")
+    def rebuild(self):
+        self.prepareGeometryChange()
+        by_color = {}
+        for item in self.view.tile_items.values():
+            polygon = by_color.get(item.color.rgba())
+            if polygon is None:
+                polygon = by_color[item.color.rgba()] = QPainterPath()
+            polygon.addPath(item.path.translated(item.pos()))
+        self.paths = [(cached_brush(rgba), path) for rgba, path in by_color.items()]
+        self.bounds = QRectF()
+        for _, path in self.paths:
+            self.bounds = self.bounds.united(path.boundingRect())
+        margin = HIGHLIGHT_WIDTH
+        self.bounds.adjust(-margin, -margin, margin, margin)
+        self.dirty = False
+        self.update()
+
+    def set_highlighted(self, items):
+        self.highlight_path = QPainterPath()
+        for item in items:
+            self.highlight_path.addPath(item.path.translated(item.pos()))
+        self.update()
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.GraphicsItemChange.ItemVisibleHasChanged and value and self.dirty:
+            self.rebuild()
+        return super().itemChange(change, value)
+
+    def boundingRect(self):
+        return self.bounds
+
+    def paint(self, painter, option, widget):
+        painter.setPen(cached_pen(0, 0))
+        for brush, path in self.paths:
+            painter.setBrush(brush)
+            painter.drawPath(path)
+        if not self.highlight_path.isEmpty():
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.setPen(self.highlight_pen)
+            painter.drawPath(self.highlight_path)
+
+    def mousePressEvent(self, event):
+        tile = self.view.tile_at_scene_pos(event.scenePos())
+        scene = self.scene()
+        if tile is not None and hasattr(scene, 'tile_was_clicked'):
+            scene.tile_was_clicked(tile, event.modifiers())
+
@@ -0,0 +1,127 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton,
+                             QCheckBox, QFileDialog, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer
+from core.profiling import PROFILER
+
+REFRESH_INTERVAL_MS = 1000
+
+
+class DiagnosticsPanel(QWidget):
+    """
+    Shows the profiler's span timings, counters and memory snapshots (core.profiling), and
+    exports them as JSON or as a Chrome trace.
+
+    Refreshes once a second while visible and profiling is enabled; it costs nothing otherwise.
+
+    Parameters:
+        profiler (Profiler): Defaults to the process-wide PROFILER.
+    """
+
+    def __init__(self, profiler=PROFILER, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+
+        self.enable_checkbox = QCheckBox("Profiling enabled")
+        self.enable_checkbox.setChecked(profiler.enabled)
+        self.enable_checkbox.toggled.connect(self.set_enabled)
+
+        self.memory_checkbox = QCheckBox("Trace memory")
+        self.memory_checkbox.setToolTip("Track Python allocations with tracemalloc (slows the app down)")
+        self.memory_checkbox.toggled.connect(self.set_enabled)
+
+        snapshot_button = QPushButton("Memory Snapshot")
+        snapshot_button.clicked.connect(self.take_memory_snapshot)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        export_json_button = QPushButton("Export JSON")
+        export_json_button.clicked.connect(self.export_json)
+        export_trace_button = QPushButton("Export Chrome Trace")
+        export_trace_button.clicked.connect(self.export_chrome_trace)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.enable_checkbox)
+        controls.addWidget(self.memory_checkbox)
+        controls.addStretch(1)
+        for button in (snapshot_button, reset_button, export_json_button, export_trace_button):
+            controls.addWidget(button)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Name", "Calls", "Total (ms)", "Mean (ms)", "Max (ms)"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.spans_root = QTreeWidgetItem(self.tree, ["Spans"])
+        self.counters_root = QTreeWidgetItem(self.tree, ["Counters"])
+        self.memory_root = QTreeWidgetItem(self.tree, ["Memory"])
+        for root in (self.spans_root, self.counters_root, self.memory_root):
+            root.setExpanded(True)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.tree)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self._poll)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def _poll(self):
+        # Nothing new is recorded while profiling is off, so skip the tree rebuild
+        if self.profiler.enabled:
+            self.refresh()
+
+    def set_enabled(self, _=None):
+        if self.enable_checkbox.isChecked():
+            self.profiler.enable(trace_memory=self.memory_checkbox.isChecked())
+        else:
+            self.profiler.disable()
+
+    def take_memory_snapshot(self):
+        if not self.profiler.enabled:
+            self.enable_checkbox.setChecked(True)
+        self.profiler.snapshot_memory(f"manual {len(self.profiler.memory) + 1}")
+        self.refresh()
+
+    def reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def refresh(self):
+        """Rebuilds the tree from the profiler summary (a few dozen rows, so a rebuild is cheap)."""
+        summary = self.profiler.summary()
+
+        self.spans_root.takeChildren()
+        for name, stats in summary["spans"].items():
+            QTreeWidgetItem(self.spans_root, [name, str(stats["calls"]), f"{stats['total_ms']:.1f}",
+                                              f"{stats['mean_ms']:.2f}", f"{stats['max_ms']:.2f}"])
+
+        self.counters_root.takeChildren()
+        for name, value in sorted(summary["counters"].items()):
+            QTreeWidgetItem(self.counters_root, [name, str(value)])
+
+        self.memory_root.takeChildren()
+        for snapshot in summary["memory"]:
+            current = snapshot["current"]
+            text = f"{current / 2**20:.1f} MiB" if current is not None else "n/a"
+            QTreeWidgetItem(self.memory_root, [f"{snapshot['label']} @ {snapshot['time']:.1f}s", text])
+
+        for item in (self.spans_root, self.counters_root, self.memory_root):
+            item.setText(1, str(item.childCount()))
+
+    def export_json(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "profile.json", "JSON Files (*.json)")
+        if file_path:
+            self.profiler.save_json(file_path)
+
+    def export_chrome_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "trace.json",
+                                                   "Trace Files (*.json)")
+        if file_path:
+            self.profiler.save_chrome_trace(file_path)
@@ -1,14 +1,20 @@
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QDockWidget,QFileDialog, QApplication, QDialog
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QDockWidget,QFileDialog, QApplication, QDialog, QProgressBar, QPushButton
 from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtGui import QPainter, QAction
-from PyQt6.QtCore import QRectF, QPointF, Qt, QTimer
+from PyQt6.QtGui import QPainter, QAction, QPixmap
+from PyQt6.QtCore import QRectF, QPointF, Qt, QTimer, QThreadPool, QBuffer, QIODevice
 from gui.board_view import BoardView
 from gui.tile_sidebar import TileSidebar
 from gui.scanned_board_view import ScannedBoardView
 from gui.attribute_editor import AttributeEditor
+from gui.diagnostics_panel import DiagnosticsPanel
+from gui.scan_worker import ScanWorker
+from gui.selection_model import TileSelectionModel
 from gui.relationship_visualization.visualization_widget import RelationshipVisualizationWidget
 from core.board_scanner import cv2_to_pixmap
 from core.camera_utils import capture_image
+from core.board_snapshot import save_board, load_board, scan_metadata, THUMBNAIL_MAX_SIDE, THUMBNAIL_JPEG_QUALITY
+from core.tile_model import create_tile
+from core.asset_loader import adopt_tile_data
 
 class MainWindow(QMainWindow):
     """
@@ -21,7 +27,14 @@ class MainWindow(QMainWindow):
     """
     def __init__(self, board, tile_data, color_map, xray_img, mock_board):
         super().__init__()
-        self.mock_board = mock_board #allows function call in main.py during runtime.
+        self.mock_board = mock_board #allows function call in main.py during runtime. Runs on the scan pool, see start_scan
+        self.board = board
+
+        # Scans run one at a time off the GUI thread; only the latest job's result is applied
+        self.scan_pool = QThreadPool(self)
+        self.scan_pool.setMaxThreadCount(1)
+        self.scan_worker = None
+        self.scan_job_id = 0
         self.setWindowTitle("Regroup")
 
         self.init_attribute_editor(tile_data, board)
@@ -30,14 +43,17 @@ class MainWindow(QMainWindow):
         self.init_board_view(board, tile_data, color_map)
         self.init_relationship_visualization_pane(board)
 
-        self.tile_sidebar.tile_selected.connect(self.board_view.handle_tile_selected)
-        self.tile_sidebar.tile_selected.connect(self.attribute_editor.set_tile)
-        
-        self.board_view.tile_selected.connect(self.tile_sidebar.select_item_by_id)
-        self.board_view.tile_selected.connect(self.attribute_editor.set_tile)
-        self.board_view.tile_selected.connect(self.board_view.handle_tile_selected)
+        # Board view and sidebar select through one model; each repaints only the tiles that changed
+        self.selection_model = TileSelectionModel(self)
+        self.board_view.set_selection_model(self.selection_model)
+        self.tile_sidebar.set_selection_model(self.selection_model)
+        self.selection_model.current_changed.connect(self.on_current_tile_changed)
+        self.attribute_editor.attributes_changed.connect(lambda qr_id: self.board_view.refresh_tiles([qr_id]))
+        self.attribute_editor.attributes_changed.connect(lambda qr_id: self.tile_sidebar.refresh_tiles([qr_id]))
 
         self.init_scanned_board_view(xray_img)
+        self.init_diagnostics_dock()
+        self.init_scan_status()
 
         self.init_menu()
 
@@ -47,7 +63,7 @@ class MainWindow(QMainWindow):
 
     def init_tile_sidebar(self, tile_data, board, attribute_editor):
 
-        self.tile_sidebar = TileSidebar(tile_data, board.tiles, attribute_editor)  # your existing QWidget subclass
+        self.tile_sidebar = TileSidebar(tile_data, board, attribute_editor)  # your existing QWidget subclass
 
         self.tile_menu_dock = QDockWidget("Tiles", self)
         self.tile_menu_dock.setWidget(self.tile_sidebar)
@@ -97,6 +113,31 @@ class MainWindow(QMainWindow):
         # print("[DEBUG] xray_dock DockWidget added")
 
 
+    def init_diagnostics_dock(self):
+        # Profiler timings (core.profiling); hidden until opened from the View menu
+        self.diagnostics_panel = DiagnosticsPanel()
+        self.diagnostics_dock = QDockWidget("Diagnostics", self)
+        self.diagnostics_dock.setWidget(self.diagnostics_panel)
+        self.diagnostics_dock.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetClosable |
+            QDockWidget.DockWidgetFeature.DockWidgetMovable |
+            QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.diagnostics_dock)
+        self.diagnostics_dock.hide()
+
+    def init_scan_status(self):
+        # Scan progress and cancel button in the status bar, shown while a scan runs
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setRange(0, 100)
+        self.scan_progress.setMaximumWidth(200)
+        self.scan_cancel_button = QPushButton("Cancel")
+        self.scan_cancel_button.clicked.connect(self.cancel_scan)
+        self.statusBar().addPermanentWidget(self.scan_progress)
+        self.statusBar().addPermanentWidget(self.scan_cancel_button)
+        self.scan_progress.hide()
+        self.scan_cancel_button.hide()
+
     def init_menu(self):
         menubar = self.menuBar()
 
@@ -107,6 +148,14 @@ class MainWindow(QMainWindow):
         save_action.triggered.connect(self.tile_sidebar.save_tile_data)
         file_menu.addAction(save_action)
 
+        save_board_action = QAction("Save Board…", self)
+        save_board_action.triggered.connect(self.save_board)
+        file_menu.addAction(save_board_action)
+
+        open_board_action = QAction("Open Board…", self)
+        open_board_action.triggered.connect(self.open_board)
+        file_menu.addAction(open_board_action)
+
         camera_action = QAction("Open Camera", self)
         camera_action.triggered.connect(self.open_camera_widget)
         file_menu.addAction(camera_action)
@@ -143,17 +192,19 @@ class MainWindow(QMainWindow):
         toggle_xray = self.xray_dock.toggleViewAction()
         toggle_attribute_editor = self.attribute_dock.toggleViewAction()
         toggle_relationship_pane = self.relationship_dock.toggleViewAction()
+        toggle_diagnostics = self.diagnostics_dock.toggleViewAction()
 
         view_menu.addAction(toggle_board)
         view_menu.addAction(toggle_sidebar)
         view_menu.addAction(toggle_xray)
         view_menu.addAction(toggle_attribute_editor)
         view_menu.addAction(toggle_relationship_pane)
+        view_menu.addAction(toggle_diagnostics)
 
     def defer_resize_docks(self):
         self.resizeDocks(
             [self.tile_menu_dock, self.xray_dock],
-            [self.width() * 0.25, self.width() * 0.25],
+            [int(self.width() * 0.25), int(self.width() * 0.25)],
             Qt.Orientation.Horizontal
         )
 
@@ -196,6 +247,15 @@ class MainWindow(QMainWindow):
         painter.end()
 
 
+    def on_current_tile_changed(self, qr_id):
+        """Shows the most recently selected tile in the attribute editor."""
+        if not qr_id:
+            return
+        # Tiles not on the board get a placeholder over their catalogue entry so it can still be edited
+        tile = self.board.get_tile_by_id(qr_id) or create_tile(
+            qr_id, (0.0, 0.0), self.attribute_editor.tile_data.setdefault(qr_id, {}))
+        self.attribute_editor.set_tile(tile)
+
     def init_attribute_editor(self, tile_data, board):
         self.attribute_editor = AttributeEditor(tile_data, board)
         self.attribute_dock = QDockWidget("Attributes", self)
@@ -221,13 +281,10 @@ class MainWindow(QMainWindow):
     def expand_relationship_dock(self):
         self.relationship_dock.setMaximumHeight(1000)  
         self.relationship_dock.setMinimumHeight(70)
-        self.relationship_dock.setFixedHeight(self.height() * 0.25)
+        self.relationship_dock.setFixedHeight(int(self.height() * 0.25))
 
    
     def open_camera_widget(self):
-        """
-        This function currently doesn't work
-        """
         # save tile data before scanning
         self.tile_sidebar.save_tile_data()
 
@@ -235,10 +292,149 @@ class MainWindow(QMainWindow):
         img = capture_image()
 
         if img is not None:
-            try:
-                new_board, new_tile_data = self.mock_board(img)
-                self.board = new_board
-                self.tile_sidebar.update_board(new_board, new_tile_data) #need to write update_board() in tile_sidebar.py
-                
-            except Exception as e:
-                print(f"Failed to process image: {e}")
\ No newline at end of file
+            self.start_scan(img)
+
+    def start_scan(self, img):
+        """
+        Scans img on the scan pool (gui.scan_worker). A scan already running is cancelled and its
+        result ignored; the window keeps repainting and the status bar shows progress.
+        """
+        self.cancel_scan()
+        self.scan_job_id += 1
+        worker = ScanWorker(self.scan_job_id, self.mock_board, img, self.board)
+        worker.signals.progress.connect(self.on_scan_progress)
+        worker.signals.finished.connect(self.on_scan_finished)
+        worker.signals.failed.connect(self.on_scan_failed)
+        worker.signals.cancelled.connect(self.on_scan_cancelled)
+        self.scan_worker = worker
+
+        self.scan_progress.setValue(0)
+        self.scan_progress.show()
+        self.scan_cancel_button.show()
+        self.statusBar().showMessage("Scanning…")
+        self.scan_pool.start(worker)
+
+    def cancel_scan(self):
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.scan_worker = None
+        self.scan_progress.hide()
+        self.scan_cancel_button.hide()
+
+    def on_scan_progress(self, percent, message):
+        if self.scan_worker is None or self.sender() is not self.scan_worker.signals:
+            return  # progress of a cancelled scan
+        self.scan_progress.setValue(percent)
+        self.statusBar().showMessage(message)
+
+    def on_scan_finished(self, result):
+        """
+        Applies a finished scan in one step on the GUI thread: the board (new, or the current one
+        updated with apply_delta), then every view that shows it.
+        """
+        if result.job_id != self.scan_job_id:
+            return  # superseded by a newer scan
+        self.scan_worker = None
+        self.scan_progress.hide()
+        self.scan_cancel_button.hide()
+
+        changes = None
+        tile_data = result.tile_data
+        if result.delta is not None:
+            # Keep the tile data the views edit; surviving tiles still point at its dicts
+            tile_data = adopt_tile_data(self.attribute_editor.tile_data, result.tile_data, result.delta[0])
+            changes = result.board.apply_delta(*result.delta)
+            summary = f"{len(changes.touched())} tiles changed"
+        else:
+            if self.board is not None:
+                # A rescan that could not be registered against the board was rebuilt from scratch
+                tile_data = adopt_tile_data(self.attribute_editor.tile_data, result.tile_data, result.board.tiles)
+            summary = f"{len(result.board.tiles)} tiles"
+
+        self.show_board(result.board, tile_data, changes)
+        self.xray_view.set_pixmap(QPixmap.fromImage(result.xray_image))
+
+        self.statusBar().showMessage(f"Scan finished in {result.elapsed:.1f}s: {summary}", 5000)
+
+    def show_board(self, board, tile_data, changes=None):
+        """
+        Makes board the current board in every view that shows it.
+
+        Parameters:
+            changes (BoardChangeSet, optional): What apply_delta changed, so the board view repaints
+                only those tiles; None redraws everything.
+        """
+        self.board = board
+        self.attribute_editor.tile_data = tile_data
+        self.attribute_editor.board = board
+        self.tile_sidebar.update_board(board, tile_data)
+        self.board_view.set_board(board, tile_data, changes)
+        self.relationship_pane.set_board(board)
+
+    def save_board(self):
+        """
+        Saves the current board as a snapshot (core.board_snapshot) with a thumbnail of the
+        x-ray view. ".board.npz" is the fast columnar variant, ".json" the readable one.
+        """
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Board", "board.board.npz", "Board Snapshots (*.npz);;JSON Files (*.json)")
+        if not file_path:
+            return  # User canceled
+        if not file_path.endswith((".npz", ".json")):
+            file_path += ".board.npz"
+
+        thumbnail = None
+        pixmap = self.xray_view.original_pixmap
+        if pixmap is not None and not pixmap.isNull():
+            pixmap = pixmap.scaled(THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE, Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+            buffer = QBuffer()
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            pixmap.save(buffer, "JPG", THUMBNAIL_JPEG_QUALITY)
+            thumbnail = bytes(buffer.data())
+
+        try:
+            save_board(self.board, file_path, scan_metadata(), thumbnail)
+        except OSError as e:
+            self.statusBar().showMessage(f"Failed to save board: {e}")
+            return
+        self.statusBar().showMessage(f"Saved {len(self.board.tiles)} tiles to {file_path}", 5000)
+
+    def open_board(self):
+        """
+        Opens a saved board snapshot in place of the current board, without rescanning. A scan
+        still running is cancelled so its result cannot replace the opened board.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Board", "", "Board Snapshots (*.npz *.json)")
+        if not file_path:
+            return  # User canceled
+
+        self.cancel_scan()
+        try:
+            snapshot = load_board(file_path, tile_data=self.attribute_editor.tile_data)
+        except (OSError, ValueError, KeyError) as e:
+            self.statusBar().showMessage(f"Failed to open board: {e}")
+            return
+
+        self.show_board(snapshot.board, self.attribute_editor.tile_data)
+        pixmap = QPixmap()
+        if snapshot.thumbnail and pixmap.loadFromData(snapshot.thumbnail):
+            self.xray_view.set_pixmap(pixmap)
+        else:
+            self.xray_view.set_pixmap(None)
+        self.statusBar().showMessage(f"Opened {len(snapshot.board.tiles)} tiles from {file_path}", 5000)
+
+    def on_scan_failed(self, message):
+        if self.scan_worker is not None and self.sender() is self.scan_worker.signals:
+            self.cancel_scan()
+            self.statusBar().showMessage(f"Failed to process image: {message}")
+
+    def on_scan_cancelled(self):
+        self.statusBar().showMessage("Scan cancelled", 3000)
+
+    def closeEvent(self, event):
+        self.cancel_scan()
+        self.scan_pool.waitForDone()
+        self.relationship_pane.shutdown()
+        super().closeEvent(event)
@@ -0,0 +1,250 @@
+import threading
+from dataclasses import dataclass
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from core.profiling import span
+
+"""
+Off-thread rendering for the relationship visualization tabs.
+
+A tab renders in three steps:
+    snapshot(board)         GUI thread. Copies what the visualization needs out of the live board,
+                            so the worker never reads a board the GUI thread may be updating.
+    compute_layout(snap)    Worker. Positions, sets, anything independent of the output size.
+    draw(figure, layout)    Worker. Draws into a private matplotlib Figure rendered by Agg.
+
+The layout is kept, so a resize only re-runs draw(). The last finished image stays on screen
+until a newer one arrives. Jobs are numbered; a new request or a board change cancels the
+running job (at its next stage boundary) and results from older jobs are dropped.
+
+Only the visible tab renders; hidden tabs are marked stale and render when shown.
+"""
+
+RESIZE_DEBOUNCE_MS = 150
+
+_POOL = None
+
+
+def render_pool():
+    """One shared thread: renders are serialized, and matplotlib is never used from two threads at once."""
+    global _POOL
+    if _POOL is None:
+        _POOL = QThreadPool()
+        _POOL.setMaxThreadCount(1)
+    return _POOL
+
+
+class RenderCancelled(Exception):
+    """Raised by RenderWorker.check() once cancel() was called."""
+
+
+@dataclass
+class RenderResult:
+    """
+    Attributes:
+        job_id (int): Echo of the request; stale results are dropped by the tab.
+        layout (object): compute_layout() output, reused for redraws at a new size.
+        image (QImage): Rendered figure.
+    """
+    job_id: int
+    layout: object
+    image: QImage
+
+
+class RenderSignals(QObject):
+    finished = pyqtSignal(object)  # RenderResult
+    failed = pyqtSignal(int, str)  # job_id, message
+
+
+class RenderWorker(QRunnable):
+    """
+    Lays out (unless a layout is given) and draws one visualization.
+
+    Parameters:
+        job_id (int): Increasing ID, echoed in the result.
+        tab (AsyncFigureTab): Supplies compute_layout and draw; its widgets are not touched.
+        snapshot (object): snapshot() output, used when layout is None.
+        layout (object, optional): Cached layout to draw again.
+        size (tuple): Output (width, height) in device pixels.
+        dpi (float): Figure resolution.
+    """
+
+    def __init__(self, job_id, tab, snapshot, layout, size, dpi):
+        super().__init__()
+        self.job_id = job_id
+        self.compute_layout = tab.compute_layout
+        self.draw = tab.draw
+        self.name = type(tab).__name__
+        self.snapshot = snapshot
+        self.layout = layout
+        self.size = size
+        self.dpi = dpi
+        self.signals = RenderSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise RenderCancelled()
+
+    def run(self):
+        try:
+            self.check()
+            layout = self.layout
+            if layout is None:
+                with span(f"{self.name}.compute_layout"):
+                    layout = self.compute_layout(self.snapshot)
+                self.check()
+
+            width, height = self.size
+            with span(f"{self.name}.draw", width=width, height=height):
+                figure = Figure(figsize=(width / self.dpi, height / self.dpi), dpi=self.dpi)
+                canvas = FigureCanvasAgg(figure)
+                self.draw(figure, layout)
+                self.check()
+                canvas.draw()
+                pixels = np.asarray(canvas.buffer_rgba())  # (height, width, 4), may differ from size by rounding
+                image = QImage(pixels.tobytes(), pixels.shape[1], pixels.shape[0], pixels.shape[1] * 4,
+                               QImage.Format.Format_RGBA8888)
+        except RenderCancelled:
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, f"{type(e).__name__}: {e}")
+            return
+        self.signals.finished.emit(RenderResult(self.job_id, layout, image))
+
+
+class AsyncFigureTab(QWidget):
+    """
+    Base for visualization tabs rendered by RenderWorker. Subclasses implement snapshot,
+    compute_layout and draw (see the module docstring); the last two run off the GUI thread
+    and must only use their arguments.
+
+    Parameters:
+        board (BoardModel): Board to visualize.
+        title (str, optional): Caption shown above the figure.
+    """
+
+    def __init__(self, board, title=None, parent=None):
+        super().__init__(parent)
+        self.board = board
+        self.job_id = 0
+        self.worker = None
+        self.layout_cache = None  # layout of the image on screen
+        self.stale = True  # board changed since the last render request
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.image_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.status_label = QLabel()
+        self.status_label.setVisible(False)
+
+        layout = QVBoxLayout()
+        if title:
+            layout.addWidget(QLabel(title))
+        layout.addWidget(self.status_label)
+        layout.addWidget(self.image_label, stretch=1)
+        self.setLayout(layout)
+
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(lambda: self.request_render(relayout=False))
+
+    def snapshot(self, board):
+        raise NotImplementedError
+
+    def compute_layout(self, snapshot):
+        raise NotImplementedError
+
+    def draw(self, figure, layout):
+        raise NotImplementedError
+
+    def set_board(self, board):
+        """Shows a board: renders now if the tab is visible, otherwise when it is next shown."""
+        self.board_changed(board)
+        self.stale = True
+        if self.isVisible():
+            self.request_render()
+
+    def board_changed(self, board):
+        """
+        Cancels any render of the previous board. The current image stays on screen until
+        the next set_board (the "Update Visualizations" button).
+        """
+        self.board = board
+        self.cancel()
+
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self.status_label.setVisible(False)
+
+    def request_render(self, relayout=True):
+        """
+        Parameters:
+            relayout (bool): Recompute the layout from a fresh snapshot; False redraws the
+                cached layout (e.g. at a new size).
+        """
+        if self.board is None:
+            return
+        if not relayout and self.worker is not None and self.worker.layout is None:
+            relayout = True  # a layout for a newer board is in flight; restart it at the new size
+        if not relayout and self.layout_cache is None:
+            return  # nothing drawn yet; the pending full render will use the new size
+        self.cancel()
+        self.job_id += 1
+        ratio = self.devicePixelRatioF()
+        size = self.image_label.size()
+        device_size = (max(int(size.width() * ratio), 50), max(int(size.height() * ratio), 50))
+        with span(f"{type(self).__name__}.snapshot"):
+            snapshot = self.snapshot(self.board) if relayout else None
+        self.stale = False
+
+        self.worker = RenderWorker(self.job_id, self, snapshot, None if relayout else self.layout_cache,
+                                   device_size, 100 * ratio)
+        self.worker.signals.finished.connect(self.on_render_finished)
+        self.worker.signals.failed.connect(self.on_render_failed)
+        self.status_label.setText("Updating…")
+        self.status_label.setVisible(True)
+        render_pool().start(self.worker)
+
+    def on_render_finished(self, result):
+        if result.job_id != self.job_id:
+            return  # superseded
+        self.worker = None
+        self.status_label.setVisible(False)
+        self.layout_cache = result.layout
+        ratio = self.devicePixelRatioF()
+        result.image.setDevicePixelRatio(ratio)
+        self.image_label.setPixmap(QPixmap.fromImage(result.image))
+        if abs(result.image.width() - self.image_label.width() * ratio) > 2:
+            self.resize_timer.start()  # the label was resized while this was rendering
+
+    def on_render_failed(self, job_id, message):
+        if job_id != self.job_id:
+            return
+        self.worker = None
+        self.status_label.setText(f"Could not render: {message}")
+        self.status_label.setVisible(True)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.stale:
+            QTimer.singleShot(0, self.render_if_stale)  # after the layout has sized the label
+
+    def render_if_stale(self):
+        if self.stale and self.isVisible():
+            self.request_render()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.layout_cache is not None:
+            self.resize_timer.start()
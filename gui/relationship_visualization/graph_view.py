@@ -1,58 +1,70 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection
+from core.graph_layout import GraphLayout
+from .async_render import AsyncFigureTab
 
+# Above this many nodes, labels are only drawn if each node is at least this many pixels wide
+LABEL_NODE_LIMIT = 300
+LABEL_MIN_NODE_PX = 18
 
-class GraphViewTab(QWidget):
-    def __init__(self, board):
-        super().__init__()
-
-        layout = QVBoxLayout()
-        self.setLayout(layout)
-
-        self.figure = Figure(figsize=(5, 4), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.canvas.updateGeometry()
 
-        self.set_graph(board)
-
-        layout.addWidget(QLabel("Hierarchy Graph View"))
-        layout.addWidget(self.canvas)
+class GraphViewTab(AsyncFigureTab):
+    """
+    Tile adjacency graph. Node positions come from core.graph_layout (seeded from the tiles'
+    axial coordinates, incremental, cached per board snapshot) and are drawn as one
+    LineCollection for the edges and one scatter for the nodes, on the render thread
+    (see async_render).
+    """
 
+    def __init__(self, board):
+        self.layout_engine = GraphLayout()
+        super().__init__(board, title="Hierarchy Graph View")
 
-    def set_graph(self, board):
-        self.board = board
-        self.draw_graph()
+    def snapshot(self, board):
+        """Node IDs, axial cells, index edges and icon labels, copied on the GUI thread."""
+        adjacency_map = board.adjacency_map  # {tile_id: [neighbor_tile_ids]}
+        axial_map = board.axial_map
+        ids = [tile_id for tile_id in adjacency_map if tile_id in axial_map]
+        index = {tile_id: i for i, tile_id in enumerate(ids)}
+        axial = np.array([axial_map[tile_id] for tile_id in ids], dtype=np.int64).reshape(-1, 2)
+        edges = np.array([(index[tile_id], index[n]) for tile_id in ids for n in adjacency_map[tile_id]
+                          if n in index and index[tile_id] < index[n]], dtype=np.int64).reshape(-1, 2)
 
-    def draw_graph(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.clear()
+        # Build label list from tile.icon()
+        labels = []
+        for tile_id in ids:
+            tile = board.get_tile_by_id(tile_id)
+            labels.append(tile.icon() if tile else tile_id)  # fallback to ID
+        return ids, axial, edges, labels
 
-        G = nx.Graph()
-        adjacency_map = self.board.adjacency_map  # {tile_id: [neighbor_tile_ids]}
-        tile_map = {t.qr_id: t for t in list(self.board.object_tiles.values()) + list(self.board.anchor_tiles.values())}
+    def compute_layout(self, snapshot):
+        ids, axial, edges, labels = snapshot
+        positions = self.layout_engine.layout(ids, axial, edges)
+        return positions, edges, labels
 
-        for tile_id, neighbors in adjacency_map.items():
-            G.add_node(tile_id)
-            for n in neighbors:
-                G.add_edge(tile_id, n)
+    def draw(self, figure, layout):
+        positions, edges, labels = layout
+        ax = figure.add_subplot(111)
+        ax.set_axis_off()
+        ax.set_aspect("equal")
+        if len(positions) == 0:
+            ax.text(0.5, 0.5, "No tiles to display", ha='center', va='center', transform=ax.transAxes)
+            return
 
-        pos = nx.spring_layout(G)
+        low, high = positions.min(axis=0) - 0.75, positions.max(axis=0) + 0.75
+        ax.set_xlim(low[0], high[0])
+        ax.set_ylim(high[1], low[1])  # y grows downwards, as on the board
 
-        # Build label dictionary from tile.icon()
-        labels = {}
-        for tile_id in G.nodes():
-            tile = tile_map.get(tile_id)
-            labels[tile_id] = tile.icon() if tile else tile_id  # fallback to ID
+        # Node diameter: ~0.6 of the neighbour spacing, in points
+        width_px, height_px = figure.bbox.width, figure.bbox.height
+        px_per_unit = min(width_px / (high[0] - low[0]), height_px / (high[1] - low[1]))
+        node_px = 0.6 * px_per_unit
+        node_pt = node_px * 72 / figure.dpi
 
-        nx.draw(
-            G, pos, ax=ax, with_labels=True, labels=labels,
-            node_color='lightblue', edge_color='gray',
-            node_size=1000, font_size=10
-        )
+        ax.add_collection(LineCollection(positions[edges], colors='gray', linewidths=1, zorder=1))
+        ax.scatter(positions[:, 0], positions[:, 1], s=node_pt ** 2, c='lightblue', edgecolors='none', zorder=2)
 
-        self.canvas.draw()
-        
\ No newline at end of file
+        if len(labels) <= LABEL_NODE_LIMIT or node_px >= LABEL_MIN_NODE_PX:
+            font_size = min(10, max(node_pt * 0.45, 4))
+            for (x, y), label in zip(positions, labels):
+                ax.text(x, y, label, ha='center', va='center', fontsize=font_size, zorder=3)
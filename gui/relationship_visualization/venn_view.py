@@ -1,120 +1,148 @@
+import numpy as np
 from matplotlib_venn import venn2, venn3
 import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from core.tile_model import AnchorTile, ObjectTile, Tile
+from matplotlib.collections import LineCollection
+from core.tile_model import ObjectTile, assigned_anchor_ids
+from core.zone_overlap import zone_overlaps
+from .async_render import AsyncFigureTab
 
-class VennViewTab(QWidget):
-    def __init__(self, board=None, parent=None):
-        super().__init__(parent)
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
-        self.setLayout(layout)
-        self.set_board(board)
-
-    def set_board(self, board):
-        self.board = board
-        self.draw_venn()
-
-    def draw_venn(self):
-        # if not self.board or not hasattr(self.board, 'adjacency_map'):
-        #     print("No board or adjacency map found.")
-        #     return
-
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-
-        # Collect anchor → set of icons mappings
-        anchor_sets = {}
-
-        icon_lookup = {}  # tile_id → icon
-        for anchor in self.board.anchor_tiles.values():
-            anchor_id = anchor.qr_id
-            anchor_sets[anchor_id] = set()
-
-        for obj in self.board.object_tiles.values():
-            assigned = obj.assigned_to
-            if assigned in anchor_sets:
-                nickname = obj.attributes.get("nickname", "").strip()
-                display_label = nickname if nickname else obj.icon()
-                anchor_sets[assigned].add(display_label)
-
-        # print(f"anchor sets: {anchor_sets}")
-
-        for tile in self.board.tiles:
-            if isinstance(tile, ObjectTile) and hasattr(tile, "assigned_to"):
-                # print(f"object tile: {tile}")
-
-                for anchor_id in tile.assigned_to:
-                    if anchor_id in anchor_sets:
+# UpSet matrix: at most this many regions (largest first) are drawn
+MAX_UPSET_REGIONS = 40
 
-                        anchor_sets[anchor_id].add(tile.icon())
 
-        anchors = list(anchor_sets.keys())
-        
-        sets = list(anchor_sets.values())
+class VennViewTab(AsyncFigureTab):
+    """
+    Zone membership, rendered on the render thread (see async_render). Overlaps for any
+    number of zones come from core.zone_overlap; two or three zones are drawn as a Venn
+    diagram, more as an UpSet matrix (one column per non-empty intersection region).
+    """
 
+    def __init__(self, board=None, parent=None):
+        super().__init__(board, parent=parent)
 
-        # No anchors or empty sets
-        if len(sets) == 0:
-            ax.text(0.5, 0.5, "No anchors or sets to display", ha='center', va='center')
-            self.canvas.draw()
-            return
-
-        labels = []
-        colors = []
-        for anchor_id in anchor_sets.keys():
-            anchor = self.board.anchor_tiles[anchor_id]
+    def snapshot(self, board):
+        """Anchor labels/colours and each object's label and zones, copied on the GUI thread."""
+        anchors = []
+        for anchor in board.anchor_tiles.values():
             nickname = anchor.attributes.get("nickname", "").strip()
             label = nickname if nickname else anchor.icon()
-            labels.append(label)
-
 
             # Get anchor color (fallback to gray if not set)
             color_name = anchor.attributes.get("color", "").strip().lower()
-            if color_name in mcolors.CSS4_COLORS:
-                colors.append(mcolors.CSS4_COLORS[color_name])
-            else:
-                colors.append("lightgray")
-
-        
-        # Handle 1, 2, or 3 sets
-        if len(sets) == 1:
-            only_label = icon_lookup.get(anchors[0], anchors[0])
-            ax.set_title(f"Venn View – Anchor: {only_label}")
-            for i, item in enumerate(sorted(sets[0])):
-                ax.text(0.5, 0.9 - i * 0.1, item, ha='center')
-            self.canvas.draw()
-            return
-
-        elif len(sets) == 2:
-            print(f"Anchor sets being plotted:")
-            # for anchor_id, obj_ids in anchor_sets.items():
-                # print(f"  {anchor_id} → {obj_ids}")
-
-            venn = venn2(subsets=sets, set_labels=labels, ax=ax, set_colors=colors)
-        elif len(sets) == 3:
-            venn = venn3(subsets=sets, set_labels=labels, ax=ax, set_colors=colors)
+            color = mcolors.CSS4_COLORS.get(color_name, "lightgray")
+            anchors.append((anchor.qr_id, label, color))
+
+        objects = []
+        for tile in board.tiles:
+            if isinstance(tile, ObjectTile):
+                nickname = tile.attributes.get("nickname", "").strip()
+                display_label = nickname if nickname else tile.icon()
+                objects.append((tile.qr_id, display_label, assigned_anchor_ids(tile)))
+        return anchors, objects
+
+    def compute_layout(self, snapshot):
+        anchors, objects = snapshot
+        overlaps = zone_overlaps([anchor_id for anchor_id, _, _ in anchors],
+                                 [qr_id for qr_id, _, _ in objects],
+                                 [zones for _, _, zones in objects])
+        display_labels = {qr_id: label for qr_id, label, _ in objects}
+        return anchors, overlaps, display_labels
+
+    def draw(self, figure, layout):
+        anchors, overlaps, display_labels = layout
+        zone_count = len(anchors)
+
+        # No anchors
+        if zone_count == 0:
+            ax = figure.add_subplot(111)
+            ax.set_axis_off()
+            ax.text(0.5, 0.5, "No anchors or sets to display", ha='center', va='center')
+        elif zone_count == 1:
+            self.draw_single(figure, anchors[0], overlaps, display_labels)
+        elif zone_count <= 3:
+            self.draw_venn(figure, anchors, overlaps, display_labels)
         else:
-            ax.text(0.5, 0.5, "Only 2–3 anchors supported", ha='center', va='center')
-            self.canvas.draw()
-            return
-
-
-        # Label the regions with tile icons
-        regions = [
-            ('10', sets[0] - sets[1]),
-            ('01', sets[1] - sets[0]),
-            ('11', sets[0] & sets[1])
-        ]
-
-        for region_code, values in regions:
-            label = venn.get_label_by_id(region_code)
+            self.draw_upset(figure, anchors, overlaps)
+
+    def draw_single(self, figure, anchor, overlaps, display_labels):
+        ax = figure.add_subplot(111)
+        ax.set_axis_off()
+        anchor_id, label, _ = anchor
+        ax.set_title(f"Venn View – Anchor: {label}")
+        for i, item in enumerate(sorted(display_labels[m] for m in overlaps.members_of(anchor_id))):
+            ax.text(0.5, 0.9 - i * 0.1, item, ha='center')
+
+    def draw_venn(self, figure, anchors, overlaps, display_labels):
+        ax = figure.add_subplot(111)
+        zone_ids = overlaps.zone_ids
+        # Region sizes straight from the engine (tiles are counted by ID, not by label)
+        subsets = {region.code(zone_ids): len(region.members) for region in overlaps.regions}
+        labels = [label for _, label, _ in anchors]
+        colors = [color for _, _, color in anchors]
+        draw = venn2 if len(zone_ids) == 2 else venn3
+        venn = draw(subsets=subsets, set_labels=labels, ax=ax, set_colors=colors)
+
+        # Label the regions with tile icons; empty regions stay blank
+        for text in venn.subset_labels:
+            if text:
+                text.set_text("")
+        for region in overlaps.regions:
+            label = venn.get_label_by_id(region.code(zone_ids))
             if label:
-                label.set_text("\n".join(sorted(values)))
-
-        self.canvas.draw()
\ No newline at end of file
+                label.set_text("\n".join(sorted(display_labels[m] for m in region.members)))
+
+    def draw_upset(self, figure, anchors, overlaps):
+        zone_ids = overlaps.zone_ids
+        regions = overlaps.regions[:MAX_UPSET_REGIONS]
+        zone_row = {zone_id: i for i, zone_id in enumerate(zone_ids)}
+        zone_count, region_count = len(zone_ids), len(regions)
+        font_size = max(5, min(9, 160 / max(zone_count, region_count, 1)))
+
+        grid = figure.add_gridspec(2, 2, width_ratios=[1, 4], height_ratios=[1, 1.5],
+                                   wspace=0.02, hspace=0.04)
+        ax_regions = figure.add_subplot(grid[0, 1])
+        ax_matrix = figure.add_subplot(grid[1, 1], sharex=ax_regions)
+        ax_zones = figure.add_subplot(grid[1, 0], sharey=ax_matrix)
+
+        # Region sizes
+        x = np.arange(region_count)
+        bars = ax_regions.bar(x, [len(region.members) for region in regions], color='dimgray', width=0.6)
+        ax_regions.bar_label(bars, fontsize=font_size)
+        ax_regions.tick_params(axis='x', bottom=False, labelbottom=False)
+        ax_regions.tick_params(axis='y', labelsize=font_size)
+        ax_regions.set_ylabel("Tiles", fontsize=font_size)
+        title = "Zone overlaps"
+        if len(overlaps.regions) > region_count:
+            title += f" (largest {region_count} of {len(overlaps.regions)} regions)"
+        ax_regions.set_title(title, fontsize=font_size + 1)
+        for side in ('top', 'right'):
+            ax_regions.spines[side].set_visible(False)
+
+        # Membership matrix: grey dot per (zone, region), black where the region includes the zone
+        dot_size = (font_size * 0.9) ** 2
+        grid_x, grid_y = np.meshgrid(x, np.arange(zone_count))
+        ax_matrix.scatter(grid_x.ravel(), grid_y.ravel(), s=dot_size, color='gainsboro', zorder=1)
+        member_x, member_y, connectors = [], [], []
+        for col, region in enumerate(regions):
+            rows = [zone_row[zone_id] for zone_id in region.zones]
+            member_x.extend([col] * len(rows))
+            member_y.extend(rows)
+            if len(rows) > 1:
+                connectors.append([(col, min(rows)), (col, max(rows))])
+        ax_matrix.add_collection(LineCollection(connectors, colors='black', linewidths=1.5, zorder=2))
+        ax_matrix.scatter(member_x, member_y, s=dot_size, color='black', zorder=3)
+        ax_matrix.set_xlim(-0.5, region_count - 0.5)
+        ax_matrix.set_ylim(zone_count - 0.5, -0.5)  # first zone on top
+        ax_matrix.set_axis_off()
+
+        # Zone sizes, with the zone names between the bars and the matrix
+        colors = [color for _, _, color in anchors]
+        ax_zones.barh(np.arange(zone_count), overlaps.zone_sizes, color=colors, height=0.6)
+        ax_zones.invert_xaxis()
+        ax_zones.yaxis.tick_right()
+        ax_zones.set_yticks(np.arange(zone_count))
+        ax_zones.set_yticklabels([label for _, label, _ in anchors], fontsize=font_size)
+        ax_zones.tick_params(axis='x', labelsize=font_size)
+        ax_zones.tick_params(axis='y', length=0)
+        for side in ('top', 'left', 'right'):
+            ax_zones.spines[side].set_visible(False)
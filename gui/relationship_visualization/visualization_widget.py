@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import QWidget, QTabWidget, QVBoxLayout, QPushButton, QHBoxLayout
 from PyQt6.QtCore import pyqtSignal, Qt
-from .hierarchy_view import HierarchyViewTab #implement later
 from .graph_view import GraphViewTab
 from .venn_view import VennViewTab
+from .async_render import render_pool
 
 
 class RelationshipVisualizationWidget(QWidget):
@@ -80,12 +80,25 @@ class RelationshipVisualizationWidget(QWidget):
         # Connect tab change to signal
         self.tabs.currentChanged.connect(lambda index: self.expandRequested.emit())
 
+    def set_board(self, board):
+        """Takes a new or rescanned board, cancelling renders of the old one."""
+        self.board = board
+        for tab in self.visualization_tabs():
+            tab.board_changed(board)
+
     def refresh_all_tabs(self):
-        # Assumes each tab implements a `.draw_*()` method or `.set_board()` to redraw
-        if hasattr(self.graph_view_tab, 'set_board'):
-            self.graph_view_tab.set_board(self.board)
-        if hasattr(self.venn_view_tab, 'set_board'):
-            self.venn_view_tab.set_board(self.board)
+        # Each tab renders off the GUI thread, now if it is visible, otherwise when it is next shown
+        for tab in self.visualization_tabs():
+            tab.set_board(self.board)
         # if hasattr(self.tree_view_tab, 'set_board'):
         #     self.tree_view_tab.set_board(self.board)
 
+    def visualization_tabs(self):
+        return [self.tabs.widget(i) for i in range(self.tabs.count()) if hasattr(self.tabs.widget(i), 'set_board')]
+
+    def shutdown(self):
+        """Cancels pending renders and waits for the running one (call before the app exits)."""
+        for tab in self.visualization_tabs():
+            tab.cancel()
+        render_pool().waitForDone()
+
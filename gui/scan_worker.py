@@ -0,0 +1,103 @@
+import time
+import threading
+from dataclasses import dataclass
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from PyQt6.QtGui import QImage
+from core.board_scanner import cv2_to_qimage
+from core.profiling import span
+
+"""
+Runs board scans on a QThreadPool so the Qt event loop keeps painting while QR detection,
+the lattice fit and the x-ray overlay are computed.
+
+The scan function (main.rescan_board) must not touch widgets or mutate the live board. It
+returns either a new BoardModel or a diff against the current one. The worker hands it back
+to the GUI thread in a single `finished` signal, and MainWindow applies it in one slot, so
+the views never see a half-updated board.
+"""
+
+
+class ScanCancelled(Exception):
+    """Raised inside the scan function (from its progress callback) once cancel() was called."""
+
+
+@dataclass
+class ScanResult:
+    """
+    Attributes:
+        job_id (int): Which ScanWorker produced it; stale results are dropped by the receiver.
+        board (BoardModel): A new board, or the board that was passed in when delta is set.
+        tile_data (dict): Merged tile metadata the scan used.
+        xray_image (QImage): Annotated photo; convert to QPixmap on the GUI thread.
+        delta (tuple | None): (added, moved, removed, updated) for board.apply_delta, or None for a new board.
+        elapsed (float): Seconds spent in the worker.
+    """
+    job_id: int
+    board: object
+    tile_data: dict
+    xray_image: QImage
+    delta: tuple = None
+    elapsed: float = 0.0
+
+
+class ScanSignals(QObject):
+    """
+    QRunnable is not a QObject, so its signals live here. They are emitted from the pool
+    thread and delivered to GUI-thread slots through queued connections.
+    """
+    progress = pyqtSignal(int, str)  # percent, stage message
+    finished = pyqtSignal(object)  # ScanResult
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ScanWorker(QRunnable):
+    """
+    One scan of one photo.
+
+    Parameters:
+        job_id (int): Increasing ID, echoed in the ScanResult.
+        scan_fn (callable): scan_fn(img, board, progress) → (board, tile_data, xray_img, delta).
+            progress(percent, message) raises ScanCancelled after cancel(), so cancellation
+            takes effect at the next stage boundary (a running OpenCV call is not interrupted).
+        img (np.ndarray): BGR photo.
+        board (BoardModel, optional): Current board, to diff the new scan against.
+    """
+
+    def __init__(self, job_id, scan_fn, img, board=None):
+        super().__init__()
+        self.job_id = job_id
+        self.scan_fn = scan_fn
+        self.img = img
+        self.board = board
+        self.signals = ScanSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, percent, message):
+        if self._cancel.is_set():
+            raise ScanCancelled()
+        self.signals.progress.emit(int(percent), message)
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            with span("ScanWorker.run"):
+                board, tile_data, xray_img, delta = self.scan_fn(self.img, self.board, self.report)
+                self.report(95, "Preparing preview")
+                xray_image = cv2_to_qimage(xray_img)
+            self.report(100, "Done")
+        except ScanCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+            return
+
+        self.signals.finished.emit(ScanResult(self.job_id, board, tile_data, xray_image, delta,
+                                              time.perf_counter() - start))
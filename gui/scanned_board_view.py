@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QSizePolicy
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
+from core.profiling import span
 
 class ScannedBoardView(QWidget):
     def __init__(self, pixmap: QPixmap, parent=None):
@@ -19,16 +20,25 @@ class ScannedBoardView(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
+    def set_pixmap(self, pixmap: QPixmap):
+        """Replaces the displayed scan (e.g. after a rescan) and rescales it to the current size; None clears it."""
+        self.original_pixmap = pixmap
+        self.resizeEvent(None)
+
     def resizeEvent(self, event):
         """
         Resize the displayed image while maintaining aspect ratio.
         """
         if self.original_pixmap:
-            scaled_pixmap = self.original_pixmap.scaled(
-                self.label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
+            with span("ScannedBoardView.scale_pixmap"):
+                scaled_pixmap = self.original_pixmap.scaled(
+                    self.label.size(),
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
             self.label.setPixmap(scaled_pixmap)
+        else:
+            self.label.clear()  # e.g. an opened board snapshot without a thumbnail
 
-        super().resizeEvent(event)
\ No newline at end of file
+        if event is not None:
+            super().resizeEvent(event)
\ No newline at end of file
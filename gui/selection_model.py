@@ -0,0 +1,73 @@
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+"""
+Tile selection shared by the board view, the sidebar and the attribute editor.
+
+Views report clicks with select() and repaint only the IDs named in selection_changed,
+so a selection change costs O(changed tiles), not a pass over every tile in every view.
+"""
+
+SELECT_REPLACE = "replace"
+SELECT_TOGGLE = "toggle"
+SELECT_EXTEND = "extend"
+
+
+def mode_for_modifiers(modifiers) -> str:
+    """Ctrl/Cmd-click toggles a tile in the selection, Shift-click adds it, a plain click replaces it."""
+    if modifiers & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.MetaModifier):
+        return SELECT_TOGGLE
+    if modifiers & Qt.KeyboardModifier.ShiftModifier:
+        return SELECT_EXTEND
+    return SELECT_REPLACE
+
+
+class TileSelectionModel(QObject):
+    """
+    The set of selected tile IDs plus the current (most recently clicked) one.
+
+    Emits:
+        selection_changed (set, set): IDs that became selected and IDs that were deselected.
+        current_changed (str): The current tile's ID ("" when nothing is current).
+    """
+    selection_changed = pyqtSignal(object, object)
+    current_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.selected = set()
+        self.current = None
+
+    def is_selected(self, qr_id) -> bool:
+        return qr_id in self.selected
+
+    def select(self, qr_id, mode=SELECT_REPLACE):
+        """
+        Parameters:
+            qr_id (str): The clicked tile.
+            mode (str): SELECT_REPLACE, SELECT_TOGGLE or SELECT_EXTEND (see mode_for_modifiers).
+        """
+        if mode == SELECT_REPLACE:
+            selection = {qr_id}
+        elif mode == SELECT_TOGGLE:
+            selection = self.selected ^ {qr_id}
+        else:
+            selection = self.selected | {qr_id}
+        current = qr_id if qr_id in selection else next(iter(selection), None)
+        self.set_selection(selection, current)
+
+    def set_selection(self, qr_ids, current=None):
+        """Replaces the selection, emitting only the difference."""
+        selection = set(qr_ids)
+        added, removed = selection - self.selected, self.selected - selection
+        self.selected = selection
+        if added or removed:
+            self.selection_changed.emit(added, removed)
+        self.set_current(current if current in selection else None)
+
+    def set_current(self, qr_id):
+        if qr_id != self.current:
+            self.current = qr_id
+            self.current_changed.emit(qr_id or "")
+
+    def clear(self):
+        self.set_selection(())
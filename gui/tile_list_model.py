@@ -0,0 +1,227 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QBrush, QColor
+from core.tile_model import is_tagged
+
+"""
+Item models behind the tile sidebar.
+
+TileListModel exposes the tile catalogue (tile_data) as one row per tile ID without
+creating an item object per row: labels, colours and search keys are computed in data()
+when a row is painted or filtered. Attribute edits are reported per tile with
+refresh_tiles(), which emits dataChanged for those rows only.
+
+Sorting is done by the source model (a single Python sort plus layoutChanged) rather than
+by the proxy, whose lessThan would call back into Python O(n log n) times. The proxy only
+filters.
+"""
+
+QR_ID_ROLE = Qt.ItemDataRole.UserRole
+STATUS_ROLE = Qt.ItemDataRole.UserRole + 1
+
+STATUS_TAGGED = "tagged"
+STATUS_UNTAGGED = "untagged"
+STATUS_OFF_BOARD = "off_board"
+
+STATUS_COLORS = {
+    STATUS_TAGGED: "lightgreen",
+    STATUS_UNTAGGED: "khaki",
+    STATUS_OFF_BOARD: "lightgray",
+}
+
+SORT_BOARD = "Board order"
+SORT_ICON = "Icon"
+SORT_NICKNAME = "Nickname"
+SORT_ZONE = "Zone"
+SORT_ID = "QR ID"
+SORT_KEYS = [SORT_BOARD, SORT_ICON, SORT_NICKNAME, SORT_ZONE, SORT_ID]
+
+NO_ZONE = ""  # TileFilterProxyModel.zone value matching tiles outside every zone
+
+
+class TileListModel(QAbstractListModel):
+    """
+    One row per tile in tile_data, on-board tiles first by default.
+
+    Attributes:
+        ids (list[str]): Tile IDs in row order.
+        rows (dict): qr_id → row.
+        on_board (set): IDs of tiles on the current board.
+        zones (dict): qr_id → frozenset of anchor IDs the tile belongs to (on-board tiles only).
+    """
+
+    def __init__(self, tile_data: dict, board=None, parent=None):
+        super().__init__(parent)
+        self.tile_data = tile_data
+        self.ids = []
+        self.rows = {}
+        self.on_board = set()
+        self.zones = {}
+        self.search_keys = {}  # qr_id → lowercased searchable text, filled on first search
+        self.sort_key = SORT_BOARD
+        self.brushes = {status: QBrush(QColor(color)) for status, color in STATUS_COLORS.items()}
+        self.set_board(board, tile_data)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        qr_id = self.ids[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            attributes = self.tile_data.get(qr_id, {})
+            label = attributes.get("icon", qr_id)
+            nickname = attributes.get("nickname")
+            return f"{label}  ({nickname})" if nickname else label
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self.brushes[self.status(qr_id)]
+        if role == Qt.ItemDataRole.ToolTipRole or role == QR_ID_ROLE:
+            return qr_id
+        if role == STATUS_ROLE:
+            return self.status(qr_id)
+        return None
+
+    def status(self, qr_id):
+        if qr_id not in self.on_board:
+            return STATUS_OFF_BOARD
+        return STATUS_TAGGED if is_tagged(self.tile_data.get(qr_id, {})) else STATUS_UNTAGGED
+
+    def search_key(self, qr_id):
+        """ID, icon and every user-visible string attribute value, lowercased."""
+        key = self.search_keys.get(qr_id)
+        if key is None:
+            attributes = self.tile_data.get(qr_id, {})
+            values = [str(value) for value in attributes.values() if isinstance(value, (str, int, float))]
+            key = " ".join([qr_id] + values).lower()
+            self.search_keys[qr_id] = key
+        return key
+
+    def index_of(self, qr_id):
+        row = self.rows.get(qr_id)
+        return QModelIndex() if row is None else self.index(row)
+
+    def refresh_tiles(self, tile_ids):
+        """
+        Re-reads the given tiles' attributes after an edit; only their rows are repainted
+        and re-filtered.
+        """
+        for qr_id in tile_ids:
+            self.search_keys.pop(qr_id, None)
+            row = self.rows.get(qr_id)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def set_board(self, board, tile_data: dict):
+        """
+        Updates on-board state and zones for a new or rescanned board.
+
+        When the catalogue holds the same tiles, rows are re-sorted in place and only rows whose
+        state changed emit dataChanged (all of them if tile_data was reloaded); otherwise the
+        model resets.
+        """
+        tiles = board.tiles if board is not None else []
+        on_board = {tile.qr_id for tile in tiles}
+        zones = {tile.qr_id: frozenset(anchor.qr_id for anchor in board.get_anchors_of_tile(tile))
+                 for tile in tiles}
+
+        if self.ids and tile_data.keys() == self.rows.keys():
+            replaced = tile_data is not self.tile_data  # reloaded catalogue: same tiles, maybe new values
+            changed = [qr_id for qr_id in self.ids
+                       if (qr_id in on_board) != (qr_id in self.on_board) or zones.get(qr_id) != self.zones.get(qr_id)]
+            self.tile_data, self.on_board, self.zones = tile_data, on_board, zones
+            self.search_keys.clear()
+            if replaced or changed:
+                self.reorder(self.sorted_ids())
+            if replaced:
+                self.dataChanged.emit(self.index(0), self.index(len(self.ids) - 1))
+            else:
+                self.refresh_tiles(changed)
+            return
+
+        self.beginResetModel()
+        self.tile_data = tile_data
+        self.on_board, self.zones = on_board, zones
+        self.search_keys = {}
+        self.ids = self.sorted_ids()
+        self.rows = {qr_id: row for row, qr_id in enumerate(self.ids)}
+        self.endResetModel()
+
+    def set_sort_key(self, sort_key):
+        """
+        Parameters:
+            sort_key (str): One of SORT_KEYS.
+        """
+        self.sort_key = sort_key
+        self.reorder(self.sorted_ids())
+
+    def sorted_ids(self):
+        ids = list(self.tile_data)
+        data = self.tile_data
+        if self.sort_key == SORT_ICON:
+            key = lambda qr_id: str(data[qr_id].get("icon", qr_id)).lower()
+        elif self.sort_key == SORT_NICKNAME:
+            key = lambda qr_id: (not data[qr_id].get("nickname"), str(data[qr_id].get("nickname", "")).lower())
+        elif self.sort_key == SORT_ZONE:
+            key = lambda qr_id: (not self.zones.get(qr_id), sorted(self.zones.get(qr_id, ())))
+        elif self.sort_key == SORT_ID:
+            return sorted(ids)
+        else:  # board order: on-board tiles first, otherwise catalogue order
+            key = lambda qr_id: qr_id not in self.on_board
+        return sorted(ids, key=key)
+
+    def reorder(self, ids):
+        """Moves rows to a new order, keeping selections and persistent indexes attached to their tiles."""
+        if ids == self.ids:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_ids = [self.ids[index.row()] for index in persistent]
+        self.ids = ids
+        self.rows = {qr_id: row for row, qr_id in enumerate(ids)}
+        self.changePersistentIndexList(persistent, [self.index(self.rows[qr_id]) for qr_id in persistent_ids])
+        self.layoutChanged.emit()
+
+
+class TileFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filters a TileListModel by search text, on/off board, tag status and zone. Filters read
+    the source model's dictionaries directly instead of going through data().
+
+    Attributes:
+        search (str): Whitespace-separated terms that must all occur in the tile's search key.
+        on_board (bool | None): Only on-board (True) or off-board (False) tiles; None for all.
+        tagged (bool | None): Only tiles with (True) or without (False) user attributes.
+        zone (str | None): Anchor ID, NO_ZONE for tiles outside every zone, or None for all.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.terms = []
+        self.on_board = None
+        self.tagged = None
+        self.zone = None
+        self.setDynamicSortFilter(True)
+
+    def set_filters(self, search=None, on_board=None, tagged=None, zone=None):
+        self.terms = (search or "").lower().split()
+        self.on_board = on_board
+        self.tagged = tagged
+        self.zone = zone
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        qr_id = model.ids[source_row]
+        if self.on_board is not None and (qr_id in model.on_board) != self.on_board:
+            return False
+        if self.tagged is not None and is_tagged(model.tile_data.get(qr_id, {})) != self.tagged:
+            return False
+        if self.zone is not None:
+            zones = model.zones.get(qr_id, ())
+            if (self.zone not in zones) if self.zone != NO_ZONE else zones:
+                return False
+        if self.terms:
+            key = model.search_key(qr_id)
+            return all(term in key for term in self.terms)
+        return True
@@ -1,83 +1,160 @@
-from PyQt6.QtWidgets import QWidget, QListWidget, QListWidgetItem, QVBoxLayout, QFileDialog
-from PyQt6.QtGui import QColor, QBrush
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QListView, QVBoxLayout, QHBoxLayout, QFileDialog, QAbstractItemView, QLineEdit, QComboBox
+)
+from PyQt6.QtCore import Qt, pyqtSignal, QItemSelection, QItemSelectionModel, QTimer
 from core.tile_model import Tile, ObjectTile, AnchorTile
 from gui.attribute_editor import AttributeEditor 
+from gui.tile_list_model import TileListModel, TileFilterProxyModel, QR_ID_ROLE, SORT_KEYS, NO_ZONE
 import json
 
+# Wait this long after the last keystroke before re-filtering
+SEARCH_DEBOUNCE_MS = 150
+
 class TileSidebar(QWidget):
     """
     Widget  displays all known tiles in a vertical list.
 
     This sidebar allows users to:
     - View tile icons and basic status
+    - Search, filter (on/off board, tagged, zone) and sort the tile catalogue
     - Select a tile to view/edit its attributes
     - Synchronize selection with board view
 
+    The list is a QListView over TileListModel / TileFilterProxyModel, so no per-row
+    widgets or items are built and large catalogues open immediately.
+
     Emits:
         tile_selected (Tile): Signal emitted when a tile is selected from the sidebar.
     """
     tile_selected = pyqtSignal(Tile)
 
-    def __init__(self, tile_data: dict, tiles: list[Tile], attribute_editor):
+    def __init__(self, tile_data: dict, board, attribute_editor):
         """
         Initialize the TileSidebar widget.
 
         Parameters:
             tile_data (dict): A dictionary mapping tile IDs to attribute dictionaries.
-            tiles (list[Tile]): A list of Tile objects currently scanned and tracked.
+            board (BoardModel): The board currently scanned and tracked.
             attribute_editor (AttributeEditor): The attribute editor widget to update on selection.
         """
         super().__init__()
 
         self.tile_data = tile_data
-        self.tiles = tiles
+        self.board = board
+        self.tiles = board.tiles
         self.attribute_editor = attribute_editor
-
-        self.tile_list = QListWidget()
-        self.tile_list.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)  # Optional: smoother scroll
+        self.selection_model = None
+        self._syncing = False  # True while mirroring the selection model into the view
+
+        self.model = TileListModel(tile_data, board, self)
+        self.proxy = TileFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.tile_list = QListView()
+        self.tile_list.setModel(self.proxy)
+        self.tile_list.setUniformItemSizes(True)  # row heights are not measured one by one
+        self.tile_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.tile_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.tile_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tile_list.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)  # Optional: smoother scroll
         self.tile_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)  # Optional
 
-        self.tile_list.itemClicked.connect(self.on_tile_clicked)
+        self.tile_list.clicked.connect(self.on_tile_clicked)
+        self.tile_list.selectionModel().selectionChanged.connect(self.on_view_selection_changed)
+        self.tile_list.selectionModel().currentChanged.connect(self.on_view_current_changed)
 
-        self.populate_list()
+        self.init_filters()
 
         layout = QVBoxLayout()
+        layout.addWidget(self.search_edit)
+        filters = QHBoxLayout()
+        for combo in (self.location_combo, self.tag_combo, self.zone_combo, self.sort_combo):
+            filters.addWidget(combo)
+        layout.addLayout(filters)
         layout.addWidget(self.tile_list)
         self.setLayout(layout)
 
-    def populate_list(self):
-        """
-        Populates the tile list, grouping tiles into two batches:
-        1. Tiles currently on the board (have a matching Tile object)
-        2. Tiles not yet scanned or placed on the board
-        """
-        self.tile_list.clear()
+    def init_filters(self):
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search tiles")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+
+        self.location_combo = QComboBox()
+        for label, value in (("All tiles", None), ("On board", True), ("Off board", False)):
+            self.location_combo.addItem(label, value)
+        self.tag_combo = QComboBox()
+        for label, value in (("Any tags", None), ("Tagged", True), ("Untagged", False)):
+            self.tag_combo.addItem(label, value)
+        self.zone_combo = QComboBox()
+        self.populate_zone_filter()
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_KEYS)
+
+        for combo in (self.location_combo, self.tag_combo, self.zone_combo):
+            combo.currentIndexChanged.connect(self.apply_filters)
+        self.sort_combo.currentTextChanged.connect(self.set_sort_key)
+
+    def populate_zone_filter(self):
+        """Lists the board's anchors as zones, keeping the chosen zone if it still exists."""
+        current = self.zone_combo.currentData()
+        self.zone_combo.blockSignals(True)
+        self.zone_combo.clear()
+        self.zone_combo.addItem("All zones", None)
+        self.zone_combo.addItem("No zone", NO_ZONE)
+        for anchor_id, anchor in self.board.anchor_tiles.items():
+            nickname = anchor.attributes.get("nickname")
+            self.zone_combo.addItem(f"{anchor.icon()} ({nickname})" if nickname else anchor.icon() or anchor_id, anchor_id)
+        index = self.zone_combo.findData(current)
+        self.zone_combo.setCurrentIndex(max(index, 0))
+        self.zone_combo.blockSignals(False)
+
+    def apply_filters(self):
+        self._syncing = True  # rows hidden by the filter leave the view's selection, not the tile selection
+        self.proxy.set_filters(
+            search=self.search_edit.text(),
+            on_board=self.location_combo.currentData(),
+            tagged=self.tag_combo.currentData(),
+            zone=self.zone_combo.currentData(),
+        )
+        self._syncing = False
+        # Rows that were filtered out and are visible again lost their view selection
+        if self.selection_model is not None:
+            self.on_selection_changed(self.selection_model.selected, ())
 
-        on_board = []
-        off_board = []
+    def set_sort_key(self, sort_key):
+        self._syncing = True
+        self.model.set_sort_key(sort_key)
+        self._syncing = False
 
-        tile_ids_on_board = {tile.qr_id for tile in self.tiles}
+    def update_board(self, board, tile_data: dict):
+        """
+        Shows the tiles of a new or rescanned board.
 
-        for tile_id, attributes in self.tile_data.items():
-            label = attributes.get("icon", tile_id)
-            item = QListWidgetItem(label)
-            item.setData(Qt.ItemDataRole.UserRole, tile_id)
-
-            if tile_id in tile_ids_on_board:
-                # Tile has been scanned/placed
-                if len(attributes.keys()) > 1:
-                    item.setBackground(QBrush(QColor("lightgreen")))  # tagged
-                else:
-                    item.setBackground(QBrush(QColor("khaki")))  # untagged
-                on_board.append(item)
-            else:
-                # Tile not present on board
-                item.setBackground(QBrush(QColor("lightgray")))
-                off_board.append(item)
-
-        for item in on_board + off_board:
-            self.tile_list.addItem(item)
+        Parameters:
+            board (BoardModel): The board now on screen.
+            tile_data (dict): Tile metadata loaded for the scan.
+        """
+        self.board = board
+        self.tiles = board.tiles
+        self.tile_data = tile_data
+        self._syncing = True
+        self.model.set_board(board, tile_data)
+        self._syncing = False
+        self.populate_zone_filter()
+        self.apply_filters()
+        if self.selection_model is not None:
+            self.on_current_changed(self.selection_model.current or "")
+
+    def refresh_tiles(self, tile_ids):
+        """Repaints and re-filters the rows of tiles whose attributes were edited."""
+        self._syncing = True
+        self.model.refresh_tiles(tile_ids)
+        self._syncing = False
 
     def get_selected_tile_id(self):
         """
@@ -86,11 +163,72 @@ class TileSidebar(QWidget):
         Returns:
             str, None: The QR ID of the selected tile, or None if no selection.
         """
-        item = self.tile_list.currentItem()
-        if item:
-            return item.data(Qt.ItemDataRole.UserRole)
+        index = self.tile_list.currentIndex()
+        if index.isValid():
+            return index.data(QR_ID_ROLE)
         return None
 
+    def view_index(self, qr_id):
+        """Index of a tile in the list view, invalid if it is unknown or filtered out."""
+        return self.proxy.mapFromSource(self.model.index_of(qr_id))
+
+    def set_selection_model(self, selection_model):
+        """
+        Shares a TileSelectionModel with the board view. Selecting rows (Ctrl/Shift-click for
+        several) updates the model, and model changes are mirrored into the list.
+        """
+        self.selection_model = selection_model
+        selection_model.selection_changed.connect(self.on_selection_changed)
+        selection_model.current_changed.connect(self.on_current_changed)
+        self.on_selection_changed(selection_model.selected, ())
+
+    def on_selection_changed(self, added, removed):
+        """Selects / deselects only the rows named."""
+        selection = {QItemSelectionModel.SelectionFlag.Select: QItemSelection(),
+                     QItemSelectionModel.SelectionFlag.Deselect: QItemSelection()}
+        for flag, ids in ((QItemSelectionModel.SelectionFlag.Deselect, removed),
+                          (QItemSelectionModel.SelectionFlag.Select, added)):
+            for qr_id in ids:
+                index = self.view_index(qr_id)
+                if index.isValid():
+                    selection[flag].select(index, index)
+        self._syncing = True
+        for flag, ranges in selection.items():
+            if not ranges.isEmpty():
+                self.tile_list.selectionModel().select(ranges, flag)
+        self._syncing = False
+
+    def on_current_changed(self, qr_id):
+        index = self.view_index(qr_id)
+        if not index.isValid():
+            return
+        self._syncing = True
+        self.tile_list.selectionModel().setCurrentIndex(index, QItemSelectionModel.SelectionFlag.NoUpdate)
+        self._syncing = False
+        self.tile_list.scrollTo(index)
+
+    def on_view_selection_changed(self, selected, deselected):
+        """
+        Applies the rows the user (de)selected to the selection model. Works from the change
+        rather than the view's full selection, so tiles hidden by a filter stay selected.
+        """
+        if self._syncing or self.selection_model is None:
+            return
+        added = {index.data(QR_ID_ROLE) for index in selected.indexes()}
+        removed = {index.data(QR_ID_ROLE) for index in deselected.indexes()}
+        current = self.get_selected_tile_id()
+        selection = (self.selection_model.selected - removed) | added
+        if current not in selection and added:
+            current = next(iter(added))
+        self.selection_model.set_selection(selection, current)
+
+    def on_view_current_changed(self, current, previous):
+        if self._syncing or self.selection_model is None:
+            return
+        qr_id = current.data(QR_ID_ROLE)
+        if self.selection_model.is_selected(qr_id):
+            self.selection_model.set_current(qr_id)
+
     def select_item_by_id(self, tile: Tile):
         """
         Programmatically selects a tile in the list by its QR ID.
@@ -99,36 +237,23 @@ class TileSidebar(QWidget):
             tile (Tile): The tile object to select in the sidebar.
         """
         qr_id = tile.qr_id if isinstance(tile, Tile) else str(tile)
-        for i in range(self.tile_list.count()):
-            item = self.tile_list.item(i)
-            item_id = item.data(Qt.ItemDataRole.UserRole)
-            if item_id == qr_id:
-                self.tile_list.setCurrentItem(item)
-                item.setSelected(True)
-                self.tile_list.scrollToItem(item)
-                break
-
-    def on_tile_clicked(self, item):
-        tile_id = item.data(Qt.ItemDataRole.UserRole)
-
-        # Clear highlights from all board tiles
-        for tile in self.tiles:
-            if hasattr(tile, 'graphics_item'):
-                tile.graphics_item.set_highlight(False)
-
-        # Try to find the tile by ID
-        tile = next((t for t in self.tiles if t.qr_id == tile_id), None)
-
-        if tile:
-            if hasattr(tile, 'graphics_item'):
-                tile.graphics_item.set_highlight(True)
-        else:
-            # Make a dummy Tile if not scanned (still allow attribute editing)
-            tile = Tile(qr_id=tile_id)
-
-        # Update editor and emit
+        if self.selection_model is not None:
+            self.selection_model.select(qr_id)
+            return
+        index = self.view_index(qr_id)
+        if index.isValid():
+            self.tile_list.setCurrentIndex(index)
+            self.tile_list.scrollTo(index)
+
+    def on_tile_clicked(self, index):
+        tile_id = index.data(QR_ID_ROLE)
+
+        # Make a dummy Tile if not scanned (still allow attribute editing)
+        tile = self.board.get_tile_by_id(tile_id) or Tile(qr_id=tile_id)
+
         self.tile_selected.emit(tile)
-        self.attribute_editor.set_tile(tile)
+        if self.selection_model is None:
+            self.attribute_editor.set_tile(tile)
 
     def save_tile_data(self):
         """
@@ -155,8 +280,6 @@ class TileSidebar(QWidget):
         # Ensure .json extension
         if not file_path.endswith(".json"):
             file_path += ".json"
-        
-        file_path = "./assets/tile_attributes.json" # hardcode for now
 
 
         data_to_save = {}
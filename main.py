@@ -4,9 +4,13 @@ import cv2
 import json
 import numpy as np
 from core.board_scanner import scan_image, xray_board, cv2_to_pixmap
+from core.asset_loader import load_assets, load_tile_data, merge_tile_metadata
 from core.camera_utils import capture_image # use when user-capture is implemented in GUI
 from core.tile_model import Tile, AnchorTile, ObjectTile
 from core.board_model import BoardModel
+from core.board_snapshot import load_board, decode_thumbnail
+from core.scan_cache import ScanCache
+from core.profiling import PROFILER, snapshot_memory
 from gui.main_window import MainWindow
 from gui.board_view import BoardView
 from PyQt6.QtWidgets import QApplication
@@ -21,25 +25,51 @@ COLOR_MAP = {
     "pink": "#FF90B3",
     "teal": "#42C9C9"
 }
+
+# Scan results of previously opened photos, so reopening a session skips decoding
+SCAN_CACHE = ScanCache()
  
 
-def rescan_board(img):
+def rescan_board(img, board=None, progress=None):
     """
-        This function currently doesn't work
+        Scans a newly captured photo. Runs on a worker thread (gui.scan_worker), so it never
+        touches widgets and never mutates `board`.
+
+        For a new board (board is None) a BoardModel is built here. For an existing board,
+        only the (added, moved, removed, updated) diff is computed. MainWindow applies it on the
+        GUI thread with BoardModel.apply_delta. If the photo cannot be registered against the
+        board (BoardModel.diff_tiles returns None), a new BoardModel is built from the scan instead.
+
+        Parameters:
+            progress (callable, optional): progress(percent, message). The worker's callback
+                raises ScanCancelled when the scan was cancelled.
+
+        Returns:
+            tuple: (board, tile_data, xray_img, delta). xray_img is a BGR np.ndarray and delta
+                is None for a new (or rebuilt) board. For a delta, tile_data is freshly loaded from disk: fold it
+                into the tile data in use with core.asset_loader.adopt_tile_data before apply_delta,
+                so surviving tiles and the views keep sharing the dicts the GUI edits.
     """
-    img_path = "assets/tile_imgs/IMG_1620.jpg"
+    report = progress or (lambda percent, message: None)
     tile_metadata_path = "assets/tile_definitions.json" #may turn into arg that user can provide
     tile_attributes_path = "assets/tile_attributes.json"
-    # Use the provided img, but reload metadata
-    _, tile_data = load_assets(img_path, tile_metadata_path, tile_attributes_path)
-    board = mock_board(img, tile_data)
-    # Get and annotate your board image
-    xray_img = xray_board(img, board.tiles)
 
-    # Convert to pixmap
-    xray_pixmap = cv2_to_pixmap(xray_img)
+    report(5, "Loading tile data")
+    tile_data = load_tile_data(tile_metadata_path, tile_attributes_path)
+
+    report(10, "Detecting tiles")
+    img, tiles, hex_width = scan_image(img, tile_metadata=tile_data, cache=SCAN_CACHE)
 
-    return board, tile_data, xray_pixmap
+    report(70, "Building board")
+    delta = board.diff_tiles(tiles) if board is not None else None
+    if delta is None:
+        board = BoardModel(tiles, hex_width=hex_width)
+
+    report(85, "Annotating scan")
+    # Drawn from the scanned tiles so the live board is not read while the GUI may be using it
+    xray_img = xray_board(img, tiles)
+
+    return board, tile_data, xray_img, delta
 
 def mock_board(img, tile_metadata):
     """
@@ -49,7 +79,7 @@ def mock_board(img, tile_metadata):
         Board: A Board object with mock data.
     """
     
-    img, tiles, hex_width = scan_image(img, tile_metadata=tile_metadata) #scan image for QR, return array of tile objects with tile position and id data
+    img, tiles, hex_width = scan_image(img, tile_metadata=tile_metadata, cache=SCAN_CACHE) #scan image for QR, return array of tile objects with tile position and id data
     # board.print_adjacency_map()
 
     board = BoardModel(tiles, hex_width=hex_width)
@@ -58,41 +88,6 @@ def mock_board(img, tile_metadata):
     
     return board
 
-def merge_tile_metadata(definitions, attributes):
-    """
-    Combines static tile definitions with user-defined attributes.
-
-    Parameters:
-    - definitions (dict): Tile metadata from the scanner or definition file, keyed by QR ID (e.g., {"id_001": {"icon": "A"}}).
-    - attributes (dict):   User-saved attribute data keyed by QR ID or icon (e.g., {"id_001": {"nickname": "Solar"}, "A": {...}}).
-
-    Returns:
-    - dict: Merged tile data keyed by QR ID, where user attributes override static definitions if any keys conflict.
-    """
-    merged = {}
-
-    for qr_id, attrs in definitions.items():
-        saved_attrs = attributes.get(qr_id, {})
-        merged[qr_id] = {**attrs, **saved_attrs}  # saved overrides scanned
-
-    return merged
-
-def load_assets(img_path, tile_metadata_path, tile_attributes_path):
-    # Scanned image of physical board
-    img = cv2.imread(img_path)
-    if img is None:
-        raise FileNotFoundError(f"Image not found or couldn't be read: {img_path}")
-
-    with open(tile_metadata_path) as f:
-        tile_metadata = json.load(f)
-
-    with open(tile_attributes_path) as f:
-        tile_attributes = json.load(f)
-
-    merged_tile_data = merge_tile_metadata(tile_metadata, tile_attributes)
-
-    return img, merged_tile_data
-
 def init_scanned_board_view(img, board):
         try:
             pixmap = xray_board(img, board.tiles)
@@ -112,25 +107,44 @@ def main():
     img_path = "assets/tile_imgs/IMG_1620.jpg"
     tile_metadata_path = "assets/tile_definitions.json" #may turn into arg that user can provide
     tile_attributes_path = "assets/tile_attributes.json"
-    img, tile_data = load_assets(img_path, tile_metadata_path, tile_attributes_path)
 
-    board = mock_board(img, tile_data)
-    # print("Adjacency map:",board.adjacency_map)
-    # print("TILE BY ID:", board.get_tile_by_id("id_007"))
+    # `python main.py saved.board.npz` reopens a board snapshot (core.board_snapshot) instead of scanning
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else None
+    if snapshot_path:
+        tile_data = load_tile_data(tile_metadata_path, tile_attributes_path)
+        snapshot = load_board(snapshot_path, tile_data=tile_data)
+        board = snapshot.board
+        snapshot_memory("board loaded")
+        thumbnail = decode_thumbnail(snapshot.thumbnail)
+        xray_pixmap = cv2_to_pixmap(thumbnail) if thumbnail is not None else None
+    else:
+        img, tile_data = load_assets(img_path, tile_metadata_path, tile_attributes_path)
 
-    # print("TILE BY ID:", board.get_tile_neighbors_by_id("id_011"))
+        snapshot_memory("assets loaded")
+        board = mock_board(img, tile_data)
+        snapshot_memory("board scanned")
+        # print("Adjacency map:",board.adjacency_map)
+        # print("TILE BY ID:", board.get_tile_by_id("id_007"))
 
-    # Get and annotate your board image
-    xray_img = xray_board(img, board.tiles)
+        # print("TILE BY ID:", board.get_tile_neighbors_by_id("id_011"))
 
-    # Convert to pixmap
-    xray_pixmap = cv2_to_pixmap(xray_img)
+        # Get and annotate your board image
+        xray_img = xray_board(img, board.tiles)
+
+        # Convert to pixmap
+        xray_pixmap = cv2_to_pixmap(xray_img)
 
     # Launch main window
     main_window = MainWindow(board, tile_data, COLOR_MAP, xray_pixmap, mock_board=rescan_board)
     main_window.show()
 
-    sys.exit(app.exec())  # <--- this keeps the app running
+    exit_code = app.exec()  # <--- this keeps the app running
+
+    # REGROUP_PROFILE=session.json profiles the whole session and saves a Chrome trace on exit
+    profile_path = os.environ.get("REGROUP_PROFILE", "")
+    if PROFILER.enabled and profile_path.endswith(".json"):
+        PROFILER.save_chrome_trace(profile_path)
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":